@@ -0,0 +1,52 @@
+import argparse
+import json
+import os
+import sys
+
+import django
+from django.test.utils import setup_test_environment
+
+if __name__ == "__main__":
+    os.environ["DJANGO_SETTINGS_MODULE"] = "teamized_benchmarks.settings"
+    django.setup()
+
+    # pylint: disable=wrong-import-position
+    from django.db import connection
+    from teamized_benchmarks import runner
+    from teamized_benchmarks.scenarios import SCENARIOS
+
+    parser = argparse.ArgumentParser(description="Run the django-teamized benchmarks.")
+    parser.add_argument(
+        "--sizes",
+        default="small,medium",
+        help=f"Comma separated dataset sizes ({', '.join(runner.SIZES)}; default: small,medium)",
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per scenario (default: 20)")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(SCENARIOS),
+        help="Only run the given scenario (can be used multiple times)",
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--compare", help="Compare the results with a previous JSON file and fail on regressions"
+    )
+    args = parser.parse_args()
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+    results = runner.run(args.sizes.split(","), args.repeat, args.scenario)
+    print(runner.format_table(results))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = runner.compare(json.load(file), results)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        sys.exit(bool(regressions))
@@ -1,7 +1,16 @@
 """Endpoints for the API"""
 
 # This is a reimport so the endpoints can be imported easier
-from teamized.api.endpoints import main, workingtime, calendar, todo, club, club_attendance
+from teamized.api.endpoints import (
+    main,
+    workingtime,
+    calendar,
+    todo,
+    club,
+    club_attendance,
+    batch,
+    sync,
+)
 from teamized.api.utils.constants import ENDPOINT_NOT_FOUND
 
 # Basic API views
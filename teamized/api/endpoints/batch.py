@@ -0,0 +1,120 @@
+"""Batch API endpoint"""
+
+import contextlib
+import copy
+import json
+
+from django.db import transaction
+from django.http import HttpRequest, JsonResponse, QueryDict
+from django.urls import Resolver404, get_resolver
+from django.utils.datastructures import MultiValueDict
+from django.utils.translation import gettext as _
+
+from teamized import options, validation
+from teamized.api.utils.constants import ENDPOINT_NOT_FOUND
+from teamized.api.utils.decorators import api_view
+from teamized.decorators import teamized_prep
+from teamized.exceptions import ValidationError
+from teamized.permissions import PermissionContext
+
+BATCH_METHODS = ["get", "post", "delete"]
+
+
+@api_view(["post"])
+@teamized_prep()
+def endpoint_batch(request):
+    """
+    Endpoint for sending multiple API requests at once.
+    'requests' is a JSON list of {"method": ..., "path": ..., "data": {...}} objects (paths are
+    relative to the API root, e.g. "teams/<team>/todolists"). They are dispatched in order
+    through the regular API views, but authentication only happens once for the whole batch.
+    Every request runs in its own savepoint, so a failed request doesn't leave partial changes.
+    With 'atomic', all changes are rolled back if one of the requests fails.
+    """
+
+    subrequests = _parse_subrequests(request.POST.get("requests", ""))
+    atomic = validation.boolean(request.POST, "atomic", False, default=False)
+
+    results = []
+    with transaction.atomic() if atomic else contextlib.nullcontext():
+        for method, path, data in subrequests:
+            with transaction.atomic():
+                response = _dispatch(request, method, path, data)
+                if response.status_code >= 400:
+                    transaction.set_rollback(True)
+            results.append({"status": response.status_code, "body": _get_body(response)})
+            if atomic and response.status_code >= 400:
+                # Roll back the changes of the previous requests and skip the following ones
+                transaction.set_rollback(True)
+                break
+
+    failed = any(result["status"] >= 400 for result in results)
+    return JsonResponse(
+        {
+            "success": not failed,
+            "rolled_back": atomic and failed,
+            "results": results,
+        }
+    )
+
+
+def _parse_subrequests(raw: str) -> list[tuple[str, str, dict]]:
+    try:
+        items = json.loads(raw)
+        if not isinstance(items, list):
+            raise ValueError
+        subrequests = []
+        for item in items:
+            method = str(item.get("method", "get")).lower()
+            data = item.get("data", {})
+            if method not in BATCH_METHODS or not isinstance(data, dict):
+                raise ValueError
+            subrequests.append((method, str(item["path"]).strip("/"), data))
+    except (ValueError, TypeError, KeyError, AttributeError) as exc:
+        raise ValidationError(
+            _("Die Anfragen konnten nicht gelesen werden."), errorname="invalid_batch"
+        ) from exc
+
+    if len(subrequests) > options.API_BATCH_MAX_REQUESTS:
+        raise ValidationError(
+            _("Es können höchstens {} Anfragen auf einmal gesendet werden.").format(
+                options.API_BATCH_MAX_REQUESTS
+            ),
+            errorname="batch_too_large",
+        )
+    return subrequests
+
+
+def _dispatch(request: HttpRequest, method: str, path: str, data: dict):
+    try:
+        match = get_resolver("teamized.api.urls").resolve("/" + path)
+    except Resolver404:
+        return ENDPOINT_NOT_FOUND
+    if match.func is endpoint_batch:
+        return ENDPOINT_NOT_FOUND
+
+    # The sub-request shares the user and session of the batch request (see teamized_prep), only
+    # the method, path and data differ. The permissions are cached per request, so every
+    # sub-request gets a fresh context to see the changes of the previous ones (e.g. leaving a team).
+    subrequest = copy.copy(request)
+    subrequest.teamized_permissions = PermissionContext(request.teamized_user)
+    subrequest.method = method.upper()
+    subrequest.path = subrequest.path_info = request.path.removesuffix("batch") + path
+    query = QueryDict(mutable=True)
+    for key, value in data.items():
+        query.setlist(key, [str(v) for v in value] if isinstance(value, list) else [str(value)])
+
+    subrequest.GET = query if method == "get" else QueryDict(mutable=True)
+    if "apikey" in request.GET:
+        # The API key is checked again, because its permissions depend on the method
+        subrequest.GET["apikey"] = request.GET["apikey"]
+    subrequest.POST = QueryDict() if method == "get" else query
+    subrequest._files = MultiValueDict()  # pylint: disable=protected-access
+    return match.func(subrequest, *match.args, **match.kwargs)
+
+
+def _get_body(response):
+    try:
+        return json.loads(response.content)
+    except ValueError:
+        return None
@@ -1,12 +1,36 @@
 """Calendar API endpoints"""
 
+from datetime import UTC, datetime, time, timedelta
+
+from django.db.models import Prefetch, Q, prefetch_related_objects
 from django.http import JsonResponse
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
-from teamized.api.utils.constants import NO_PERMISSION, OBJ_NOT_FOUND
+from teamized import options, utils, validation
+from teamized.api.utils.constants import NO_PERMISSION
 from teamized.api.utils.decorators import require_objects, api_view
 from teamized.decorators import teamized_prep
-from teamized.models import Calendar, CalendarEvent, Team, User
+from teamized.models import Calendar, CalendarEvent, Team
+from teamized.permissions import PermissionContext
+
+
+def _get_events_window(request) -> tuple[datetime | None, datetime | None] | None:
+    """Get the time range of the optional 'from' and 'to' parameters (None if not given)"""
+
+    time_from = validation.datetime(request.GET, "from", False, null=True)
+    time_to = validation.datetime(request.GET, "to", False, null=True)
+    if time_from is None and time_to is None:
+        return None
+    return time_from, time_to
+
+
+def _get_events_filter(window) -> Q:
+    """Get the filter for the events in a time range from _get_events_window"""
+
+    if window is None:
+        return Q()
+    return CalendarEvent.q_overlapping(*window)
 
 
 @api_view(["get", "post"])
@@ -17,21 +41,32 @@ def endpoint_calendars(request, team: Team):
     Endpoint for listing all calendars of the specified team and creating a new one.
     """
 
-    user: User = request.teamized_user
+    perms: PermissionContext = request.teamized_permissions
 
     if request.method == "GET":
-        if not team.user_is_member(user):
+        if not perms.is_member(team):
             return NO_PERMISSION
 
-        # Get all calendars of the team
+        # Get all calendars of the team (with the events in the requested time range)
+        # The events of all calendars are loaded in a single query.
+        include_events = validation.boolean(request.GET, "include_events", False, default=True)
+        window = _get_events_window(request)
         calendars = team.calendars.all()
+        if include_events:
+            events = CalendarEvent.objects.filter(_get_events_filter(window))
+            calendars = calendars.prefetch_related(Prefetch("events", queryset=events))
         return JsonResponse(
             {
-                "calendars": [calendar.as_dict(request) for calendar in calendars],
+                "calendars": [
+                    calendar.as_dict(request, include_events=include_events, window=window)
+                    for calendar in calendars
+                ],
+                # Feed with the events of all public calendars
+                "ics_url": team.get_calendar_ics_url(request),
             }
         )
     if request.method == "POST":
-        if not team.user_is_admin(user):
+        if not perms.is_admin(team):
             return NO_PERMISSION
 
         calendar = Calendar.from_post_data(request.POST, team)
@@ -49,32 +84,101 @@ def endpoint_calendars(request, team: Team):
     return None
 
 
+@api_view(["get"])
+@teamized_prep()
+@require_objects([("team", Team, "team")])
+def endpoint_freebusy(request, team: Team):
+    """
+    Endpoint for getting the busy times of all calendars of the specified team
+    (the merged time ranges of all events between 'from' and 'to').
+    """
+
+    perms: PermissionContext = request.teamized_permissions
+
+    if not perms.is_member(team):
+        return NO_PERMISSION
+
+    time_from = validation.datetime(request.GET, "from", True)
+    time_to = validation.datetime(request.GET, "to", True)
+    if time_from >= time_to:
+        raise validation.ValidationError(
+            text=_("Der Startzeitpunkt liegt nach dem Endzeitpunkt."),
+            title=_("Start nach Ende"),
+            errorname="start-after-end",
+        )
+    if time_to - time_from > timedelta(days=options.CALENDAR_FREEBUSY_MAX_DAYS):
+        raise validation.ValidationError(
+            text=_("Der Zeitraum darf höchstens {} Tage lang sein.").format(
+                options.CALENDAR_FREEBUSY_MAX_DAYS
+            ),
+            title=_("Zeitraum zu lang"),
+            errorname="range-too-long",
+        )
+
+    # Only the events in the time range are loaded (see CalendarEvent.q_overlapping)
+    events = CalendarEvent.objects.filter(
+        CalendarEvent.q_overlapping(time_from, time_to), calendar__team=team
+    ).only(
+        "fullday",
+        "dtstart",
+        "dtend",
+        "dstart",
+        "dend",
+        "recurrence",
+        "recurrence_interval",
+        "recurrence_until",
+        "recurrence_count",
+        "recurrence_exceptions",
+    )
+
+    # The dates of full-day events are in the default timezone (see CalendarEvent.get_occurrences)
+    tz = timezone.get_default_timezone()
+    intervals = []
+    for event in events.iterator():
+        for start, end in event.get_occurrences(time_from, time_to):
+            if event.fullday:
+                # Full-day events are busy from midnight to midnight (local time)
+                start = datetime.combine(start, time.min, tzinfo=tz)
+                end = datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz)
+            intervals.append((max(start, time_from), min(end, time_to)))
+
+    return JsonResponse(
+        {
+            "from": time_from.isoformat(),
+            "to": time_to.isoformat(),
+            "busy": [
+                [start.astimezone(UTC).isoformat(), end.astimezone(UTC).isoformat()]
+                for start, end in utils.merge_intervals(intervals)
+            ],
+        }
+    )
+
+
 @api_view(["get", "post", "delete"])
 @teamized_prep()
-@require_objects([("team", Team, "team"), ("calendar", Calendar, "calendar")])
+@require_objects([("team", Team, "team"), ("calendar", Calendar, "calendar", "pk", "team")])
 def endpoint_calendar(request, team: Team, calendar: Calendar):
     """
     Endpoint for managing or deleting a calendar.
     """
 
-    # Check if calendar is in team
-    if calendar.team != team:
-        return OBJ_NOT_FOUND
-
-    user: User = request.teamized_user
+    perms: PermissionContext = request.teamized_permissions
 
     if request.method == "GET":
-        if not team.user_is_member(user):
+        if not perms.is_member(team):
             return NO_PERMISSION
 
+        window = _get_events_window(request)
+        events = CalendarEvent.objects.filter(_get_events_filter(window))
+        prefetch_related_objects([calendar], Prefetch("events", queryset=events))
         return JsonResponse(
             {
                 "id": calendar.uid,
-                "calendar": calendar.as_dict(request),
+                "calendar": calendar.as_dict(request, window=window),
             }
         )
     if request.method == "POST":
-        if not team.user_is_admin(user):
+        if not perms.is_admin(team):
             return NO_PERMISSION
 
         calendar.update_from_post_data(request.POST)
@@ -90,7 +194,7 @@ def endpoint_calendar(request, team: Team, calendar: Calendar):
             }
         )
     if request.method == "DELETE":
-        if not team.user_is_admin(user):
+        if not perms.is_admin(team):
             return NO_PERMISSION
 
         calendar.delete()
@@ -108,27 +212,24 @@ def endpoint_calendar(request, team: Team, calendar: Calendar):
 
 @api_view(["get", "post"])
 @teamized_prep()
-@require_objects([("team", Team, "team"), ("calendar", Calendar, "calendar")])
+@require_objects([("team", Team, "team"), ("calendar", Calendar, "calendar", "pk", "team")])
 def endpoint_events(request, team: Team, calendar: Calendar):
     """
     Endpoint for creating a new event in the calendar.
     """
 
-    # Check if calendar is in team
-    if calendar.team != team:
-        return OBJ_NOT_FOUND
-
-    user: User = request.teamized_user
+    perms: PermissionContext = request.teamized_permissions
 
     # Check if user is member of team
-    if not team.user_is_member(user):
+    if not perms.is_member(team):
         return NO_PERMISSION
 
     if request.method == "GET":
-        events = calendar.events.all()
+        window = _get_events_window(request)
+        events = calendar.events.filter(_get_events_filter(window))
         return JsonResponse(
             {
-                "events": [event.as_dict() for event in events],
+                "events": [event.as_dict(window) for event in events],
             }
         )
     if request.method == "POST":
@@ -147,30 +248,63 @@ def endpoint_events(request, team: Team, calendar: Calendar):
     return None
 
 
+@api_view(["post"])
+@teamized_prep()
+@require_objects([("team", Team, "team"), ("calendar", Calendar, "calendar", "pk", "team")])
+def endpoint_events_import(request, team: Team, calendar: Calendar):
+    """
+    Endpoint for importing the events of an ics file ('file') into the calendar.
+    Invalid events are skipped and reported.
+    """
+
+    perms: PermissionContext = request.teamized_permissions
+
+    if not perms.is_member(team):
+        return NO_PERMISSION
+
+    upload = request.FILES.get("file")
+    if upload is None:
+        raise validation.ValidationError(
+            _("Es wurde keine Datei hochgeladen."), errorname="file_missing"
+        )
+
+    # The file is read line by line
+    lines = (line.decode("utf-8", errors="replace") for line in upload)
+    created, errors = CalendarEvent.import_ics(calendar, lines)
+    return JsonResponse(
+        {
+            "success": True,
+            "created": created,
+            "errors": errors,
+            "alert": {
+                "title": _("Ereignisse importiert"),
+                "text": _("{} Ereignisse wurden importiert, {} waren ungültig.").format(
+                    created, len(errors)
+                ),
+            },
+        }
+    )
+
+
 @api_view(["get", "post", "delete"])
 @teamized_prep()
 @require_objects(
     [
         ("team", Team, "team"),
-        ("calendar", Calendar, "calendar"),
-        ("event", CalendarEvent, "event"),
+        ("calendar", Calendar, "calendar", "pk", "team"),
+        ("event", CalendarEvent, "event", "pk", "calendar"),
     ]
 )
-def endpoint_event(request, team: Team, calendar: Calendar, event: CalendarEvent):
+def endpoint_event(
+    request, team: Team, calendar: Calendar, event: CalendarEvent
+):  # pylint: disable=unused-argument
     """
     Endpoint for managing or deleting an event.
     """
 
-    # Check if calendar is in team
-    if calendar.team != team:
-        return OBJ_NOT_FOUND
-    # Check if event is in calendar
-    if event.calendar != calendar:
-        return OBJ_NOT_FOUND
-
-    user: User = request.teamized_user
+    perms: PermissionContext = request.teamized_permissions
 
-    if not team.user_is_member(user):
+    if not perms.is_member(team):
         return NO_PERMISSION
 
     if request.method == "GET":
@@ -212,32 +346,31 @@ def endpoint_event(request, team: Team, calendar: Calendar, event: CalendarEvent
 @require_objects(
     [
         ("team", Team, "team"),
-        ("calendar", Calendar, "calendar1"),
-        ("event", CalendarEvent, "event"),
-        ("toCalendar", Calendar, "calendar2"),
+        ("calendar", Calendar, "calendar1", "pk", "team"),
+        ("event", CalendarEvent, "event", "pk", ("calendar", "calendar1")),
+        ("toCalendar", Calendar, "calendar2", "pk", "team"),
     ]
 )
 def endpoint_event_move(
-    request, team: Team, calendar1: Calendar, event: CalendarEvent, calendar2: Calendar
+    request,
+    team: Team,
+    calendar1: Calendar,
+    event: CalendarEvent,
+    calendar2: Calendar,
 ):
     """
     Endpoint for moving an event.
     """
 
-    # Check if both calendars are in team
-    if calendar1.team != team or calendar2.team != team:
-        return OBJ_NOT_FOUND
-    # Check if event is in calendar1
-    if event.calendar != calendar1:
-        return OBJ_NOT_FOUND
-
-    user: User = request.teamized_user
+    perms: PermissionContext = request.teamized_permissions
 
-    if not team.user_is_member(user):
+    if not perms.is_member(team):
         return NO_PERMISSION
 
     event.calendar = calendar2
     event.save()
+    # The event doesn't count towards the old calendar anymore (ics feed)
+    calendar1.save(update_fields=["updated_at"])
 
     return JsonResponse(
         {
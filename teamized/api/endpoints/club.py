@@ -13,7 +13,8 @@ from teamized.api.utils.constants import (
 from teamized.api.utils.decorators import require_objects, api_view
 from teamized.club.models import Club, ClubMember, ClubMemberGroup
 from teamized.decorators import teamized_prep
-from teamized.models import User, Team
+from teamized.models import Team
+from teamized.permissions import PermissionContext
 
 
 @api_view(["post"])
@@ -22,8 +23,8 @@ from teamized.models import User, Team
 def endpoint_create_club(request, team: Team):
     """Endpoint for creating a club"""
 
-    user: User = request.teamized_user
-    if not team.user_is_owner(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_owner(team):
         return NO_PERMISSION
 
     if team.linked_club is not None:
@@ -56,8 +57,8 @@ def endpoint_club(request, team: Team):
     Endpoint for managing or deleting the club connected to the team.
     """
 
-    user: User = request.teamized_user
-    if not team.user_is_member(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_member(team):
         return NO_PERMISSION
 
     if team.linked_club is None:
@@ -72,7 +73,7 @@ def endpoint_club(request, team: Team):
             }
         )
     if request.method == "POST":
-        if not team.user_is_owner(user):
+        if not perms.is_owner(team):
             return NO_PERMISSION
 
         club.update_from_post_data(request.POST)
@@ -88,7 +89,7 @@ def endpoint_club(request, team: Team):
             }
         )
     if request.method == "DELETE":
-        if not team.user_is_owner(user):
+        if not perms.is_owner(team):
             return NO_PERMISSION
 
         club.delete()
@@ -112,8 +113,8 @@ def endpoint_members(request, team: Team):
     Endpoint for listing and creating club members
     """
 
-    user: User = request.teamized_user
-    if not team.user_is_member(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_member(team):
         return NO_PERMISSION
 
     if team.linked_club is None:
@@ -125,7 +126,7 @@ def endpoint_members(request, team: Team):
 
         return JsonResponse({"members": [member.as_dict() for member in members]})
     if request.method == "POST":
-        if not team.user_is_admin(user):
+        if not perms.is_admin(team):
             return NO_PERMISSION
 
         member = ClubMember.from_post_data(request.POST, club=club)
@@ -151,16 +152,15 @@ def endpoint_member(request, team: Team, member: ClubMember):
     Endpoint for editing and deleting a club member
     """
 
-    user: User = request.teamized_user
-    if not team.user_is_admin(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_admin(team):
         return NO_PERMISSION
 
-    if team.linked_club is None:
+    if team.linked_club_id is None:
         return ENDPOINT_NOT_FOUND
-    club: Club = team.linked_club
 
     # Check if member corresponds to club
-    if member.club != club:
+    if member.club_id != team.linked_club_id:
         return OBJ_NOT_FOUND
 
     # Methods
@@ -200,16 +200,15 @@ def endpoint_member_portfolio(request, team: Team, member: ClubMember):
     Endpoint for editing a club member's portfolio
     """
 
-    user: User = request.teamized_user
-    if not team.user_is_admin(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_admin(team):
         return NO_PERMISSION
 
-    if team.linked_club is None:
+    if team.linked_club_id is None:
         return ENDPOINT_NOT_FOUND
-    club: Club = team.linked_club
 
     # Check if member corresponds to club
-    if member.club != club:
+    if member.club_id != team.linked_club_id:
         return OBJ_NOT_FOUND
 
     # Methods
@@ -253,19 +252,18 @@ def endpoint_member_groupmembership(
     Endpoint for editing group membership of a club member
     """
 
-    user: User = request.teamized_user
-    if not team.user_is_admin(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_admin(team):
         return NO_PERMISSION
 
-    if team.linked_club is None:
+    if team.linked_club_id is None:
         return ENDPOINT_NOT_FOUND
-    club: Club = team.linked_club
 
     # Check if member corresponds to club
-    if member.club != club:
+    if member.club_id != team.linked_club_id:
         return OBJ_NOT_FOUND
     # Check if group corresponds to club
-    if group.club != club:
+    if group.club_id != team.linked_club_id:
         return OBJ_NOT_FOUND
 
     # Methods
@@ -309,16 +307,15 @@ def endpoint_member_create_magic_link(request, team: Team, member: ClubMember):
     Endpoint for creating a magic link for a club member. (owner only)
     """
 
-    user: User = request.teamized_user
-    if not team.user_is_owner(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_owner(team):
         return NO_PERMISSION
 
-    if team.linked_club is None:
+    if team.linked_club_id is None:
         return ENDPOINT_NOT_FOUND
-    club: Club = team.linked_club
 
     # Check if member corresponds to club
-    if member.club != club:
+    if member.club_id != team.linked_club_id:
         return OBJ_NOT_FOUND
 
     # Methods
@@ -343,15 +340,15 @@ def endpoint_groups(request, team: Team):
     Endpoint for listing and creating club member groups
     """
 
-    user: User = request.teamized_user
-    if not team.user_is_member(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_member(team):
         return NO_PERMISSION
 
     if team.linked_club is None:
         return ENDPOINT_NOT_FOUND
     club: Club = team.linked_club
 
-    is_admin: bool = team.user_is_admin(user)
+    is_admin: bool = perms.is_admin(team)
 
     if request.method == "GET":
         groups: QuerySet[ClubMemberGroup] = club.groups.order_by("name")
@@ -386,16 +383,15 @@ def endpoint_group(request, team: Team, group: ClubMemberGroup):
     Endpoint for editing and deleting a club member group
     """
 
-    user: User = request.teamized_user
-    if not team.user_is_admin(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_admin(team):
         return NO_PERMISSION
 
-    if team.linked_club is None:
+    if team.linked_club_id is None:
         return ENDPOINT_NOT_FOUND
-    club: Club = team.linked_club
 
     # Check if member group corresponds to club
-    if group.club != club:
+    if group.club_id != team.linked_club_id:
         return OBJ_NOT_FOUND
 
     # Methods
@@ -6,11 +6,12 @@ from django.db import IntegrityError
 from django.http import JsonResponse
 from django.utils.translation import gettext as _
 
-from teamized.api.utils.constants import NO_PERMISSION, ENDPOINT_NOT_FOUND, OBJ_NOT_FOUND
+from teamized.api.utils.constants import NO_PERMISSION, ENDPOINT_NOT_FOUND
 from teamized.api.utils.decorators import api_view, require_objects
 from teamized.club.models import Club, ClubAttendanceEvent, ClubAttendanceEventParticipation
 from teamized.decorators import teamized_prep
-from teamized.models import Team, User
+from teamized.models import Team
+from teamized.permissions import PermissionContext
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +24,8 @@ def endpoint_attendance_events(request, team: Team):
     Endpoint for listing and creating attendance events for a team.
     """
 
-    user: User = request.teamized_user
-    if not team.user_is_member(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_member(team):
         return NO_PERMISSION
 
     if team.linked_club is None:
@@ -36,7 +37,7 @@ def endpoint_attendance_events(request, team: Team):
 
         return JsonResponse({"attendance_events": [event.as_dict() for event in attendance_events]})
     if request.method == "POST":
-        if not team.user_is_admin(user):
+        if not perms.is_admin(team):
             return NO_PERMISSION
 
         attendance_event = ClubAttendanceEvent.from_post_data(request.POST, club=club)
@@ -57,24 +58,22 @@ def endpoint_attendance_events(request, team: Team):
 @api_view(["post", "delete"])
 @teamized_prep()
 @require_objects(
-    [("team", Team, "team"), ("attendance_event", ClubAttendanceEvent, "attendance_event")]
+    [
+        ("team", Team, "team"),
+        ("attendance_event", ClubAttendanceEvent, "attendance_event", "pk", ("club__team", "team")),
+    ]
 )
 def endpoint_attendance_event(request, team: Team, attendance_event: ClubAttendanceEvent):
     """
     Endpoint for editing and deleting a club attendance event
     """
 
-    user: User = request.teamized_user
-    if not team.user_is_admin(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_admin(team):
         return NO_PERMISSION
 
     if team.linked_club is None:
         return ENDPOINT_NOT_FOUND
-    club: Club = team.linked_club
-
-    # Check if attendance_event corresponds to club
-    if attendance_event.club != club:
-        return OBJ_NOT_FOUND
 
     # Methods
     if request.method == "POST":
@@ -109,7 +108,10 @@ def endpoint_attendance_event(request, team: Team, attendance_event: ClubAttenda
 @api_view(["get"])
 @teamized_prep()
 @require_objects(
-    [("team", Team, "team"), ("attendance_event", ClubAttendanceEvent, "attendance_event")]
+    [
+        ("team", Team, "team"),
+        ("attendance_event", ClubAttendanceEvent, "attendance_event", "pk", ("club__team", "team")),
+    ]
 )
 def endpoint_attendance_event_participation_list(
     request, team: Team, attendance_event: ClubAttendanceEvent
@@ -118,17 +120,12 @@ def endpoint_attendance_event_participation_list(
     Endpoint for listing participation assignments for a club attendance event.
     """
 
-    user: User = request.teamized_user
-    if not team.user_is_member(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_member(team):
         return NO_PERMISSION
 
     if team.linked_club is None:
         return ENDPOINT_NOT_FOUND
-    club: Club = team.linked_club
-
-    # Check if attendance_event corresponds to club
-    if attendance_event.club != club:
-        return OBJ_NOT_FOUND
 
     if request.method == "GET":
         participations = attendance_event.participations.order_by(
@@ -142,7 +139,10 @@ def endpoint_attendance_event_participation_list(
 @api_view(["post"])
 @teamized_prep()
 @require_objects(
-    [("team", Team, "team"), ("attendance_event", ClubAttendanceEvent, "attendance_event")]
+    [
+        ("team", Team, "team"),
+        ("attendance_event", ClubAttendanceEvent, "attendance_event", "pk", ("club__team", "team")),
+    ]
 )
 def endpoint_attendance_event_participation_bulk_create(
     request, team: Team, attendance_event: ClubAttendanceEvent
@@ -151,18 +151,14 @@ def endpoint_attendance_event_participation_bulk_create(
     Endpoint for adding participation assignments for a club attendance event.
     """
 
-    user: User = request.teamized_user
-    if not team.user_is_admin(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_admin(team):
         return NO_PERMISSION
 
     if team.linked_club is None:
         return ENDPOINT_NOT_FOUND
     club: Club = team.linked_club
 
-    # Check if attendance_event corresponds to club
-    if attendance_event.club != club:
-        return OBJ_NOT_FOUND
-
     if request.method == "POST":
         # get the list of member ids from the request
         member_ids = request.POST.getlist("member_ids[]")
@@ -206,34 +202,32 @@ def endpoint_attendance_event_participation_bulk_create(
 @require_objects(
     [
         ("team", Team, "team"),
-        ("attendance_event", ClubAttendanceEvent, "attendance_event"),
-        ("participation", ClubAttendanceEventParticipation, "participation"),
+        ("attendance_event", ClubAttendanceEvent, "attendance_event", "pk", ("club__team", "team")),
+        (
+            "participation",
+            ClubAttendanceEventParticipation,
+            "participation",
+            "pk",
+            ("event", "attendance_event"),
+        ),
     ]
 )
 def endpoint_attendance_event_participation(
     request,
     team: Team,
-    attendance_event: ClubAttendanceEvent,
+    attendance_event: ClubAttendanceEvent,  # pylint: disable=unused-argument
     participation: ClubAttendanceEventParticipation,
 ):
     """
     Endpoint for updating and deleting participation assignments for a club attendance event.
     """
 
-    user: User = request.teamized_user
-    if not team.user_is_admin(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_admin(team):
         return NO_PERMISSION
 
     if team.linked_club is None:
         return ENDPOINT_NOT_FOUND
-    club: Club = team.linked_club
-
-    # Check if attendance_event corresponds to club
-    if attendance_event.club != club:
-        return OBJ_NOT_FOUND
-    # Check if participation corresponds to attendance_event
-    if participation.event != attendance_event:
-        return OBJ_NOT_FOUND
 
     if request.method == "POST":
         participation.update_from_post_data(request.POST)
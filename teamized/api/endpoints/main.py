@@ -1,19 +1,19 @@
 """Main API endpoints"""
 
 from django.contrib import messages
-from django.db import models
 from django.http import JsonResponse
 from django.utils.translation import gettext as _
 
-from teamized import enums, exceptions
+from teamized import enums, exceptions, options, validation
 from teamized.api.utils.constants import (
     DATA_INVALID,
     NO_PERMISSION,
-    OBJ_NOT_FOUND,
 )
 from teamized.api.utils.decorators import require_objects, api_view
+from teamized.api.utils.pagination import paginate_keyset
 from teamized.decorators import teamized_prep
-from teamized.models import User, Member, Team, Invite
+from teamized.models import User, Member, Team, Invite, ToDoList
+from teamized.permissions import PermissionContext
 
 
 @api_view(["get"])
@@ -57,6 +57,90 @@ def endpoint_messages(request):
     return JsonResponse({"messages": message_list})
 
 
+def _get_memberinstances(user: User) -> list[Member]:
+    # All teams with their clubs and counts are loaded in a single query
+    return list(
+        user.member_instances.all()
+        .select_related("team__linked_club", "user__auth_user")
+        .order_by("team__name")
+        .annotate(**Team.get_count_annotations("team", "team__linked_club"))
+    )
+
+
+def _get_teams_data(memberinstances: list[Member]) -> dict:
+    return {
+        "teams": [
+            mi.team.as_dict(
+                member=mi,
+                membercount=mi.membercount,
+                club_membercount=mi.club_membercount,
+                calendarcount=mi.calendarcount,
+                todolistcount=mi.todolistcount,
+            )
+            for mi in memberinstances
+        ],
+        "defaultTeamId": memberinstances[0].team.uid if memberinstances else None,
+    }
+
+
+@api_view(["get"])
+@teamized_prep()
+def endpoint_bootstrap(request):
+    """
+    Endpoint for getting everything the app needs on startup in a single request:
+    The user's profile, settings, teams, pending messages and active tracking session.
+    With 'include_team_data', the first page of the calendars, to-do lists and work sessions
+    of a team ('team', default: the default team) is included as well.
+    """
+    user: User = request.teamized_user
+
+    memberinstances = _get_memberinstances(user)
+    member = None
+    if validation.boolean(request.GET, "include_team_data", False, default=False):
+        team_id = validation.text(request.GET, "team", False, default="")
+        member = next(
+            (mi for mi in memberinstances if not team_id or str(mi.team_id) == team_id), None
+        )
+        if member is None:
+            return NO_PERMISSION
+
+    active_session = user.get_active_work_session()
+    data = {
+        "user": user.as_dict(),
+        "settings": user.settings_as_dict(),
+        **_get_teams_data(memberinstances),
+        "tracking_session": active_session.as_dict() if active_session else None,
+    }
+    if member is not None:
+        data["team_data"] = _get_team_data(request, member)
+
+    # Reading the messages marks them as seen, so this only happens if the request succeeds
+    storage = messages.get_messages(request)
+    data["messages"] = [{"type": msg.level_tag, "text": msg.message} for msg in storage]
+    return JsonResponse(data)
+
+
+def _get_team_data(request, member: Member) -> dict:
+    # The same data as the first requests of the team's pages (with items and events loaded
+    # on demand)
+    team = member.team
+    todolists = ToDoList.with_item_counts(team.todolists.all().order_by("name"))
+    sessions, next_cursor = paginate_keyset(
+        member.work_sessions.filter(is_ended=True),
+        {"page_size": options.BOOTSTRAP_WORKSESSIONS_PAGE_SIZE},
+        "time_start",
+    )
+    return {
+        "team_id": team.uid,
+        "calendars": [
+            calendar.as_dict(request, include_events=False) for calendar in team.calendars.all()
+        ],
+        "todolists": [todolist.as_dict(include_items=False) for todolist in todolists],
+        "worksessions": [session.as_dict() for session in sessions],
+        "worksessions_next": next_cursor,
+    }
+
+
 @api_view(["get", "post"])
 @teamized_prep()
 def endpoint_teams(request):
@@ -64,22 +148,10 @@ def endpoint_teams(request):
     Endpoint for listing and creating teams.
     """
     user: User = request.teamized_user
+    perms: PermissionContext = request.teamized_permissions
 
     if request.method == "GET":
-        memberinstances = (
-            user.member_instances.all()
-            .select_related("team", "user")
-            .order_by("team__name")
-            .annotate(membercount=models.Count("team__members"))
-        )
-        return JsonResponse(
-            {
-                "teams": [
-                    mi.team.as_dict(member=mi, membercount=mi.membercount) for mi in memberinstances
-                ],
-                "defaultTeamId": memberinstances[0].team.uid,
-            }
-        )
+        return JsonResponse(_get_teams_data(_get_memberinstances(user)))
     if request.method == "POST":
         if not user.can_create_team():
             return JsonResponse(
@@ -116,7 +188,7 @@ def endpoint_teams(request):
         return JsonResponse(
             {
                 "success": True,
-                "team": team.as_dict(member=team.get_member(user)),
+                "team": team.as_dict(member=perms.get_member(team)),
                 "alert": {
                     "title": _("Team erstellt"),
                     "text": _("Das Team wurde erfolgreich erstellt."),
@@ -134,20 +206,20 @@ def endpoint_team(request, team: Team):
     Endpoint for managing or deleting a team.
     """
 
-    user: User = request.teamized_user
+    perms: PermissionContext = request.teamized_permissions
 
     if request.method == "GET":
-        if not team.user_is_member(user):
+        if not perms.is_member(team):
             return NO_PERMISSION
 
         return JsonResponse(
             {
                 "id": team.uid,
-                "team": team.as_dict(member=team.get_member(user)),
+                "team": team.as_dict(member=perms.get_member(team)),
             }
         )
     if request.method == "POST":
-        if not team.user_is_owner(user):
+        if not perms.is_owner(team):
             return NO_PERMISSION
 
         team.update_from_post_data(request.POST)
@@ -156,7 +228,7 @@ def endpoint_team(request, team: Team):
             {
                 "success": True,
                 "id": team.uid,
-                "team": team.as_dict(member=team.get_member(user)),
+                "team": team.as_dict(member=perms.get_member(team)),
                 "alert": {
                     "title": _("Team geändert"),
                     "text": _("Das Team wurde erfolgreich geändert."),
@@ -164,7 +236,7 @@ def endpoint_team(request, team: Team):
             }
         )
     if request.method == "DELETE":
-        if not team.user_is_owner(user):
+        if not perms.is_owner(team):
             return NO_PERMISSION
 
         if team.linked_club is not None:
@@ -196,6 +268,7 @@ def endpoint_team(request, team: Team):
             )
 
         team.delete()
+        perms.remember(team, None)
         return JsonResponse(
             {
                 "success": True,
@@ -216,10 +289,10 @@ def endpoint_members(request, team: Team):
     Endpoint for listing members
     """
 
-    user: User = request.teamized_user
+    perms: PermissionContext = request.teamized_permissions
 
     if request.method == "GET":
-        if not team.user_is_member(user):
+        if not perms.is_member(team):
             return NO_PERMISSION
 
         members = team.members.select_related("user", "user__auth_user").order_by(
@@ -232,26 +305,22 @@ def endpoint_members(request, team: Team):
 
 @api_view(["post", "delete"])
 @teamized_prep()
-@require_objects([("team", Team, "team"), ("member", Member, "member")])
+@require_objects([("team", Team, "team"), ("member", Member, "member", "pk", "team")])
 def endpoint_member(request, team: Team, member: Member):
     """
     Endpoint for editing and deleting members
     """
 
-    # Check if member is in team
-    if member.team != team:
-        return OBJ_NOT_FOUND
-
     # Check permissions
-    user: User = request.teamized_user
-    if not team.user_is_admin(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_admin(team):
         return NO_PERMISSION
 
     # Methods
     if request.method == "POST":
         role = request.POST.get("role", member.role)
 
-        if role != member.role and not team.user_is_owner(user):
+        if role != member.role and not perms.is_owner(team):
             # Only owners can change the role of a member
             return NO_PERMISSION
         if member.is_owner():
@@ -276,11 +345,14 @@ def endpoint_member(request, team: Team, member: Member):
         )
 
     if request.method == "DELETE":
-        if member.is_admin() and not team.user_is_owner(user):
+        if member.is_admin() and not perms.is_owner(team):
             # Only owners can remove admins
             return NO_PERMISSION
 
+        is_self = member.user_id == perms.user.pk
         member.delete()
+        if is_self:
+            perms.remember(team, None)
         return JsonResponse(
             {
                 "success": True,
@@ -302,8 +374,8 @@ def endpoint_invites(request, team: Team):
     """
 
     # Check permissions
-    user: User = request.teamized_user
-    if not team.user_is_admin(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_admin(team):
         return NO_PERMISSION
 
     # Methods
@@ -324,19 +396,15 @@ def endpoint_invites(request, team: Team):
 
 @api_view(["post", "delete"])
 @teamized_prep()
-@require_objects([("team", Team, "team"), ("invite", Invite, "invite")])
+@require_objects([("team", Team, "team"), ("invite", Invite, "invite", "pk", "team")])
 def endpoint_invite(request, team: Team, invite: Invite):
     """
     Endpoint for update and deleting invites
     """
 
-    # Check if invite belongs to team
-    if invite.team != team:
-        return OBJ_NOT_FOUND
-
     # Check permissions
-    user: User = request.teamized_user
-    if not team.user_is_admin(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_admin(team):
         return NO_PERMISSION
 
     # Methods
@@ -375,13 +443,13 @@ def endpoint_team_leave(request, team: Team):
     Endpoint for leaving a team.
     """
 
-    user: User = request.teamized_user
+    perms: PermissionContext = request.teamized_permissions
 
     if request.method == "POST":
-        if not team.user_is_member(user):
+        if not perms.is_member(team):
             return NO_PERMISSION
 
-        member = team.get_member(user)
+        member = perms.get_member(team)
 
         if member.is_owner():
             return JsonResponse(
@@ -398,6 +466,7 @@ def endpoint_team_leave(request, team: Team):
             )
 
         member.delete()
+        perms.remember(team, None)
 
         return JsonResponse(
             {
@@ -445,11 +514,13 @@ def endpoint_invite_accept(request, invite: Invite):
     """
 
     user: User = request.teamized_user
+    perms: PermissionContext = request.teamized_permissions
 
     if request.method == "POST":
         invite.check_validity_for_user(user)
         member = invite.accept(user)
         team = invite.team
+        perms.remember(team, member)
 
         return JsonResponse(
             {
@@ -0,0 +1,154 @@
+"""Incremental sync API endpoint"""
+
+import base64
+import datetime as dt
+
+from django.db.models import Q, QuerySet
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from teamized import enums, options, validation
+from teamized.api.utils.constants import NO_PERMISSION
+from teamized.api.utils.decorators import require_objects, api_view
+from teamized.club.models import (
+    ClubAttendanceEvent,
+    ClubAttendanceEventParticipation,
+    ClubMember,
+    ClubMemberGroup,
+)
+from teamized.decorators import teamized_prep
+from teamized.exceptions import ValidationError
+from teamized.models import CalendarEvent, Member, Team, Tombstone, ToDoListItem
+from teamized.permissions import PermissionContext
+
+
+@api_view(["get"])
+@teamized_prep()
+@require_objects([("team", Team, "team")])
+def endpoint_changes(request, team: Team):
+    """
+    Endpoint for syncing the data of a team incrementally.
+    Returns the objects that were created or changed since the cursor 'since' (all objects
+    without a cursor) and the ids of the deleted objects, grouped by category (see
+    enums.SyncCategories), and the cursor for the next request. The children of a deleted
+    object (e.g. the events of a calendar) have to be removed together with it.
+    """
+
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_member(team):
+        return NO_PERMISSION
+
+    member = perms.get_member(team)
+    # Taken before loading anything, so that nothing changed in between is skipped
+    cursor = encode_cursor(timezone.now() - dt.timedelta(seconds=options.SYNC_CURSOR_OVERLAP))
+
+    since = validation.text(request.GET, "since", False, default=None, null=True)
+    since = decode_cursor(since) if since else None
+    if since is not None and since < Tombstone.get_expiry_date():
+        raise ValidationError(
+            _("Der Cursor ist abgelaufen. Bitte lade die Daten neu."),
+            errorname="cursor_expired",
+        )
+
+    def changed(queryset: QuerySet, field: str = "updated_at") -> QuerySet:
+        if since is not None:
+            queryset = queryset.filter(**{f"{field}__gte": since})
+        return queryset.order_by(field)
+
+    changes, containers = _get_team_changes(request, team, member, changed)
+    if team.linked_club_id is not None:
+        club_changes, club_containers = _get_club_changes(
+            request, team.linked_club_id, perms.is_admin(team), changed
+        )
+        changes |= club_changes
+        containers |= club_containers
+
+    deleted = {category: [] for category in changes}
+    if since is not None:
+        tombstones = Tombstone.objects.filter(containers, deleted_at__gte=since)
+        for category, object_id in tombstones.values_list("category", "object_id"):
+            if category in deleted:
+                deleted[category].append(str(object_id))
+
+    return JsonResponse(
+        {
+            "team_id": team.uid,
+            "cursor": cursor,
+            "changes": changes,
+            "deleted": deleted,
+        }
+    )
+
+
+def _get_team_changes(request, team: Team, member: Member, changed) -> tuple[dict, Q]:
+    calendars = team.calendars.all()
+    todolists = team.todolists.all()
+    changes = {
+        enums.SyncCategories.WORKSESSIONS: [
+            session.as_dict() for session in changed(member.work_sessions.all())
+        ],
+        enums.SyncCategories.CALENDARS: [
+            calendar.as_dict(request, include_events=False) for calendar in changed(calendars)
+        ],
+        enums.SyncCategories.EVENTS: [
+            {**event.as_dict(), "_calendar_id": str(event.calendar_id)}
+            for event in changed(CalendarEvent.objects.filter(calendar__team=team))
+        ],
+        enums.SyncCategories.TODOLISTS: [
+            todolist.as_dict(include_items=False) for todolist in changed(todolists)
+        ],
+        enums.SyncCategories.TODOLISTITEMS: [
+            {**item.as_dict(), "_todolist_id": str(item.todolist_id)}
+            for item in changed(ToDoListItem.objects.filter(todolist__team=team))
+        ],
+    }
+    containers = Q(container_id=member.uid) | Q(container_id=team.uid)
+    containers |= Q(container_id__in=calendars.values("uid"))
+    containers |= Q(container_id__in=todolists.values("uid"))
+    return changes, containers
+
+
+def _get_club_changes(request, club_id, is_admin: bool, changed) -> tuple[dict, Q]:
+    events = ClubAttendanceEvent.objects.filter(club_id=club_id)
+    groups = ClubMemberGroup.objects.filter(club_id=club_id).prefetch_related("memberships")
+    participations = ClubAttendanceEventParticipation.objects.filter(event__club_id=club_id)
+    changes = {
+        enums.SyncCategories.CLUB_MEMBERS: [
+            member.as_dict()
+            for member in changed(ClubMember.objects.filter(club_id=club_id), "date_modified")
+        ],
+        enums.SyncCategories.CLUB_GROUPS: [
+            group.as_dict(request, include_shared_url=is_admin)
+            for group in changed(groups, "date_modified")
+        ],
+        enums.SyncCategories.CLUB_ATTENDANCE_EVENTS: [
+            event.as_dict() for event in changed(events, "date_modified")
+        ],
+        enums.SyncCategories.CLUB_PARTICIPATIONS: [
+            participation.as_dict() for participation in changed(participations, "date_modified")
+        ],
+    }
+    containers = Q(container_id=club_id) | Q(container_id__in=events.values("uid"))
+    return changes, containers
+
+
+def encode_cursor(value: dt.datetime) -> str:
+    """Encode a point in time as an opaque sync cursor"""
+
+    return base64.urlsafe_b64encode(value.isoformat().encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dt.datetime:
+    """Decode a cursor created by encode_cursor"""
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        value = dt.datetime.fromisoformat(raw)
+        if value.tzinfo is None:
+            raise ValueError("naive datetime")
+        return value
+    except ValueError as exc:
+        raise ValidationError(
+            _("Der Cursor '{}' ist ungültig!").format(cursor), errorname="invalid_cursor"
+        ) from exc
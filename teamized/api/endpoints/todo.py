@@ -3,10 +3,13 @@
 from django.http import JsonResponse
 from django.utils.translation import gettext as _
 
-from teamized.api.utils.constants import NO_PERMISSION, OBJ_NOT_FOUND
+from teamized import validation
+from teamized.api.utils.constants import NO_PERMISSION
 from teamized.api.utils.decorators import require_objects, api_view
+from teamized.api.utils.pagination import paginate_keyset
 from teamized.decorators import teamized_prep
 from teamized.models import ToDoList, ToDoListItem, Team, User
+from teamized.permissions import PermissionContext
 
 
 @api_view(["get", "post"])
@@ -17,21 +20,28 @@ def endpoint_todolists(request, team: Team):
     Endpoint for listing all ToDoLists of the specified team and creating a new one.
     """
 
-    user: User = request.teamized_user
+    perms: PermissionContext = request.teamized_permissions
 
     if request.method == "GET":
-        if not team.user_is_member(user):
+        if not perms.is_member(team):
             return NO_PERMISSION
 
-        # Get all ToDoLists of the team
-        todolists = team.todolists.all().order_by("name")
+        # Get all ToDoLists of the team with their item counts
+        # Without items, only the index is returned and the items are loaded per list on demand.
+        # Otherwise, the items of all lists are loaded in a single query.
+        include_items = validation.boolean(request.GET, "include_items", False, default=True)
+        todolists = ToDoList.with_item_counts(team.todolists.all().order_by("name"))
+        if include_items:
+            todolists = todolists.prefetch_related("items")
         return JsonResponse(
             {
-                "todolists": [todolist.as_dict() for todolist in todolists],
+                "todolists": [
+                    todolist.as_dict(include_items=include_items) for todolist in todolists
+                ],
             }
         )
     if request.method == "POST":
-        if not team.user_is_admin(user):
+        if not perms.is_admin(team):
             return NO_PERMISSION
 
         todolist = ToDoList.from_post_data(request.POST, team)
@@ -51,20 +61,16 @@ def endpoint_todolists(request, team: Team):
 
 @api_view(["get", "post", "delete"])
 @teamized_prep()
-@require_objects([("team", Team, "team"), ("todolist", ToDoList, "todolist")])
+@require_objects([("team", Team, "team"), ("todolist", ToDoList, "todolist", "pk", "team")])
 def endpoint_todolist(request, team: Team, todolist: ToDoList):
     """
     Endpoint for managing or deleting a ToDoList.
     """
 
-    # Check if todolist is in team
-    if todolist.team != team:
-        return OBJ_NOT_FOUND
-
-    user: User = request.teamized_user
+    perms: PermissionContext = request.teamized_permissions
 
     if request.method == "GET":
-        if not team.user_is_member(user):
+        if not perms.is_member(team):
             return NO_PERMISSION
 
         return JsonResponse(
@@ -74,7 +80,7 @@ def endpoint_todolist(request, team: Team, todolist: ToDoList):
             }
         )
     if request.method == "POST":
-        if not team.user_is_admin(user):
+        if not perms.is_admin(team):
             return NO_PERMISSION
 
         todolist.update_from_post_data(request.POST)
@@ -90,7 +96,7 @@ def endpoint_todolist(request, team: Team, todolist: ToDoList):
             }
         )
     if request.method == "DELETE":
-        if not team.user_is_admin(user):
+        if not perms.is_admin(team):
             return NO_PERMISSION
 
         todolist.delete()
@@ -108,24 +114,29 @@ def endpoint_todolist(request, team: Team, todolist: ToDoList):
 
 @api_view(["get", "post"])
 @teamized_prep()
-@require_objects([("team", Team, "team"), ("todolist", ToDoList, "todolist")])
+@require_objects([("team", Team, "team"), ("todolist", ToDoList, "todolist", "pk", "team")])
 def endpoint_todolistitems(request, team: Team, todolist: ToDoList):
     """
-    Endpoint for creating a new item in the ToDoList.
+    Endpoint for listing the items of the ToDoList and creating a new one.
+    With 'done', only the open or the done items are returned. The done items can be paginated
+    (most recently done first).
     """
 
-    # Check if todolist is in team
-    if todolist.team != team:
-        return OBJ_NOT_FOUND
-
     user: User = request.teamized_user
+    perms: PermissionContext = request.teamized_permissions
 
     # Check if user is member of team
-    if not team.user_is_member(user):
+    if not perms.is_member(team):
         return NO_PERMISSION
 
     if request.method == "GET":
-        items = todolist.items.all().order_by("done", "name")
+        items = todolist.items.all()
+        done = validation.boolean(request.GET, "done", False, default=None, null=True)
+        if done is True:
+            page, next_cursor = paginate_keyset(items.filter(done=True), request.GET, "done_at")
+            return JsonResponse({"items": [item.as_dict() for item in page], "next": next_cursor})
+        if done is False:
+            items = items.filter(done=False)
         return JsonResponse(
             {
                 "items": [item.as_dict() for item in items],
@@ -147,30 +158,55 @@ def endpoint_todolistitems(request, team: Team, todolist: ToDoList):
     return None
 
 
+@api_view(["post"])
+@teamized_prep()
+@require_objects([("team", Team, "team"), ("todolist", ToDoList, "todolist", "pk", "team")])
+def endpoint_todolistitems_bulk(request, team: Team, todolist: ToDoList):
+    """
+    Endpoint for marking many items of the ToDoList as done or undone, moving them to another
+    ToDoList of the team or deleting them at once.
+    """
+
+    user: User = request.teamized_user
+    perms: PermissionContext = request.teamized_permissions
+
+    if not perms.is_member(team):
+        return NO_PERMISSION
+
+    item_ids = ToDoListItem.bulk_update_from_post_data(request.POST, user=user, todolist=todolist)
+    data = {
+        "success": True,
+        "ids": item_ids,
+        "alert": {
+            "title": _("Listeneinträge geändert"),
+            "text": _("{} Listeneinträge wurden erfolgreich geändert.").format(len(item_ids)),
+        },
+    }
+    if request.POST.get("action") != "delete":
+        data["items"] = [item.as_dict() for item in ToDoListItem.objects.filter(uid__in=item_ids)]
+    return JsonResponse(data)
+
+
 @api_view(["get", "post", "delete"])
 @teamized_prep()
 @require_objects(
     [
         ("team", Team, "team"),
-        ("todolist", ToDoList, "todolist"),
-        ("item", ToDoListItem, "item"),
+        ("todolist", ToDoList, "todolist", "pk", "team"),
+        ("item", ToDoListItem, "item", "pk", "todolist"),
     ]
 )
-def endpoint_todolistitem(request, team: Team, todolist: ToDoList, item: ToDoListItem):
+def endpoint_todolistitem(
+    request, team: Team, todolist: ToDoList, item: ToDoListItem
+):  # pylint: disable=unused-argument
     """
     Endpoint for managing or deleting a ToDoListItem.
     """
 
-    # Check if todolist is in team
-    if todolist.team != team:
-        return OBJ_NOT_FOUND
-    # Check if item is in todolist
-    if item.todolist != todolist:
-        return OBJ_NOT_FOUND
-
     user: User = request.teamized_user
+    perms: PermissionContext = request.teamized_permissions
 
-    if not team.user_is_member(user):
+    if not perms.is_member(team):
         return NO_PERMISSION
 
     if request.method == "GET":
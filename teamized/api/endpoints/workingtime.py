@@ -1,13 +1,20 @@
 """WorkTime API endpoints"""
 
+from datetime import datetime, time, timedelta
+
+from django.db.models import Count, DateField, DurationField, F, Sum
+from django.db.models.functions import Trunc
 from django.http import JsonResponse
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
-from teamized import exceptions
+from teamized import exceptions, validation
 from teamized.api.utils.constants import NO_PERMISSION, OBJ_NOT_FOUND
 from teamized.api.utils.decorators import require_objects, api_view
+from teamized.api.utils.pagination import paginate_keyset
 from teamized.decorators import teamized_prep
 from teamized.models import User, Team, WorkSession
+from teamized.permissions import PermissionContext
 
 
 @api_view(["get", "post"])
@@ -20,17 +27,29 @@ def endpoint_worksessions(request, team: Team):
 
     # Check if the user is a member of the team
     user: User = request.teamized_user
-    if not team.user_is_member(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_member(team):
         return NO_PERMISSION
 
-    member = team.get_member(user)
+    member = perms.get_member(team)
 
     if request.method == "GET":
-        # Get all ended sessions of the user in the team
-        sessions = member.work_sessions.filter(is_ended=True).order_by("-time_start").all()
+        # Get the ended sessions of the user in the team (newest first)
+        # Pagination is optional: Without a page_size, all sessions are returned.
+        sessions = member.work_sessions.filter(is_ended=True)
+
+        time_from = validation.datetime(request.GET, "from", False, null=True)
+        if time_from is not None:
+            sessions = sessions.filter(time_start__gte=time_from)
+        time_to = validation.datetime(request.GET, "to", False, null=True)
+        if time_to is not None:
+            sessions = sessions.filter(time_start__lt=time_to)
+
+        page, next_cursor = paginate_keyset(sessions, request.GET, "time_start")
         return JsonResponse(
             {
-                "worksessions": [session.as_dict() for session in sessions],
+                "worksessions": [session.as_dict() for session in page],
+                "next": next_cursor,
             }
         )
     if request.method == "POST":
@@ -49,10 +68,88 @@ def endpoint_worksessions(request, team: Team):
     return None
 
 
+# Interval name -> Trunc kind
+STATS_INTERVALS = {"day": "day", "week": "week", "month": "month", "year": "year"}
+
+
+@api_view(["get"])
+@teamized_prep()
+@require_objects([("team", Team, "team")])
+def endpoint_worksessions_stats(request, team: Team):
+    """
+    Endpoint for the working time statistics of the current user in a team.
+    Returns the total duration (in seconds), unit count and number of ended sessions per
+    day, week, month or year between two dates (inclusive). The sums are calculated in the
+    database, so the response only grows with the number of intervals.
+    """
+
+    # Check if the user is a member of the team
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_member(team):
+        return NO_PERMISSION
+
+    member = perms.get_member(team)
+
+    today = timezone.localdate()
+    interval = validation.choice(request.GET, "interval", list(STATS_INTERVALS), False, "day")
+    end = validation.date(request.GET, "end", False, today)
+    start = validation.date(request.GET, "start", False, end - timedelta(days=30))
+    if start > end:
+        raise validation.ValidationError(
+            text=_("Das Startdatum liegt nach dem Enddatum."),
+            title=_("Startdatum nach Enddatum"),
+            errorname="start-after-end",
+        )
+
+    tz = timezone.get_current_timezone()
+    sessions = member.work_sessions.filter(
+        is_ended=True,
+        time_start__gte=datetime.combine(start, time.min, tzinfo=tz),
+        time_start__lt=datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz),
+    )
+    rows = (
+        sessions.annotate(
+            bucket=Trunc("time_start", STATS_INTERVALS[interval], output_field=DateField())
+        )
+        .values("bucket")
+        .annotate(
+            duration=Sum(F("time_end") - F("time_start"), output_field=DurationField()),
+            unit_count=Sum("unit_count"),
+            session_count=Count("uid"),
+        )
+        .order_by("bucket")
+    )
+
+    buckets = [
+        {
+            "start": row["bucket"].isoformat(),
+            "duration": row["duration"].total_seconds() if row["duration"] else 0.0,
+            "unit_count": row["unit_count"] or 0.0,
+            "session_count": row["session_count"],
+        }
+        for row in rows
+    ]
+    return JsonResponse(
+        {
+            "interval": interval,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "stats": buckets,
+            "total": {
+                "duration": sum(bucket["duration"] for bucket in buckets),
+                "unit_count": sum(bucket["unit_count"] for bucket in buckets),
+                "session_count": sum(bucket["session_count"] for bucket in buckets),
+            },
+        }
+    )
+
+
 @api_view(["get", "post", "delete"])
 @teamized_prep()
-@require_objects([("team", Team, "team"), ("session", WorkSession, "session")])
-def endpoint_worksession(request, team: Team, session: WorkSession):
+@require_objects([("team", Team, "team"), ("session", WorkSession, "session", "pk", "team")])
+def endpoint_worksession(
+    request, team: Team, session: WorkSession
+):  # pylint: disable=unused-argument
     """
     Endpoint for managing or deleting a WorkSession.
     """
@@ -60,10 +157,7 @@ def endpoint_worksession(request, team: Team, session: WorkSession):
     user: User = request.teamized_user
 
     # Check if it's the user's session
-    if session.user != user:
-        return OBJ_NOT_FOUND
-    # Check if session is in team
-    if session.team != team:
+    if session.user_id != user.uid:
         return OBJ_NOT_FOUND
 
     if request.method == "GET":
@@ -110,7 +204,8 @@ def endpoint_tracking_start(request, team: Team):
 
     # Check if the user is a member of the team
     user: User = request.teamized_user
-    if not team.user_is_member(user):
+    perms: PermissionContext = request.teamized_permissions
+    if not perms.is_member(team):
         return NO_PERMISSION
 
     # Check if the user is already tracking a session
@@ -127,7 +222,7 @@ def endpoint_tracking_start(request, team: Team):
     # Create a new tracking session
     new_session = WorkSession.objects.create(
         user=user,
-        member=team.get_member(user),
+        member=perms.get_member(team),
         team=team,
         is_created_via_tracking=True,
     )
@@ -11,6 +11,8 @@ urlpatterns = [
     path("profile", ep.main.endpoint_profile, name="api-profile"),
     path("settings", ep.main.endpoint_settings, name="api-settings"),
     path("messages", ep.main.endpoint_messages, name="api-messages"),
+    path("bootstrap", ep.main.endpoint_bootstrap, name="api-bootstrap"),
+    path("batch", ep.batch.endpoint_batch, name="api-batch"),
     path("teams", ep.main.endpoint_teams, name="api-teams"),
     path("teams/<team>", ep.main.endpoint_team, name="api-team"),
     path("teams/<team>/members", ep.main.endpoint_members, name="api-members"),
@@ -18,6 +20,7 @@ urlpatterns = [
     path("teams/<team>/invites", ep.main.endpoint_invites, name="api-invites"),
     path("teams/<team>/invites/<invite>", ep.main.endpoint_invite, name="api-invite"),
     path("teams/<team>/leave", ep.main.endpoint_team_leave, name="api-team-leave"),
+    path("teams/<team>/changes", ep.sync.endpoint_changes, name="api-changes"),
     path("invites/<invite>/info", ep.main.endpoint_invite_info, name="api-invite-info"),
     path(
         "invites/<invite>/accept",
@@ -30,6 +33,11 @@ urlpatterns = [
         ep.workingtime.endpoint_worksessions,
         name="api-workingtime-worksessions",
     ),
+    path(
+        "teams/<team>/me/worksessions/stats",
+        ep.workingtime.endpoint_worksessions_stats,
+        name="api-workingtime-worksessions-stats",
+    ),
     path(
         "teams/<team>/me/worksessions/<session>",
         ep.workingtime.endpoint_worksession,
@@ -52,11 +60,21 @@ urlpatterns = [
     ),
     # Calendar API views
     path("teams/<team>/calendars", ep.calendar.endpoint_calendars, name="api-calendars"),
+    path(
+        "teams/<team>/calendars/freebusy",
+        ep.calendar.endpoint_freebusy,
+        name="api-calendars-freebusy",
+    ),
     path(
         "teams/<team>/calendars/<calendar>",
         ep.calendar.endpoint_calendar,
         name="api-calendar",
     ),
+    path(
+        "teams/<team>/calendars/<calendar>/import",
+        ep.calendar.endpoint_events_import,
+        name="api-events-import",
+    ),
     path(
         "teams/<team>/calendars/<calendar>/events",
         ep.calendar.endpoint_events,
@@ -84,6 +102,11 @@ urlpatterns = [
         ep.todo.endpoint_todolistitems,
         name="api-todolistitems",
     ),
+    path(
+        "teams/<team>/todolists/<todolist>/items/bulk",
+        ep.todo.endpoint_todolistitems_bulk,
+        name="api-todolistitems-bulk",
+    ),
     path(
         "teams/<team>/todolists/<todolist>/items/<item>",
         ep.todo.endpoint_todolistitem,
@@ -9,13 +9,13 @@ from teamized.api.utils.models import ApiKey
 class ApiKeyAdmin(admin.ModelAdmin):
     """Admin model for API keys"""
 
-    list_display = ["id", "name", "user", "read", "write", "key_preview"]
+    list_display = ["id", "name", "user", "read", "write", "key_preview", "last_used"]
     list_filter = ["read", "write"]
 
-    readonly_fields = ("key",)
+    readonly_fields = ("key", "last_used")
 
     fieldsets = [
-        ("Settings", {"fields": ("name", "user", ("read", "write"))}),
+        ("Settings", {"fields": ("name", "user", ("read", "write"), "last_used")}),
         ("Key", {"fields": ("key",), "classes": ("collapse",)}),
     ]
 
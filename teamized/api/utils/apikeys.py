@@ -0,0 +1,122 @@
+"""API key authentication
+
+Resolving an API key requires loading the key, its user and the permissions of that user.
+Integrations poll the API with the same key over and over again, so resolved keys are
+cached per process for options.APIKEY_CACHE_TTL seconds. The cache is invalidated by the
+signal handlers in teamized.signals whenever a key or its user changes. Other processes
+notice such changes once their cache entry expires.
+
+The "last used" timestamps of the keys are collected in memory and written to the database
+at most every options.APIKEY_LAST_USED_FLUSH_INTERVAL seconds.
+"""
+
+import threading
+import time
+import uuid
+
+from django.db.models import Case, When, Value
+from django.utils import timezone
+
+from teamized import options
+from teamized.api.utils.models import ApiKey
+
+
+class ResolvedApiKey:
+    """The data of an API key (and its user) needed to authenticate a request"""
+
+    def __init__(self, keyobject: ApiKey):
+        user = keyobject.user
+
+        self.key_id: int = keyobject.pk
+        self.key: str = str(keyobject.key)
+        self.user_id: int = user.pk
+        self.read: bool = keyobject.read
+        self.write: bool = keyobject.write
+        self.is_active: bool = user.is_active
+        self.is_superuser: bool = user.is_superuser
+        self.permissions: frozenset[str] = frozenset(user.get_all_permissions())
+
+    def has_perms(self, perm_list) -> bool:
+        """Same as user.has_perms, but without querying the database"""
+
+        if not self.is_active:
+            return False
+        if self.is_superuser:
+            return True
+        return all(perm in self.permissions for perm in perm_list)
+
+
+class ApiKeyCache:
+    """Process-local TTL cache of resolved API keys"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[ResolvedApiKey, float]] = {}
+        self._last_used: dict[int, object] = {}
+        self._last_flush = time.monotonic()
+
+    def get(self, key: str) -> ResolvedApiKey | None:
+        """Get a resolved API key (or None if the key doesn't exist)"""
+
+        try:
+            key = str(uuid.UUID(str(key)))
+        except ValueError:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+
+        keyobject = ApiKey.objects.select_related("user").filter(key=key).first()
+        if keyobject is None:
+            return None
+
+        resolved = ResolvedApiKey(keyobject)
+        with self._lock:
+            self._entries[key] = (resolved, time.monotonic() + options.APIKEY_CACHE_TTL)
+        return resolved
+
+    def invalidate_key(self, key) -> None:
+        """Remove a key from the cache"""
+
+        with self._lock:
+            self._entries.pop(str(key), None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Remove all keys of a user from the cache"""
+
+        with self._lock:
+            for key, (resolved, _expires) in list(self._entries.items()):
+                if resolved.user_id == user_id:
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove all keys from the cache"""
+
+        with self._lock:
+            self._entries.clear()
+
+    def mark_used(self, resolved: ResolvedApiKey) -> None:
+        """Remember that a key has been used and write the timestamps if they are due"""
+
+        with self._lock:
+            self._last_used[resolved.key_id] = timezone.now()
+            if time.monotonic() - self._last_flush < options.APIKEY_LAST_USED_FLUSH_INTERVAL:
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """Write all pending "last used" timestamps to the database (in a single query)"""
+
+        with self._lock:
+            pending, self._last_used = self._last_used, {}
+            self._last_flush = time.monotonic()
+
+        if pending:
+            ApiKey.objects.filter(pk__in=pending.keys()).update(
+                last_used=Case(*[When(pk=pk, then=Value(ts)) for pk, ts in pending.items()])
+            )
+
+
+apikey_cache = ApiKeyCache()
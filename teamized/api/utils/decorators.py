@@ -3,8 +3,10 @@
 import uuid
 from functools import wraps
 
+from django.contrib.auth import get_user_model
 from django.db.models import fields
 from django.http import JsonResponse
+from django.utils.functional import SimpleLazyObject
 from django.utils.translation import gettext as _
 
 from teamized import exceptions
@@ -17,6 +19,8 @@ from teamized.api.utils.constants import (
     OBJ_NOT_FOUND,
     NOT_AN_UUID,
 )
+from teamized.api.utils import instrumentation
+from teamized.api.utils.apikeys import apikey_cache, ResolvedApiKey
 from teamized.api.utils.models import ApiKey
 
 
@@ -28,6 +32,15 @@ def _is_valid_uuid(val):
         return False
 
 
+def _lazy_apikey_user(resolved: ResolvedApiKey):
+    """Load the user of an API key (together with its teamized user) only when needed"""
+
+    def load():
+        return get_user_model().objects.select_related("teamized_user").get(pk=resolved.user_id)
+
+    return SimpleLazyObject(load)
+
+
 def api_view(allowed_methods: list[str] = None, perms_required=()):
     """Decorator: Protect an api view from unauthorized access."""
 
@@ -35,8 +48,7 @@ def api_view(allowed_methods: list[str] = None, perms_required=()):
         allowed_methods = ["get"]
 
     def decorator(function):
-        @wraps(function)
-        def wrap(request, *args, **kwargs):
+        def handle(request, *args, **kwargs):
             try:
                 if request.method.lower() not in [x.lower() for x in allowed_methods]:
                     return METHOD_NOT_ALLOWED
@@ -45,19 +57,22 @@ def api_view(allowed_methods: list[str] = None, perms_required=()):
 
                 # If the user provided an apikey, try to authenticate with it
                 if apikey:
-                    if _is_valid_uuid(apikey) and ApiKey.objects.filter(key=apikey).exists():
-                        keyobject = ApiKey.objects.get(key=apikey)
+                    resolved = apikey_cache.get(apikey) if _is_valid_uuid(apikey) else None
 
+                    if resolved is not None:
                         if request.method.upper() == "GET":
-                            if not keyobject.read:
+                            if not resolved.read:
                                 return NO_PERMISSION_APIKEY
-                        elif not keyobject.write:
+                        elif not resolved.write:
                             return NO_PERMISSION_APIKEY
-                        elif not keyobject.has_perms(perms_required):
+                        elif not resolved.has_perms(perms_required):
                             return NO_PERMISSION_APIKEY
 
-                        request.user = keyobject.user
-                        request.api_key = keyobject
+                        apikey_cache.mark_used(resolved)
+                        request.user = _lazy_apikey_user(resolved)
+                        request.api_key = SimpleLazyObject(
+                            lambda: ApiKey.objects.get(pk=resolved.key_id)
+                        )
                         return function(request, *args, **kwargs)
 
                     return APIKEY_INVALID
@@ -73,68 +88,174 @@ def api_view(allowed_methods: list[str] = None, perms_required=()):
             except exceptions.AlertException as exc:
                 return exc.get_json_response()
 
+        @wraps(function)
+        def wrap(request, *args, **kwargs):
+            if not instrumentation.is_enabled():
+                return handle(request, *args, **kwargs)
+
+            with instrumentation.QueryStats() as stats:
+                response = handle(request, *args, **kwargs)
+            return instrumentation.add_server_timing(response, stats)
+
         return wrap
 
     return decorator
 
 
+def _parse_object_config(elem) -> dict:
+    """Fill the optional arguments of a require_objects config element"""
+
+    elem = list(elem)
+    if len(elem) == 2:
+        elem.append(elem[0])
+    if len(elem) == 3:
+        elem.append("pk")
+    if len(elem) == 4:
+        elem.append(None)
+
+    field_in, model, field_out, dbfieldname, parent = elem
+
+    # Find the primary key of the model if the placeholder "pk" is given
+    if dbfieldname == "pk":
+        dbfieldname = model._meta.pk.name
+
+    # The parent can be given as "fieldname" or as ("lookup__path", "parent_fieldname_out")
+    if isinstance(parent, str):
+        parent = (parent, parent)
+
+    return {
+        "field_in": field_in,
+        "model": model,
+        "field_out": field_out,
+        "dbfieldname": dbfieldname,
+        "parent_path": parent[0] if parent else None,
+        "parent_out": parent[1] if parent else None,
+    }
+
+
+def _object_not_found_response(model) -> JsonResponse:
+    if hasattr(model, "NOT_FOUND_TEXT"):
+        return JsonResponse(
+            {
+                "error": "object-not-found",
+                "message": _("Dieses Objekt konnte nicht gefunden werden."),
+                "alert": {
+                    "title": getattr(model, "NOT_FOUND_TITLE", _("Objekt nicht gefunden")),
+                    "text": getattr(model, "NOT_FOUND_TEXT"),
+                },
+            },
+            status=400,
+        )
+
+    return OBJ_NOT_FOUND
+
+
+def _find_object_chain(chain: list[tuple[dict, str | None]], values: dict) -> dict | None:
+    """Find the last object of a chain together with all of its parents in a single query.
+    Returns a dict (fieldname_out -> object) or None if the objects don't exist or don't belong
+    to each other."""
+
+    leaf = chain[0][0]
+    model = leaf["model"]
+
+    search = {leaf["dbfieldname"]: values[leaf["field_out"]]}
+    for elem, path in chain[1:]:
+        search[f"{path}__{elem['dbfieldname']}"] = values[elem["field_out"]]
+    related = [path for _elem, path in chain[1:]]
+
+    try:
+        obj = model.objects.select_related(*related).get(**search)
+    except model.DoesNotExist:
+        return None
+
+    # The parents are already loaded (select_related), so this doesn't cause any queries
+    objects = {leaf["field_out"]: obj}
+    for elem, path in chain[1:]:
+        parent = obj
+        for attr in path.split("__"):
+            parent = getattr(parent, attr)
+        objects[elem["field_out"]] = parent
+    return objects
+
+
+def _chain_not_found_response(chain: list[tuple[dict, str | None]], values: dict) -> JsonResponse:
+    """Get the error response for a chain that couldn't be found (see _find_object_chain):
+    The not found error of the first object (from the root) that doesn't exist, or a generic
+    one if all of them exist but don't belong to each other."""
+
+    def exists(elem) -> bool:
+        search = {elem["dbfieldname"]: values[elem["field_out"]]}
+        return elem["model"].objects.filter(**search).exists()
+
+    for elem, _path in reversed(chain[1:]):
+        if not exists(elem):
+            return _object_not_found_response(elem["model"])
+    leaf = chain[0][0]
+    if len(chain) > 1 and exists(leaf):
+        return OBJ_NOT_FOUND
+    return _object_not_found_response(leaf["model"])
+
+
 def require_objects(config, allow_none=False):
     """Decorator to only call the view if objects with given ids exist
     and automatically pass them instead of the ids.
 
-    Format: [["fieldname_in", Model, "fieldname_out", "pk"]...]"""
+    Format: [["fieldname_in", Model, "fieldname_out", "pk", "parent"]...]
 
-    def decorator(function):
-        @wraps(function)
-        def wrap(request, *args, **kwargs):
-            for elem in config:
-                elem = list(elem)
+    The optional parent declares that the object must belong to a previously listed object.
+    It is either the name of the foreign key (if it matches the fieldname_out of the parent)
+    or a tuple ("lookup__path", "parent_fieldname_out"). Each chain of parents is fetched
+    in a single query (using select_related) and the ownership is checked in the database.
+    If that fails, the objects are checked one by one to report the first one that is missing.
+    """
+
+    elems = [_parse_object_config(elem) for elem in config]
+    elems_by_out = {elem["field_out"]: elem for elem in elems}
+    parent_outs = {elem["parent_out"] for elem in elems if elem["parent_out"]}
 
-                # Fill the optional arguments if they are not given
-                if len(elem) == 2:
-                    elem.append(elem[0])
-                if len(elem) == 3:
-                    elem.append("pk")
+    def get_chain(elem) -> list[tuple[dict, str | None]]:
+        """Get the chain of (element, lookup path from the leaf) up to the root"""
 
-                # Extract the four arguments from the list
-                field_in, model, field_out, dbfieldname = elem
-                value = kwargs.pop(field_in)
+        chain = [(elem, None)]
+        path = None
+        while elem["parent_out"]:
+            path = elem["parent_path"] if path is None else f"{path}__{elem['parent_path']}"
+            elem = elems_by_out[elem["parent_out"]]
+            chain.append((elem, path))
+        return chain
 
-                # Find the primary key of the model if the placeholder "pk" is given
-                if dbfieldname == "pk":
-                    dbfieldname = model._meta.pk.name
+    # Only the last object of every chain has to be fetched; its parents are loaded with it
+    chains = [get_chain(elem) for elem in elems if elem["field_out"] not in parent_outs]
+
+    def decorator(function):
+        @wraps(function)
+        def wrap(request, *args, **kwargs):
+            values = {}
+            for elem in elems:
+                value = kwargs.pop(elem["field_in"])
 
                 # Find the field in the model and check its type
-                dbfield = model._meta.get_field(dbfieldname)
+                dbfield = elem["model"]._meta.get_field(elem["dbfieldname"])
                 if isinstance(dbfield, fields.UUIDField) and not _is_valid_uuid(value):
                     return NOT_AN_UUID
 
-                # Find the object with the given id
-                search = {dbfieldname: value}
-                if model.objects.filter(**search).exists():
-                    kwargs[field_out] = model.objects.get(**search)
-                    continue  # Go to the next object (if present
-
-                if allow_none:
-                    kwargs[field_out] = None
-                    continue  # Go to the next object (if present)
-
-                if hasattr(model, "NOT_FOUND_TEXT"):
-                    return JsonResponse(
-                        {
-                            "error": "object-not-found",
-                            "message": _("Dieses Objekt konnte nicht gefunden werden."),
-                            "alert": {
-                                "title": getattr(
-                                    model, "NOT_FOUND_TITLE", _("Objekt nicht gefunden")
-                                ),
-                                "text": getattr(model, "NOT_FOUND_TEXT"),
-                            },
-                        },
-                        status=400,
-                    )
-
-                return OBJ_NOT_FOUND
+                values[elem["field_out"]] = value
+
+            for chain in chains:
+                objects = _find_object_chain(chain, values)
+
+                if objects is None:
+                    if allow_none:
+                        # Parents resolved by another chain are kept
+                        kwargs[chain[0][0]["field_out"]] = None
+                        for elem, _path in chain[1:]:
+                            kwargs.setdefault(elem["field_out"], None)
+                        continue  # Go to the next object (if present)
+                    return _chain_not_found_response(chain, values)
+
+                for field_out, obj in objects.items():
+                    if kwargs.get(field_out) is None:
+                        kwargs[field_out] = obj
 
             return function(request, *args, **kwargs)
 
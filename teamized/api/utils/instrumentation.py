@@ -0,0 +1,83 @@
+"""API instrumentation
+
+Records the number of SQL queries, the time spent executing them and the total time spent
+in an API endpoint. Enable it with the TEAMIZED_API_INSTRUMENTATION setting; the numbers
+are then added to every API response as a Server-Timing header, which is shown in the
+network tab of the browser's developer tools.
+"""
+
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse
+
+from teamized.api.utils import constants
+
+
+def is_enabled() -> bool:
+    """Check whether the instrumentation is enabled in the settings"""
+    return getattr(settings, "TEAMIZED_API_INSTRUMENTATION", False)
+
+
+class QueryStats:
+    """Context manager recording the queries executed and the time spent inside it"""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.total_time = 0.0
+        self._start = None
+        self._wrapper = None
+
+    def _execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_time += time.perf_counter() - start
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self._execute_wrapper)
+        self._wrapper.__enter__()  # pylint: disable=unnecessary-dunder-call
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.total_time = time.perf_counter() - self._start
+        self._wrapper.__exit__(exc_type, exc_value, traceback)
+
+    @property
+    def app_time(self) -> float:
+        """Time spent outside the database (loading, serialization and rendering)"""
+        return max(self.total_time - self.sql_time, 0.0)
+
+    def get_server_timing(self) -> str:
+        """Format the stats as a Server-Timing header value (durations in milliseconds)"""
+        return ", ".join(
+            [
+                f'db;dur={self.sql_time * 1000:.2f};desc="{self.queries} queries"',
+                f'app;dur={self.app_time * 1000:.2f};desc="Serialization and other Python code"',
+                f"total;dur={self.total_time * 1000:.2f}",
+            ]
+        )
+
+
+# Some endpoints return these shared response objects, which must not be modified
+_SHARED_RESPONSES = {
+    id(value) for value in vars(constants).values() if isinstance(value, HttpResponse)
+}
+
+
+def add_server_timing(response: HttpResponse, stats: QueryStats) -> HttpResponse:
+    """Add the stats to a response (copying shared responses first)"""
+
+    if id(response) in _SHARED_RESPONSES:
+        response = HttpResponse(
+            response.content,
+            status=response.status_code,
+            content_type=response["Content-Type"],
+        )
+    response["Server-Timing"] = stats.get_server_timing()
+    return response
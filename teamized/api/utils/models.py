@@ -36,6 +36,12 @@ class ApiKey(models.Model):
         verbose_name="Write permission?",
         default=False,
     )
+    last_used = models.DateTimeField(
+        verbose_name="Last used",
+        null=True,
+        blank=True,
+        editable=False,
+    )
 
     objects = models.Manager()
 
@@ -0,0 +1,92 @@
+"""Keyset (cursor) pagination
+
+Unlike offset pagination, keyset pagination continues after the last object of the previous
+page (WHERE (a, b) < (last_a, last_b)), so every page costs the same as the first one if
+there's an index on the ordering fields.
+"""
+
+import base64
+import datetime as dt
+import uuid
+
+from django.db.models import F, Q, QuerySet
+from django.utils.translation import gettext as _
+
+from teamized import options, validation
+from teamized.exceptions import ValidationError
+
+
+def encode_cursor(value: dt.datetime | None, pk: uuid.UUID) -> str:
+    """Encode the ordering values of the last object on a page as an opaque cursor"""
+
+    raw = f"{'' if value is None else value.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[dt.datetime | None, uuid.UUID]:
+    """Decode a cursor created by encode_cursor"""
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        value, pk = raw.split("|")
+        return (dt.datetime.fromisoformat(value) if value else None), uuid.UUID(pk)
+    except ValueError as exc:
+        raise ValidationError(
+            _("Der Cursor '{}' ist ungültig!").format(cursor), errorname="invalid_cursor"
+        ) from exc
+
+
+def paginate_keyset(
+    queryset: QuerySet, data: dict, field: str, descending: bool = True
+) -> tuple[list, str | None]:
+    """
+    Get a page of a queryset ordered by (field, pk).
+    Reads the 'cursor' and 'page_size' parameters from data. Without a page size, all
+    remaining objects are returned. If the field is nullable, the objects without a value
+    come last.
+    Returns the objects and the cursor of the next page (None if this is the last page).
+    """
+
+    cursor = validation.text(data, "cursor", False, default=None, null=True)
+    page_size = validation.integer(
+        data,
+        "page_size",
+        False,
+        default=None,
+        null=True,
+        min_value=1,
+        max_value=options.API_MAX_PAGE_SIZE,
+    )
+
+    direction = "lt" if descending else "gt"
+    prefix = "-" if descending else ""
+    nullable = queryset.model._meta.get_field(field).null
+    if nullable:
+        ordering = F(field).desc(nulls_last=True) if descending else F(field).asc(nulls_last=True)
+        queryset = queryset.order_by(ordering, f"{prefix}pk")
+    else:
+        queryset = queryset.order_by(f"{prefix}{field}", f"{prefix}pk")
+
+    if cursor:
+        value, pk = decode_cursor(cursor)
+        if value is None:
+            # Only objects without a value are left
+            queryset = queryset.filter(**{f"{field}__isnull": True, f"pk__{direction}": pk})
+        else:
+            condition = Q(**{f"{field}__{direction}": value}) | Q(
+                **{field: value, f"pk__{direction}": pk}
+            )
+            if nullable:
+                condition |= Q(**{f"{field}__isnull": True})
+            queryset = queryset.filter(condition)
+
+    if page_size is None:
+        return list(queryset), None
+
+    # Fetch one more object to know whether there's a next page
+    objects = list(queryset[: page_size + 1])
+    if len(objects) <= page_size:
+        return objects, None
+    objects = objects[:page_size]
+    last = objects[-1]
+    return objects, encode_cursor(getattr(last, field), last.pk)
@@ -8,3 +8,7 @@ class DefaultConfig(AppConfig):
     name = "teamized"
     label = "teamized"
     verbose_name = "Teamized"
+
+    def ready(self):
+        # Connect the signal handlers
+        from teamized import signals  # pylint: disable=import-outside-toplevel,unused-import # noqa
@@ -57,14 +57,14 @@ class Club(models.Model):
     def __str__(self):
         return str(self.name)
 
-    def as_dict(self):
+    def as_dict(self, membercount: int | None = None):
         return {
             "id": str(self.uid),
             "name": str(self.name),
             "description": str(self.description),
             "slug": str(self.slug),
             "url": reverse("teamized:club_login", kwargs={"clubslug": self.slug}),
-            "membercount": self.members.count(),
+            "membercount": self.members.count() if membercount is None else membercount,
         }
 
     def ensure_session_structure(self, request):
@@ -195,6 +195,10 @@ class ClubMember(models.Model):
         verbose_name = _("Vereinsmitglied")
         verbose_name_plural = _("Vereinsmitglieder")
         unique_together = [["club", "email"]]
+        indexes = [
+            # Used for syncing the changed objects of a team (see endpoint_changes)
+            models.Index(fields=["club", "date_modified"], name="teamized_clubmember_upd_idx"),
+        ]
 
     objects = models.Manager()
 
@@ -523,6 +527,10 @@ class ClubMemberGroup(models.Model):
     class Meta:
         verbose_name = _("Vereinsmitgliedergruppe")
         verbose_name_plural = _("Vereinsmitgliedergruppen")
+        indexes = [
+            # Used for syncing the changed objects of a team (see endpoint_changes)
+            models.Index(fields=["club", "date_modified"], name="teamized_clubgroup_upd_idx"),
+        ]
 
     objects = models.Manager()
 
@@ -657,6 +665,10 @@ class ClubAttendanceEvent(models.Model):
     class Meta:
         verbose_name = _("Anwesenheitsereignis")
         verbose_name_plural = _("Anwesenheitsereignisse")
+        indexes = [
+            # Used for syncing the changed objects of a team (see endpoint_changes)
+            models.Index(fields=["club", "date_modified"], name="teamized_clubevent_upd_idx"),
+        ]
 
     objects = models.Manager()
 
@@ -769,6 +781,10 @@ class ClubAttendanceEventParticipation(models.Model):
         verbose_name = _("Anwesenheitsteilnahme")
         verbose_name_plural = _("Anwesenheitsteilnahmen")
         unique_together = [["event", "member"]]
+        indexes = [
+            # Used for syncing the changed objects of a team (see endpoint_changes)
+            models.Index(fields=["event", "date_modified"], name="teamized_clubpart_upd_idx"),
+        ]
 
     objects = models.Manager()
 
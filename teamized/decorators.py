@@ -11,6 +11,7 @@ from django.shortcuts import render
 from django.utils.translation import gettext as _
 
 from teamized import models, exceptions
+from teamized.permissions import PermissionContext
 
 
 def teamized_prep():
@@ -18,12 +19,17 @@ def teamized_prep():
     Decorator for endpoints: Prepare a request for teamized views. Requires authentication.
     Creates a new custom user if the user does not exist yet.
     Sets request.teamized_user to the custom user object.
+    Sets request.teamized_permissions to a request-scoped PermissionContext.
     Creates a new team if the user does not have a team yet.
     """
 
     def decorator(function):
         @wraps(function)
         def wrap(request, *args, **kwargs):
+            # Sub-requests of a batch request are already prepared (see api/endpoints/batch.py)
+            if getattr(request, "teamized_permissions", None) is not None:
+                return function(request, *args, **kwargs)
+
             # Ensure that the user is authenticated.
 
             if not request.user.is_authenticated:
@@ -38,6 +44,7 @@ def teamized_prep():
                 models.User.objects.create(auth_user=request.user)
             request.teamized_user = request.user.teamized_user
             request.teamized_user.ensure_team()
+            request.teamized_permissions = PermissionContext(request.teamized_user)
 
             return function(request, *args, **kwargs)
 
@@ -15,6 +15,38 @@ class Roles(models.TextChoices):
     MEMBER = "member", _("Mitglied")
 
 
+class RecurrenceFrequencies(models.TextChoices):
+    """How often a calendar event recurs (FREQ of an iCalendar RRULE)"""
+
+    NONE = "", _("Keine Wiederholung")
+    DAILY = "daily", _("Täglich")
+    WEEKLY = "weekly", _("Wöchentlich")
+    MONTHLY = "monthly", _("Monatlich")
+
+
+class ToDoBulkActions(models.TextChoices):
+    """Actions that can be applied to many to-do list items at once"""
+
+    DONE = "done", _("Als erledigt markieren")
+    UNDONE = "undone", _("Als unerledigt markieren")
+    MOVE = "move", _("Verschieben")
+    DELETE = "delete", _("Löschen")
+
+
+class SyncCategories(models.TextChoices):
+    """Object types that can be synced incrementally (see endpoint_changes)"""
+
+    WORKSESSIONS = "worksessions", _("Sitzungen")
+    CALENDARS = "calendars", _("Kalender")
+    EVENTS = "events", _("Ereignisse")
+    TODOLISTS = "todolists", _("To-do-Listen")
+    TODOLISTITEMS = "todolistitems", _("To-do-Listeneinträge")
+    CLUB_MEMBERS = "club_members", _("Vereinsmitglieder")
+    CLUB_GROUPS = "club_groups", _("Vereinsmitgliedergruppen")
+    CLUB_ATTENDANCE_EVENTS = "club_attendance_events", _("Anwesenheitsereignisse")
+    CLUB_PARTICIPATIONS = "club_participations", _("Anwesenheitsteilnahmen")
+
+
 # The following enums are part of a planned feature: Logging
 
 # class Scopes:
@@ -21,6 +21,9 @@ class AlertException(Exception):
         self._custom_errorname = errorname
         self._custom_status = status
 
+    def get_text(self) -> str:
+        return str(self._custom_text)
+
     def get_json_response(self) -> JsonResponse:
         return JsonResponse(
             {
@@ -0,0 +1,271 @@
+"""Parsing of iCalendar (.ics) files
+
+Only the parts needed for importing events are supported: VEVENT components with their
+properties. The parser works line by line, so files of any size can be parsed with constant
+memory usage.
+
+Read more: https://icalendar.org/
+"""
+
+import datetime as dt
+import re
+import typing
+import zoneinfo
+from collections.abc import Iterable
+
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from teamized.exceptions import ValidationError
+
+# RRULE parts that can be imported (see CalendarEvent.recurrence)
+SUPPORTED_RRULE_PARTS = {"FREQ", "INTERVAL", "COUNT", "UNTIL", "WKST"}
+SUPPORTED_RRULE_FREQUENCIES = {"DAILY", "WEEKLY", "MONTHLY"}
+
+# A DURATION value, e.g. P1W, P1D, PT1H30M or P1DT12H
+DURATION_PATTERN = re.compile(
+    r"\+?P(?=T?\d)(?:(?P<weeks>\d+)W|(?:(?P<days>\d+)D)?"
+    r"(?:T(?=\d)(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?)"
+)
+
+
+class IcsProperty(typing.NamedTuple):
+    """A content line: NAME;PARAM=VALUE:value"""
+
+    name: str
+    params: dict
+    value: str
+
+
+def unfold_lines(lines: Iterable[str]) -> typing.Iterator[str]:
+    """Join folded lines (continuation lines start with a space or a tab)"""
+
+    current = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.startswith((" ", "\t")):
+            if current is not None:
+                current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line.lstrip("\ufeff")
+    if current is not None:
+        yield current
+
+
+def parse_line(line: str) -> IcsProperty:
+    """Split a content line into its name, parameters and value"""
+
+    # The value starts after the first colon that isn't inside a quoted parameter value
+    quoted = False
+    for i, char in enumerate(line):
+        if char == '"':
+            quoted = not quoted
+        elif char == ":" and not quoted:
+            head, value = line[:i], line[i + 1 :]
+            break
+    else:
+        head, value = line, ""
+
+    name, *params = head.split(";")
+    return IcsProperty(
+        name.upper(),
+        {
+            key.upper(): val.strip('"')
+            for key, __, val in (param.partition("=") for param in params)
+        },
+        value,
+    )
+
+
+def iter_events(lines: Iterable[str]) -> typing.Iterator[list[IcsProperty]]:
+    """Iterate over the VEVENT components of an ics file (as lists of their properties)
+
+    Properties of nested components (e.g. VALARM) are skipped.
+    """
+
+    properties = None
+    depth = 0
+    for line in unfold_lines(lines):
+        if not line.strip():
+            continue
+        prop = parse_line(line)
+        if prop.name == "BEGIN":
+            if prop.value.upper() == "VEVENT":
+                properties = []
+                depth = 0
+            elif properties is not None:
+                depth += 1
+        elif prop.name == "END":
+            if prop.value.upper() == "VEVENT" and properties is not None:
+                yield properties
+                properties = None
+            elif properties is not None:
+                depth -= 1
+        elif properties is not None and depth == 0:
+            properties.append(prop)
+
+
+def unescape_text(value: str) -> str:
+    """Convert a TEXT value to a string"""
+
+    result = []
+    chars = iter(value)
+    for char in chars:
+        if char == "\\":
+            escaped = next(chars, "")
+            result.append("\n" if escaped in ("n", "N") else escaped)
+        else:
+            result.append(char)
+    return "".join(result)
+
+
+def parse_date_or_datetime(prop: IcsProperty) -> dt.date | dt.datetime:
+    """Convert a DATE or DATE-TIME value (the first one of a list)
+
+    Date-times are returned as aware datetimes: UTC for values ending with Z,
+    the TZID or the default timezone for all others.
+    """
+
+    value = prop.value.split(",")[0].strip()
+    if prop.params.get("VALUE", "").upper() == "DATE" or "T" not in value:
+        return dt.datetime.strptime(value[:8], "%Y%m%d").date()
+
+    if value.endswith("Z"):
+        return dt.datetime.strptime(value[:-1], "%Y%m%dT%H%M%S").replace(tzinfo=dt.UTC)
+    return timezone.make_aware(
+        dt.datetime.strptime(value, "%Y%m%dT%H%M%S"), get_timezone(prop.params.get("TZID"))
+    )
+
+
+def parse_dates(prop: IcsProperty) -> list[dt.date]:
+    """Convert a list of DATE or DATE-TIME values to local dates (e.g. EXDATE)"""
+
+    dates = []
+    for value in prop.value.split(","):
+        parsed = parse_date_or_datetime(IcsProperty(prop.name, prop.params, value))
+        if isinstance(parsed, dt.datetime):
+            parsed = timezone.localtime(parsed, timezone.get_default_timezone()).date()
+        dates.append(parsed)
+    return dates
+
+
+def parse_duration(value: str) -> tuple[int, dt.timedelta]:
+    """Convert a DURATION value to (days, time)
+
+    The days (and weeks) are returned separately, because they are nominal: a day always
+    ends at the same local time, even across daylight saving time changes.
+    Negative durations aren't supported (ValueError), because events can't end before they start.
+    """
+
+    match = DURATION_PATTERN.fullmatch(value.strip().upper())
+    if match is None:
+        raise ValueError(f"Invalid duration: {value}")
+    parts = {key: int(val or 0) for key, val in match.groupdict().items()}
+    time = dt.timedelta(hours=parts["hours"], minutes=parts["minutes"], seconds=parts["seconds"])
+    return parts["weeks"] * 7 + parts["days"], time
+
+
+def get_timezone(tzid: str | None) -> dt.tzinfo:
+    """Get a timezone by its TZID (the default timezone if unknown)"""
+
+    if tzid:
+        try:
+            return zoneinfo.ZoneInfo(tzid)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            pass
+    return timezone.get_default_timezone()
+
+
+def parse_rrule(value: str) -> dict:
+    """Split a RRULE value into its parts (e.g. {"FREQ": "WEEKLY", "COUNT": "3"})"""
+
+    return {key.upper(): val for key, __, val in (part.partition("=") for part in value.split(";"))}
+
+
+def get_event_data(properties: list[IcsProperty]) -> dict:
+    """Convert the properties of a VEVENT to the data expected by
+    CalendarEvent.from_post_data (so that the same validation rules apply)"""
+
+    props = {}
+    exdates = []
+    for prop in properties:
+        if prop.name == "EXDATE":
+            exdates += parse_dates(prop)
+        else:
+            props.setdefault(prop.name, prop)
+
+    data = {}
+    for name, attr in [
+        ("SUMMARY", "name"),
+        ("DESCRIPTION", "description"),
+        ("LOCATION", "location"),
+    ]:
+        if name in props:
+            data[attr] = unescape_text(props[name].value)
+
+    if "DTSTART" in props:
+        data.update(_get_time_data(props))
+
+    if "RRULE" in props:
+        data.update(_get_recurrence_data(props["RRULE"].value))
+        if exdates:
+            data["recurrence_exceptions"] = ",".join(day.isoformat() for day in exdates)
+    return data
+
+
+def _get_time_data(props: dict[str, IcsProperty]) -> dict:
+    start = parse_date_or_datetime(props["DTSTART"])
+    end = None
+    if "DTEND" in props:
+        end = parse_date_or_datetime(props["DTEND"])
+    elif "DURATION" in props:
+        end = _add_duration(start, props["DURATION"].value)
+
+    if isinstance(start, dt.datetime):
+        return {
+            "fullday": "false",
+            "dtstart": _format_datetime(start),
+            "dtend": _format_datetime(end if isinstance(end, dt.datetime) else start),
+        }
+    if isinstance(end, dt.datetime):
+        end = timezone.localtime(end, timezone.get_default_timezone()).date()
+    # The end date of full-day events is exclusive in iCalendar, but not in Teamized
+    last_day = start if end is None or end <= start else end - dt.timedelta(days=1)
+    return {"fullday": "true", "dstart": start.isoformat(), "dend": last_day.isoformat()}
+
+
+def _add_duration(start: dt.date | dt.datetime, duration: str) -> dt.date | dt.datetime:
+    days, time = parse_duration(duration)
+    # Aware datetimes with the same tzinfo are added in local time
+    end = start + dt.timedelta(days=days)
+    if isinstance(start, dt.datetime):
+        end = (end.astimezone(dt.UTC) + time).astimezone(start.tzinfo)
+    return end
+
+
+def _format_datetime(value: dt.datetime) -> str:
+    # The API expects UTC
+    return value.astimezone(dt.UTC).strftime("%Y-%m-%dT%H:%M:%S.%f%z")
+
+
+def _get_recurrence_data(value: str) -> dict:
+    rule = parse_rrule(value)
+    if rule.get("FREQ", "").upper() not in SUPPORTED_RRULE_FREQUENCIES or not set(rule).issubset(
+        SUPPORTED_RRULE_PARTS
+    ):
+        raise ValidationError(
+            _("Die Wiederholung '{}' wird nicht unterstützt.").format(value),
+            errorname="unsupported_recurrence",
+        )
+
+    data = {"recurrence": rule["FREQ"].lower()}
+    if "INTERVAL" in rule:
+        data["recurrence_interval"] = rule["INTERVAL"]
+    if "COUNT" in rule:
+        data["recurrence_count"] = rule["COUNT"]
+    if "UNTIL" in rule:
+        until = parse_dates(IcsProperty("UNTIL", {}, rule["UNTIL"]))[0]
+        data["recurrence_until"] = until.isoformat()
+    return data
@@ -0,0 +1,17 @@
+"""Management command: Delete the expired tombstones of the incremental sync"""
+
+from django.core.management.base import BaseCommand
+
+from teamized.models import Tombstone
+from teamized.options import SYNC_TOMBSTONE_RETENTION_DAYS
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the tombstones (deleted objects remembered for the incremental sync) that are "
+        f"older than {SYNC_TOMBSTONE_RETENTION_DAYS} days. Run this periodically."
+    )
+
+    def handle(self, *args, **options):
+        count = Tombstone.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {count} expired tombstones."))
@@ -0,0 +1,71 @@
+"""Management command: Generate a synthetic dataset"""
+
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from teamized.seeding import Seeder, SEED_PASSWORD
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a deterministic synthetic dataset for load tests and benchmarks. "
+        "The same seed always produces the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+        parser.add_argument(
+            "--prefix",
+            default="seed",
+            help="Prefix for usernames and club slugs; must be unique per run (default: seed)",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Rows per INSERT (default: 1000)"
+        )
+        parser.add_argument(
+            "--reference-date",
+            type=datetime.fromisoformat,
+            default=None,
+            help="Date the generated data is centered around (default: today)",
+        )
+        for name, default in Seeder.DEFAULTS.items():
+            parser.add_argument(
+                f"--{name.replace('_', '-')}",
+                dest=name,
+                type=int,
+                default=default,
+                help=f"Number of {name.replace('_', ' ')} (default: {default})",
+            )
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        if get_user_model().objects.filter(username__startswith=f"{prefix}-user-").exists():
+            raise CommandError(
+                f"A dataset with the prefix '{prefix}' already exists. Use another --prefix."
+            )
+
+        reference = options["reference_date"]
+        if reference is not None and timezone.is_naive(reference):
+            reference = timezone.make_aware(reference)
+
+        start = timezone.now()
+        seeder = Seeder(
+            seed=options["seed"],
+            prefix=prefix,
+            batch_size=options["batch_size"],
+            reference=reference,
+            **{name: options[name] for name in Seeder.DEFAULTS},
+        ).run()
+        duration = (timezone.now() - start).total_seconds()
+
+        for model_name, count in seeder.created.items():
+            self.stdout.write(f"{model_name}: {count}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {sum(seeder.created.values())} rows in {duration:.1f}s. "
+                f"All users have the password '{SEED_PASSWORD}'."
+            )
+        )
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teamized", "0011_various_verbose_names"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="apikey",
+            name="last_used",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="Last used"
+            ),
+        ),
+    ]
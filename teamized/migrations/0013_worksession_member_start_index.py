@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teamized", "0012_apikey_last_used"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="worksession",
+            index=models.Index(
+                fields=["member", "is_ended", "time_start", "uid"],
+                name="teamized_ws_member_start_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teamized", "0013_worksession_member_start_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="calendar",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Zuletzt geändert am"),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teamized", "0014_calendar_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="calendarevent",
+            index=models.Index(
+                fields=["calendar", "dtstart"], name="teamized_event_cal_dtstart_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="calendarevent",
+            index=models.Index(fields=["calendar", "dstart"], name="teamized_event_cal_dstart_idx"),
+        ),
+    ]
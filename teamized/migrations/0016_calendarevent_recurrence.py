@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teamized", "0015_calendarevent_range_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="calendarevent",
+            name="recurrence",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("", "Keine Wiederholung"),
+                    ("daily", "Täglich"),
+                    ("weekly", "Wöchentlich"),
+                    ("monthly", "Monatlich"),
+                ],
+                default="",
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="calendarevent",
+            name="recurrence_count",
+            field=models.PositiveIntegerField(blank=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name="calendarevent",
+            name="recurrence_end",
+            field=models.DateField(blank=True, default=None, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="calendarevent",
+            name="recurrence_exceptions",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name="calendarevent",
+            name="recurrence_interval",
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name="calendarevent",
+            name="recurrence_until",
+            field=models.DateField(blank=True, default=None, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="calendarevent",
+            index=models.Index(
+                fields=["calendar", "recurrence"], name="teamized_event_cal_recur_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:51
+
+import uuid
+from django.db import migrations, models
+
+
+def gen_calendar_ics_uid(apps, schema_editor):
+    # Every existing team needs its own token (a default would be the same for all rows)
+    Team = apps.get_model("teamized", "Team")
+    teams = list(Team.objects.all())
+    for team in teams:
+        team.calendar_ics_uid = uuid.uuid4()
+    Team.objects.bulk_update(teams, ["calendar_ics_uid"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teamized", "0016_calendarevent_recurrence"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="team",
+            name="calendar_ics_uid",
+            field=models.UUIDField(default=uuid.uuid4, null=True),
+        ),
+        migrations.RunPython(gen_calendar_ics_uid, reverse_code=migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="team",
+            name="calendar_ics_uid",
+            field=models.UUIDField(default=uuid.uuid4, unique=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:03
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teamized", "0017_team_calendar_ics_uid"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="todolistitem",
+            options={
+                "ordering": ["done", "name"],
+                "verbose_name": "To-do-Listeneintrag",
+                "verbose_name_plural": "To-do-Listeneinträge",
+            },
+        ),
+    ]
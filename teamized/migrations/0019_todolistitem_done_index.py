@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teamized", "0018_todolistitem_ordering"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="todolistitem",
+            index=models.Index(
+                fields=["todolist", "done", "done_at", "uid"], name="teamized_todo_done_idx"
+            ),
+        ),
+    ]
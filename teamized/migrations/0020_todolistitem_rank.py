@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:13
+
+from django.db import migrations, models
+
+import teamized.utils
+
+
+def gen_todolistitem_ranks(apps, schema_editor):
+    # Keep the previous order (open items first, then by name)
+    ToDoListItem = apps.get_model("teamized", "ToDoListItem")
+    items_by_list = {}
+    for item in ToDoListItem.objects.order_by("done", "name").only("uid", "todolist_id"):
+        items_by_list.setdefault(item.todolist_id, []).append(item)
+
+    items = []
+    for list_items in items_by_list.values():
+        for item, rank in zip(list_items, teamized.utils.ranks_between(count=len(list_items))):
+            item.rank = rank
+            items.append(item)
+    ToDoListItem.objects.bulk_update(items, ["rank"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teamized", "0019_todolistitem_done_index"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="todolistitem",
+            options={
+                "ordering": ["done", "rank", "name"],
+                "verbose_name": "To-do-Listeneintrag",
+                "verbose_name_plural": "To-do-Listeneinträge",
+            },
+        ),
+        migrations.AddField(
+            model_name="todolistitem",
+            name="rank",
+            field=models.CharField(blank=True, default="", editable=False, max_length=64),
+        ),
+        migrations.RunPython(gen_todolistitem_ranks, reverse_code=migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="todolistitem",
+            index=models.Index(fields=["todolist", "done", "rank"], name="teamized_todo_rank_idx"),
+        ),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:42
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teamized", "0020_todolistitem_rank"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "uid",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="UID",
+                    ),
+                ),
+                ("container_id", models.UUIDField()),
+                (
+                    "category",
+                    models.CharField(
+                        choices=[
+                            ("worksessions", "Sitzungen"),
+                            ("calendars", "Kalender"),
+                            ("events", "Ereignisse"),
+                            ("todolists", "To-do-Listen"),
+                            ("todolistitems", "To-do-Listeneinträge"),
+                            ("club_members", "Vereinsmitglieder"),
+                            ("club_groups", "Vereinsmitgliedergruppen"),
+                            ("club_attendance_events", "Anwesenheitsereignisse"),
+                            ("club_participations", "Anwesenheitsteilnahmen"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("object_id", models.UUIDField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                "verbose_name": "Löscheintrag",
+                "verbose_name_plural": "Löscheinträge",
+                "db_table": "teamized_tombstone",
+            },
+        ),
+        migrations.AddField(
+            model_name="worksession",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Zuletzt geändert am"),
+        ),
+        migrations.AddIndex(
+            model_name="calendar",
+            index=models.Index(fields=["team", "updated_at"], name="teamized_cal_team_upd_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="calendarevent",
+            index=models.Index(
+                fields=["calendar", "updated_at"], name="teamized_event_cal_upd_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="clubattendanceevent",
+            index=models.Index(fields=["club", "date_modified"], name="teamized_clubevent_upd_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="clubattendanceeventparticipation",
+            index=models.Index(fields=["event", "date_modified"], name="teamized_clubpart_upd_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="clubmember",
+            index=models.Index(
+                fields=["club", "date_modified"], name="teamized_clubmember_upd_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="clubmembergroup",
+            index=models.Index(fields=["club", "date_modified"], name="teamized_clubgroup_upd_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="todolist",
+            index=models.Index(fields=["team", "updated_at"], name="teamized_todo_team_upd_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="todolistitem",
+            index=models.Index(
+                fields=["todolist", "updated_at"], name="teamized_todo_item_upd_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="worksession",
+            index=models.Index(fields=["updated_at"], name="teamized_ws_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(
+                fields=["container_id", "deleted_at"], name="teamized_tombstone_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:05
+
+from django.db import migrations, models
+
+
+def backfill_todolistitem_done_at(apps, schema_editor):
+    # Done items without a done_at (e.g. from before the field existed) are paginated last,
+    # use the last modification as the best guess instead
+    ToDoListItem = apps.get_model("teamized", "ToDoListItem")
+    ToDoListItem.objects.filter(done=True, done_at__isnull=True).update(
+        done_at=models.F("updated_at")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teamized", "0021_sync_changes_and_tombstones"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_todolistitem_done_at, migrations.RunPython.noop),
+    ]
@@ -4,25 +4,128 @@ Django will handle the database itself. Only the models need to be defined here.
 """
 
 import hashlib
+import itertools
 import typing
 import uuid
-from datetime import datetime
+from calendar import monthrange
+from datetime import UTC, date, datetime
 
 from django.conf import settings
 from django.contrib import admin
-from django.db import models
-from django.http import HttpResponse, HttpRequest
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+from django.http import HttpResponse, HttpRequest, StreamingHttpResponse
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
 import teamized.club.models as club_models
-from teamized import enums, options, exceptions, utils, decorators, validation
+from teamized import enums, options, exceptions, utils, decorators, validation, ics
 from teamized.translations import TranslationConstants
 
 # Create your models here.
 
 
+class IcsFeedMixin:
+    """Rendering, caching and versioning of an ics feed
+
+    Subclasses have to implement:
+    - iter_ics_chunks(request=None): Get the feed in ics format in chunks
+    - get_ics_version_parts() -> list: Get the values that change whenever the feed changes
+    - get_ics_last_modified() -> datetime: Get the last modification time of the feed
+
+    The version and the last modification time are based on annotations, so the object has
+    to be loaded with the subclass' get_public_for_ics.
+    """
+
+    # Annotation added by get_public_for_ics
+    events_count: int
+
+    REQUIRED_METHODS = ("iter_ics_chunks", "get_ics_version_parts", "get_ics_last_modified")
+
+    def __init_subclass__(cls, **kwargs):
+        # Like abc.abstractmethod (an abc.ABC can't be combined with models.Model, because the
+        # metaclasses conflict): A missing method fails when the class is defined
+        super().__init_subclass__(**kwargs)
+        missing = [name for name in cls.REQUIRED_METHODS if not callable(getattr(cls, name, None))]
+        if missing:
+            raise TypeError(f"{cls.__name__} doesn't implement {', '.join(missing)}")
+
+    @staticmethod
+    def _get_ics_header_lines(uid, name: str, description: str, color: str | None = None):
+        # Some attributes are duplicated because they are required for some clients
+        lines = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//Rafael Urben//Teamized Calendar//DE",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            "UID:" + str(uid),
+            "NAME:" + utils.ical_text(name),
+            "X-WR-CALNAME:" + utils.ical_text(name),
+            "DESCRIPTION:" + utils.ical_text(description),
+            "X-WR-CALDESC:" + utils.ical_text(description),
+        ]
+        if color is not None:
+            lines.append("COLOR:" + utils.ical_text(color))
+            lines.append("X-APPLE-CALENDAR-COLOR:" + utils.ical_text(color))
+        lines.append("X-WR-TIMEZONE:" + timezone.get_default_timezone_name())
+        return lines
+
+    @staticmethod
+    def _get_ics_timezone_lines() -> list:
+        # Recurring events use the TZID of the default timezone (see CalendarEvent.as_ics_lines).
+        # This is a component, so it has to follow all calendar properties.
+        tzid = timezone.get_default_timezone_name()
+        return list(utils.ical_vtimezone_lines(tzid, timezone.now().year))
+
+    def as_ics_text(self, request=None) -> str:
+        """Get the feed in ics format
+
+        Read more: https://icalendar.org/
+        """
+
+        return "".join(self.iter_ics_chunks(request))
+
+    def as_ics_response(
+        self, request=None, cached: bool = False, streaming: bool = False
+    ) -> HttpResponse | StreamingHttpResponse:
+        """Get the feed as an ics file response"""
+
+        if streaming:
+            response = StreamingHttpResponse(
+                self.iter_ics_chunks(request), content_type="text/calendar"
+            )
+        else:
+            text = self.get_cached_ics_text(request) if cached else self.as_ics_text(request)
+            response = HttpResponse(text, content_type="text/calendar")
+        response["Content-Disposition"] = "attachment; filename=calendar.ics"
+        return response
+
+    def get_ics_version(self, request=None) -> str:
+        """Get a hash that changes whenever the ics file changes"""
+
+        # The ics file contains absolute urls, so it also depends on the requested host
+        base_url = "" if request is None else request.build_absolute_uri("/")
+        parts = [str(part) for part in self.get_ics_version_parts()]
+        version = "|".join([*parts, base_url])
+        return hashlib.md5(version.encode(), usedforsecurity=False).hexdigest()
+
+    def get_cached_ics_text(self, request=None) -> str:
+        """Get the feed in ics format from the cache (rendered if not cached yet)"""
+
+        # pylint: disable=no-member
+        cache_key = (
+            f"teamized:{self._meta.model_name}:{self.pk}:ics:{self.get_ics_version(request)}"
+        )
+        text = cache.get(cache_key)
+        if text is None:
+            text = self.as_ics_text(request)
+            cache.set(cache_key, text, options.ICS_CACHE_TTL)
+        return text
+
+
 class User(models.Model):
     """
     An intermediary model to extend the auth user model with custom settings.
@@ -114,17 +217,32 @@ class User(models.Model):
         team.join(self, role=enums.Roles.OWNER)
         return team
 
+    @staticmethod
+    def get_owns_team_cache_key(uid) -> str:
+        """
+        Get the cache key storing whether the user with the given uid owns a team.
+        """
+
+        return f"teamized:user:{uid}:owns-team"
+
     def ensure_team(self) -> None:
         """
         Ensure that the user owns at least one team.
         If not, create one.
+        The result is cached until an owner membership of the user changes (see signals.py)
+        or for options.OWNS_TEAM_CACHE_TTL (invalidations don't reach per-process caches).
         """
 
+        cache_key = self.get_owns_team_cache_key(self.uid)
+        if cache.get(cache_key):
+            return
+
         if not self.member_instances.filter(role=enums.Roles.OWNER).exists():
             self.create_team(
                 name=_("Team von %s") % self.auth_user.username,
                 description=_("Persönlicher Arbeitsbereich von %s") % self.auth_user.username,
             )
+        cache.set(cache_key, True, options.OWNS_TEAM_CACHE_TTL)
 
     def can_create_team(self) -> bool:
         """
@@ -146,7 +264,7 @@ class User(models.Model):
         return None
 
 
-class Team(models.Model):
+class Team(IcsFeedMixin, models.Model):
     """A team"""
 
     uid = models.UUIDField(
@@ -179,29 +297,129 @@ class Team(models.Model):
     )
     updated_at = models.DateTimeField(auto_now=True, verbose_name=TranslationConstants.MODIFIED_AT)
 
+    # Token for the ics feed of all public calendars of the team
+    calendar_ics_uid = models.UUIDField(
+        default=uuid.uuid4,
+        unique=True,
+    )
+
     def __str__(self):
         return str(self.name)
 
     objects = models.Manager()
 
+    # Annotations added by get_public_for_ics
+    calendars_updated_at: datetime | None
+    events_updated_at: datetime | None
+    public_calendars_count: int
+
     class Meta:
         verbose_name = _("Team")
         verbose_name_plural = _("Teams")
         db_table = "teamized_team"
 
-    def as_dict(self, member=None, membercount=None, **additional_items) -> dict:
+    def as_dict(
+        self, member=None, membercount=None, club_membercount=None, **additional_items
+    ) -> dict:
         data = {
             "id": self.uid,
             "name": self.name,
             "description": self.description,
-            "club": self.linked_club.as_dict() if self.linked_club else None,
-            "membercount": membercount or self.members.count(),
+            "club": (
+                self.linked_club.as_dict(membercount=club_membercount) if self.linked_club else None
+            ),
+            "membercount": self.members.count() if membercount is None else membercount,
             **additional_items,
         }
         if member:
             data["member"] = member.as_dict()
         return data
 
+    @staticmethod
+    def get_count_annotations(team_ref: str = "pk", club_ref: str = "linked_club") -> dict:
+        """Get annotations for the number of members, club members, calendars and to-do lists
+
+        The references point to the team and its club from the annotated model. Every count is
+        a subquery, so the counts don't multiply each other like joins would.
+        """
+
+        def count(queryset, field, ref):
+            counts = queryset.filter(**{field: models.OuterRef(ref)}).order_by().values(field)
+            return Coalesce(
+                models.Subquery(counts.annotate(count=models.Count("pk")).values("count")), 0
+            )
+
+        return {
+            "membercount": count(Member.objects.all(), "team", team_ref),
+            "club_membercount": count(club_models.ClubMember.objects.all(), "club", club_ref),
+            "calendarcount": count(Calendar.objects.all(), "team", team_ref),
+            "todolistcount": count(ToDoList.objects.all(), "team", team_ref),
+        }
+
+    # Calendar feed
+
+    @classmethod
+    def get_public_for_ics(cls, calendar_ics_uid: uuid.UUID) -> "Team":
+        """Get a team by its calendar ics uid, annotated with the
+        information needed for get_ics_version (in a single query)"""
+
+        public = models.Q(calendars__is_public=True)
+        return cls.objects.annotate(
+            # All calendars: A calendar that was made private changes the feed too
+            calendars_updated_at=models.Max("calendars__updated_at"),
+            public_calendars_count=models.Count("calendars", filter=public, distinct=True),
+            events_updated_at=models.Max("calendars__events__updated_at", filter=public),
+            events_count=models.Count("calendars__events", filter=public),
+        ).get(calendar_ics_uid=calendar_ics_uid)
+
+    def get_ics_version_parts(self) -> list:
+        return [
+            self.uid,
+            self.updated_at.isoformat(),
+            self.calendars_updated_at and self.calendars_updated_at.isoformat(),
+            self.public_calendars_count,
+            self.events_updated_at and self.events_updated_at.isoformat(),
+            self.events_count,
+        ]
+
+    def get_ics_last_modified(self) -> datetime:
+        timestamps = [self.updated_at, self.calendars_updated_at, self.events_updated_at]
+        return max(timestamp for timestamp in timestamps if timestamp is not None)
+
+    def iter_ics_chunks(self, request=None, chunk_size: int = options.ICS_STREAMING_CHUNK_SIZE):
+        """Get the events of all public calendars of the team in ics format, one chunk per event
+
+        The events of all calendars are loaded in a single query (fetched in chunks) and are
+        tagged with the name and color of their calendar.
+        """
+
+        lines = self._get_ics_header_lines(self.calendar_ics_uid, self.name, self.description)
+        if request is not None:
+            path = reverse("teamized:app")
+            lines.append("URL:" + request.build_absolute_uri(path) + f"?p=calendars&t={self.uid}")
+            lines.append("SOURCE;VALUE=URI:" + self.get_calendar_ics_url(request))
+        lines += self._get_ics_timezone_lines()
+        yield "\r\n".join(lines)
+
+        dtstamp = utils.datetime.now()
+        events = (
+            CalendarEvent.objects.filter(calendar__team=self, calendar__is_public=True)
+            .select_related("calendar")
+            .order_by("calendar__name", "calendar_id", "dtstart", "dstart", "uid")
+        )
+        for event in events.iterator(chunk_size=chunk_size):
+            yield "\r\n" + "\r\n".join(event.as_ics_lines(dtstamp, with_calendar=True))
+
+        yield "\r\nEND:VCALENDAR"
+
+    def get_calendar_ics_url(self, request=None):
+        """Get the url to the ics file of all public calendars"""
+
+        path = reverse("teamized:team_calendar_ics", args=[self.calendar_ics_uid])
+        if request is None:
+            return path
+        return request.build_absolute_uri(path)
+
     def user_is_member(self, user: User) -> bool:
         """
         Check if a user is a member of the team.
@@ -536,6 +754,8 @@ class WorkSession(models.Model):
 
     unit_count = models.FloatField(default=None, blank=True, null=True)
 
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=TranslationConstants.MODIFIED_AT)
+
     @property
     @admin.display()
     def duration(self) -> float:
@@ -551,6 +771,18 @@ class WorkSession(models.Model):
         verbose_name = _("Sitzung")
         verbose_name_plural = _("Sitzungen")
         db_table = "teamized_worksession"
+        indexes = [
+            # Used for listing (and keyset paginating) the sessions of a member
+            # The uid is the tie breaker of the pagination, so the index covers the whole ordering
+            models.Index(
+                fields=["member", "is_ended", "time_start", "uid"],
+                name="teamized_ws_member_start_idx",
+            ),
+            # Used for syncing the changed sessions of a member (see endpoint_changes)
+            # Recent changes are few, so the member isn't part of the index (the member alone is
+            # covered by the index above)
+            models.Index(fields=["updated_at"], name="teamized_ws_updated_idx"),
+        ]
 
     def as_dict(self) -> dict:
         return {
@@ -622,7 +854,11 @@ class WorkSession(models.Model):
         self.save()
 
 
-class Calendar(models.Model):
+# Stands in for the ics uid in Calendar.get_ics_url_template
+ICS_UID_PLACEHOLDER = uuid.UUID(int=0)
+
+
+class Calendar(IcsFeedMixin, models.Model):
     """
     Calendar model
     """
@@ -662,69 +898,87 @@ class Calendar(models.Model):
         default=True,
     )
 
+    # Changes when the calendar itself changes or when an event is removed from it
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=TranslationConstants.MODIFIED_AT)
+
     objects = models.Manager()
 
+    # Annotation added by get_public_for_ics
+    events_updated_at: datetime | None
+
     class Meta:
         verbose_name = _("Kalender")
         verbose_name_plural = _("Kalender")
         db_table = "teamized_calendar"
+        indexes = [
+            # Used for syncing the changed calendars of a team (see endpoint_changes)
+            models.Index(fields=["team", "updated_at"], name="teamized_cal_team_upd_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name} ({self.uid})"
 
-    def as_dict(self, request=None) -> dict:
-        return {
+    def as_dict(self, request=None, include_events: bool = True, window=None) -> dict:
+        data = {
             "id": str(self.uid),
             "name": self.name,
             "description": self.description,
             "color": self.color,
             "is_public": bool(self.is_public),
             "ics_url": self.get_ics_url(request),
-            "events": utils.iddict([e.as_dict() for e in self.events.all()]),
         }
+        if include_events:
+            data["events"] = utils.iddict([e.as_dict(window) for e in self.events.all()])
+        return data
 
-    def as_ics_text(self, request=None) -> str:
-        """Get the calendar in ics format
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        # Mark the team as changed (ics feed of all calendars)
+        Team.objects.filter(pk=self.team_id).update(updated_at=timezone.now())
+        return result
 
-        Read more: https://icalendar.org/
+    def iter_ics_chunks(self, request=None, chunk_size: int = options.ICS_STREAMING_CHUNK_SIZE):
+        """Get the calendar in ics format, one chunk per event
+
+        The events are fetched from the database in chunks, so the memory usage doesn't
+        depend on the number of events.
         """
 
-        morelines = []
+        lines = self._get_ics_header_lines(self.uid, self.name, self.description, self.color)
         if request is not None:
-            morelines.append("URL:" + self.get_online_url(request))
-            morelines.append("SOURCE;VALUE=URI:" + self.get_ics_url(request))
+            lines.append("URL:" + self.get_online_url(request))
+            lines.append("SOURCE;VALUE=URI:" + self.get_ics_url(request))
+        lines += self._get_ics_timezone_lines()
+        yield "\r\n".join(lines)
 
-        eventlines = []
-        for event in self.events.all():
-            eventlines += event.as_ics_lines()
+        dtstamp = utils.datetime.now()
+        for event in self.events.all().iterator(chunk_size=chunk_size):
+            yield "\r\n" + "\r\n".join(event.as_ics_lines(dtstamp))
 
-        # Some attributes are duplicated because they are required for some clients
-        calendarlines = [
-            "BEGIN:VCALENDAR",
-            "VERSION:2.0",
-            "PRODID:-//Rafael Urben//Teamized Calendar//DE",
-            "CALSCALE:GREGORIAN",
-            "METHOD:PUBLISH",
-            "UID:" + str(self.uid),
-            "NAME:" + utils.ical_text(self.name),
-            "X-WR-CALNAME:" + utils.ical_text(self.name),
-            "DESCRIPTION:" + utils.ical_text(self.description),
-            "X-WR-CALDESC:" + utils.ical_text(self.description),
-            "COLOR:" + utils.ical_text(self.color),
-            "X-APPLE-CALENDAR-COLOR:" + utils.ical_text(self.color),
-            "X-WR-TIMEZONE:Europe/Zurich",
-            *morelines,
-            *eventlines,
-            "END:VCALENDAR",
-        ]
-        return "\r\n".join(calendarlines)
+        yield "\r\nEND:VCALENDAR"
 
-    def as_ics_response(self, request=None) -> HttpResponse:
-        """Get the calendar as an ics file response"""
+    @classmethod
+    def get_public_for_ics(cls, ics_uid: uuid.UUID) -> "Calendar":
+        """Get a public calendar by its ics uid, annotated with the
+        information needed for get_ics_version (in a single query)"""
 
-        response = HttpResponse(self.as_ics_text(request), content_type="text/calendar")
-        response["Content-Disposition"] = "attachment; filename=calendar.ics"
-        return response
+        return cls.objects.annotate(
+            events_updated_at=models.Max("events__updated_at"),
+            events_count=models.Count("events"),
+        ).get(ics_uid=ics_uid, is_public=True)
+
+    def get_ics_version_parts(self) -> list:
+        return [
+            self.uid,
+            self.updated_at.isoformat(),
+            self.events_updated_at and self.events_updated_at.isoformat(),
+            self.events_count,
+        ]
+
+    def get_ics_last_modified(self) -> datetime:
+        if self.events_updated_at is None:
+            return self.updated_at
+        return max(self.updated_at, self.events_updated_at)
 
     def get_online_url(self, request):
         """Get the url to the calendar page in the app"""
@@ -735,10 +989,25 @@ class Calendar(models.Model):
     def get_ics_url(self, request=None):
         """Get the url to the ics file"""
 
-        path = reverse("teamized:calendar_ics", args=[self.ics_uid])
+        return self.get_ics_url_template(request).replace(
+            str(ICS_UID_PLACEHOLDER), str(self.ics_uid)
+        )
+
+    @staticmethod
+    def get_ics_url_template(request=None) -> str:
+        """Get the url to the ics files with ICS_UID_PLACEHOLDER in place of the ics uid
+
+        The url is only reversed once per request (it is stored on the request).
+        """
+
+        if request is not None and hasattr(request, "teamized_ics_url_template"):
+            return request.teamized_ics_url_template
+
+        path = reverse("teamized:calendar_ics", args=[ICS_UID_PLACEHOLDER])
         if request is None:
             return path
-        return request.build_absolute_uri(path)
+        request.teamized_ics_url_template = request.build_absolute_uri(path)
+        return request.teamized_ics_url_template
 
     @classmethod
     @decorators.validation_func()
@@ -801,18 +1070,48 @@ class CalendarEvent(models.Model):
 
     location = models.CharField(max_length=250, blank=True, default="")
 
+    # recurrence (stored like an iCalendar RRULE, occurrences are expanded on demand)
+
+    recurrence = models.CharField(
+        max_length=10,
+        choices=enums.RecurrenceFrequencies.choices,
+        default=enums.RecurrenceFrequencies.NONE,
+        blank=True,
+    )
+    recurrence_interval = models.PositiveIntegerField(default=1)
+    recurrence_until = models.DateField(null=True, blank=True, default=None)
+    recurrence_count = models.PositiveIntegerField(null=True, blank=True, default=None)
+    # Local start dates (ISO format) of the occurrences that don't take place
+    recurrence_exceptions = models.JSONField(default=list, blank=True)
+    # Local end date of the last occurrence (None if the event recurs forever), see clean
+    recurrence_end = models.DateField(null=True, blank=True, default=None, editable=False)
+
     objects = models.Manager()
 
     class Meta:
         verbose_name = _("Ereignis")
         verbose_name_plural = _("Ereignisse")
         db_table = "teamized_calendarevent"
+        indexes = [
+            # Used for loading the events of a calendar in a time range (see q_overlapping)
+            models.Index(fields=["calendar", "dtstart"], name="teamized_event_cal_dtstart_idx"),
+            models.Index(fields=["calendar", "dstart"], name="teamized_event_cal_dstart_idx"),
+            models.Index(fields=["calendar", "recurrence"], name="teamized_event_cal_recur_idx"),
+            # Used for syncing the changed events of a team (see endpoint_changes)
+            models.Index(fields=["calendar", "updated_at"], name="teamized_event_cal_upd_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name} ({self.uid})"
 
-    def as_dict(self) -> dict:
-        return {
+    def as_dict(self, window: tuple[datetime | None, datetime | None] | None = None) -> dict:
+        """Get the event as a dict
+
+        If a time range (window) is given, the occurrences of recurring events in this
+        range are included.
+        """
+
+        data = {
             "id": str(self.uid),
             "name": self.name,
             "description": self.description,
@@ -822,31 +1121,284 @@ class CalendarEvent(models.Model):
             "dend": None if self.dend is None else self.dend.isoformat(),
             "fullday": bool(self.fullday),
             "location": self.location,
+            "recurrence": None,
         }
+        if self.is_recurring:
+            data["recurrence"] = {
+                "frequency": self.recurrence,
+                "interval": self.recurrence_interval,
+                "until": (
+                    None if self.recurrence_until is None else self.recurrence_until.isoformat()
+                ),
+                "count": self.recurrence_count,
+                "exceptions": self.recurrence_exceptions,
+            }
+            if window is not None:
+                data["occurrences"] = [
+                    {"start": start.isoformat(), "end": end.isoformat()}
+                    for start, end in self.get_occurrences(*window)
+                ]
+        return data
+
+    @property
+    def is_recurring(self) -> bool:
+        return self.recurrence != enums.RecurrenceFrequencies.NONE
+
+    def _get_local_start(self) -> datetime | date:
+        if self.fullday:
+            return self.dstart
+        return timezone.localtime(self.dtstart, timezone.get_default_timezone())
+
+    def _get_span_days(self) -> int:
+        """Number of days between the (local) start and end date of an occurrence"""
+
+        if self.fullday:
+            return (self.dend - self.dstart).days
+        tz = timezone.get_default_timezone()
+        return (
+            timezone.localtime(self.dtend, tz).date() - timezone.localtime(self.dtstart, tz).date()
+        ).days
+
+    def _get_last_possible_date(self) -> date:
+        """The last day an occurrence can start on (its end has to be representable)"""
+
+        return date.max - utils.timedelta(days=self._get_span_days() + 1)
+
+    def iter_occurrence_dates(self, skip_before: date | None = None) -> typing.Iterator[date]:
+        """Iterate over the local start dates of all occurrences
+
+        Like in an iCalendar RRULE, exceptions are included (and count towards the count) and
+        monthly events skip months without their day. Without until and count, the iteration
+        only ends at the last possible date (see _get_last_possible_date).
+        With skip_before, the iteration starts at the last occurrence before this day instead
+        of the first one (unless there's a count, which requires counting all occurrences).
+        """
+
+        start = self._get_local_start()
+        if isinstance(start, datetime):
+            start = start.date()
+        if not self.is_recurring:
+            yield start
+            return
+
+        first_index = 0
+        if skip_before is not None and self.recurrence_count is None:
+            first_index = self._get_step_index(start, skip_before)
+
+        last_day = self._get_last_possible_date()
+        # Days per step for daily and weekly events
+        days = 7 if self.recurrence == enums.RecurrenceFrequencies.WEEKLY else 1
+        generated = 0
+        for i in itertools.count(first_index):
+            step = i * self.recurrence_interval
+            if self.recurrence != enums.RecurrenceFrequencies.MONTHLY:
+                step *= days
+                if step > (last_day - start).days:
+                    return
+                day = start + utils.timedelta(days=step)
+            else:
+                year, month = divmod(start.month - 1 + step, 12)
+                year += start.year
+                if year > last_day.year:
+                    return
+                if start.day > monthrange(year, month + 1)[1]:
+                    continue
+                day = date(year, month + 1, start.day)
+
+            if day > last_day:
+                return
+            if self.recurrence_until is not None and day > self.recurrence_until:
+                return
+            if self.recurrence_count is not None and generated >= self.recurrence_count:
+                return
+            generated += 1
+            yield day
+
+    def _get_step_index(self, start: date, day: date) -> int:
+        """Get the index of a recurrence step such that all earlier steps start before a day"""
+
+        if self.recurrence == enums.RecurrenceFrequencies.DAILY:
+            elapsed = (day - start).days
+        elif self.recurrence == enums.RecurrenceFrequencies.WEEKLY:
+            elapsed = (day - start).days // 7
+        else:
+            elapsed = (day.year - start.year) * 12 + day.month - start.month
+        return max(0, elapsed // self.recurrence_interval)
+
+    def get_occurrences(
+        self, time_from: datetime | None = None, time_to: datetime | None = None
+    ) -> list[tuple]:
+        """Get the (start, end) of the occurrences overlapping the time range [time_from, time_to)
+
+        Starts and ends are datetimes for timed events and (inclusive) dates for full-day events.
+        At most options.CALENDAR_MAX_OCCURRENCES occurrences are returned, and only the ones
+        in the first options.CALENDAR_OPEN_RANGE_DAYS days if there's no time_to. Timed events
+        recur at the same local time (also across daylight saving time changes).
+        """
 
-    def as_ics_lines(self) -> list:
+        skipped = set(self.recurrence_exceptions)
+        span = utils.timedelta(days=self._get_span_days())
+        tz = timezone.get_default_timezone()
+        local_start = self._get_local_start()
+        first_day = None if time_from is None else timezone.localtime(time_from, tz).date()
+        if time_to is None:
+            range_start = first_day or (
+                local_start.date() if isinstance(local_start, datetime) else local_start
+            )
+            last_day = range_start + utils.timedelta(
+                days=min(options.CALENDAR_OPEN_RANGE_DAYS, (date.max - range_start).days)
+            )
+        else:
+            last_day = timezone.localtime(time_to - utils.timedelta(microseconds=1), tz).date()
+
+        # Occurrences that end before the range don't have to be generated. This keeps the
+        # cost independent of the age of the series (one extra day covers the time of day).
+        skip_before = None if first_day is None else first_day - span - utils.timedelta(days=1)
+
+        occurrences = []
+        for day in self.iter_occurrence_dates(skip_before):
+            if day > last_day:
+                break
+            if len(occurrences) >= options.CALENDAR_MAX_OCCURRENCES:
+                break
+            if day.isoformat() in skipped:
+                continue
+
+            if self.fullday:
+                start, end = day, day + span
+                if first_day is not None and end < first_day:
+                    continue
+            else:
+                start = timezone.make_aware(datetime.combine(day, local_start.time()), tz)
+                end = start + (self.dtend - self.dtstart)
+                if time_to is not None and start >= time_to:
+                    break
+                if time_from is not None and end <= time_from:
+                    continue
+            occurrences.append((start, end))
+        return occurrences
+
+    def _get_recurrence_ics_lines(self) -> list:
+        """Get the RRULE and EXDATE lines of a recurring event"""
+
+        rule = f"RRULE:FREQ={self.recurrence.upper()};INTERVAL={self.recurrence_interval}"
+        if self.recurrence_count is not None:
+            rule += f";COUNT={self.recurrence_count}"
+        if self.recurrence_until is not None:
+            if self.fullday:
+                rule += ";UNTIL=" + utils.ical_date(self.recurrence_until)
+            else:
+                # The until of an event with a TZID has to be in UTC
+                last_day = min(self.recurrence_until, self._get_last_possible_date())
+                last_start = timezone.make_aware(
+                    datetime.combine(last_day, self._get_local_start().time()),
+                    timezone.get_default_timezone(),
+                )
+                rule += ";UNTIL=" + utils.ical_datetime(last_start.astimezone(UTC))
+        lines = [rule]
+
+        if self.recurrence_exceptions:
+            days = [date.fromisoformat(day) for day in self.recurrence_exceptions]
+            if self.fullday:
+                lines.append("EXDATE;VALUE=DATE:" + ",".join(utils.ical_date(d) for d in days))
+            else:
+                local_time = self._get_local_start().time()
+                lines.append(
+                    f"EXDATE;TZID={timezone.get_default_timezone_name()}:"
+                    + ",".join(
+                        utils.ical_local_datetime(datetime.combine(d, local_time)) for d in days
+                    )
+                )
+        return lines
+
+    @staticmethod
+    def q_overlapping(time_from: datetime | None, time_to: datetime | None) -> models.Q:
+        """Get a filter for the events overlapping the time range [time_from, time_to)
+
+        Timed events are compared by their start and end time, full-day events by their
+        start and end date (in the default timezone). Either bound may be None.
+        """
+
+        # Timed events have no dates and full-day events have no times (see clean),
+        # so every condition only matches the events of one kind.
+        q_timed = models.Q()
+        q_fullday = models.Q()
+        # Recurring events are matched by their first start and their recurrence_end.
+        # Some of them might not have an occurrence in the range (see get_occurrences).
+        q_recurring = models.Q(recurrence__gt=enums.RecurrenceFrequencies.NONE)
+        tz = timezone.get_default_timezone()
+        if time_from is not None:
+            first_day = timezone.localtime(time_from, tz).date()
+            q_timed &= models.Q(dtend__gt=time_from)
+            q_fullday &= models.Q(dend__gte=first_day)
+            q_recurring &= models.Q(recurrence_end__isnull=True) | models.Q(
+                recurrence_end__gte=first_day
+            )
+        if time_to is not None:
+            # The end is exclusive: A range ending at midnight doesn't include that day
+            last_day = timezone.localtime(time_to - utils.timedelta(microseconds=1), tz).date()
+            q_timed &= models.Q(dtstart__lt=time_to)
+            q_fullday &= models.Q(dstart__lte=last_day)
+            q_recurring &= models.Q(dtstart__lt=time_to) | models.Q(dstart__lte=last_day)
+        if not q_timed:
+            return models.Q()
+        return q_timed | q_fullday | q_recurring
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        # Deleted events don't leave a trace, so mark the calendar as changed (ics feed)
+        Calendar.objects.filter(pk=self.calendar_id).update(updated_at=timezone.now())
+        return result
+
+    def as_ics_lines(self, dtstamp: datetime | None = None, with_calendar: bool = False) -> list:
         """Get the event in ics format
 
+        With with_calendar, the event is tagged with the name and color of its calendar
+        (for feeds with the events of several calendars).
         Read more: https://icalendar.org/
         """
 
+        if dtstamp is None:
+            dtstamp = utils.datetime.now()
+
+        recurrencelines = []
         if self.fullday:
             start = "DTSTART;VALUE=DATE:" + utils.ical_date(self.dstart)
             # According to the iCalendar standard, the end date is exclusive for all-day events
             end = "DTEND;VALUE=DATE:" + utils.ical_date(self.dend + utils.timedelta(days=1))
+        elif self.is_recurring:
+            # Recurring events are in local time, so they don't move when daylight saving changes
+            tz = timezone.get_default_timezone()
+            tzid = timezone.get_default_timezone_name()
+            start = f"DTSTART;TZID={tzid}:" + utils.ical_local_datetime(
+                timezone.localtime(self.dtstart, tz)
+            )
+            end = f"DTEND;TZID={tzid}:" + utils.ical_local_datetime(
+                timezone.localtime(self.dtend, tz)
+            )
         else:
             start = "DTSTART:" + utils.ical_datetime(self.dtstart)
             end = "DTEND:" + utils.ical_datetime(self.dtend)
+        if self.is_recurring:
+            recurrencelines = self._get_recurrence_ics_lines()
+        calendarlines = []
+        if with_calendar:
+            calendarlines = [
+                "CATEGORIES:" + utils.ical_text(self.calendar.name),
+                "COLOR:" + utils.ical_text(self.calendar.color),
+            ]
 
         return [
             "BEGIN:VEVENT",
             "UID:" + str(self.uid),
-            "DTSTAMP:" + utils.ical_datetime(utils.datetime.now()),
+            "DTSTAMP:" + utils.ical_datetime(dtstamp),
             "SUMMARY:" + utils.ical_text(self.name),
             "DESCRIPTION:" + utils.ical_text(self.description),
             "LOCATION:" + utils.ical_text(self.location),
             start,
             end,
+            *recurrencelines,
+            *calendarlines,
             "UPDATED:" + utils.ical_datetime(self.updated_at),
             "END:VEVENT",
         ]
@@ -877,11 +1429,67 @@ class CalendarEvent(models.Model):
             self.dstart = None
             self.dend = None
 
+        self._clean_recurrence()
+
+    def _clean_recurrence(self) -> None:
+        """Verify the recurrence and update recurrence_end"""
+
+        if not self.is_recurring:
+            self.recurrence_interval = 1
+            self.recurrence_until = None
+            self.recurrence_count = None
+            self.recurrence_exceptions = []
+            self.recurrence_end = None
+            return
+
+        if self.recurrence_until is not None and self.recurrence_count is not None:
+            raise exceptions.ValidationError(
+                _("Eine Wiederholung kann entweder ein Enddatum oder eine Anzahl haben.")
+            )
+        if not 1 <= self.recurrence_interval <= options.CALENDAR_MAX_RECURRENCE_INTERVAL:
+            raise exceptions.ValidationError(
+                _("Das Intervall der Wiederholung muss zwischen 1 und {} liegen.").format(
+                    options.CALENDAR_MAX_RECURRENCE_INTERVAL
+                )
+            )
+
+        first_day = self._get_local_start()
+        if isinstance(first_day, datetime):
+            first_day = first_day.date()
+        if self.recurrence_until is not None and self.recurrence_until < first_day:
+            raise exceptions.ValidationError(
+                _("Das Ende der Wiederholung darf nicht vor dem Startdatum liegen.")
+            )
+
+        span = utils.timedelta(days=self._get_span_days())
+        if self.recurrence_until is not None:
+            last_day = min(self.recurrence_until, self._get_last_possible_date())
+            self.recurrence_end = last_day + span
+        elif self.recurrence_count is not None:
+            days = list(self.iter_occurrence_dates())
+            if len(days) < self.recurrence_count:
+                # The iteration stops at the last possible date
+                raise exceptions.ValidationError(
+                    _("Die letzte Wiederholung liegt zu weit in der Zukunft.")
+                )
+            self.recurrence_end = days[-1] + span
+        else:
+            self.recurrence_end = None
+
     @classmethod
     @decorators.validation_func()
     def from_post_data(cls, data: dict, calendar: Calendar) -> "CalendarEvent":
         """Create a new CalendarEvent from POST data"""
 
+        event = cls.build_from_post_data(data, calendar)
+        event.save()
+        return event
+
+    @classmethod
+    @decorators.validation_func()
+    def build_from_post_data(cls, data: dict, calendar: Calendar) -> "CalendarEvent":
+        """Create a new (validated but unsaved) CalendarEvent from POST data"""
+
         fullday = validation.boolean(data, "fullday", False, default=True)
         name = validation.text(data, "name", True, max_length=50)
         description = validation.text(data, "description", False)
@@ -908,10 +1516,102 @@ class CalendarEvent(models.Model):
                 dtend=validation.datetime(data, "dtend", True),
             )
 
+        event.update_recurrence_from_post_data(data)
         event.clean()
-        event.save()
         return event
 
+    @classmethod
+    def import_ics(cls, calendar: Calendar, lines: typing.Iterable[str]) -> tuple[int, list]:
+        """Import the events of an ics file into a calendar
+
+        The file is parsed line by line, every event is validated like in from_post_data and
+        the valid events are inserted in batches (in a single transaction).
+        Returns the number of created events and the errors of the invalid events.
+        """
+
+        created = 0
+        errors = []
+        batch = []
+        with transaction.atomic():
+            for index, properties in enumerate(ics.iter_events(lines)):
+                if index >= options.ICS_IMPORT_MAX_EVENTS:
+                    raise exceptions.ValidationError(
+                        _("Es können höchstens {} Ereignisse importiert werden.").format(
+                            options.ICS_IMPORT_MAX_EVENTS
+                        ),
+                        errorname="too_many_events",
+                    )
+
+                try:
+                    batch.append(cls.build_from_post_data(ics.get_event_data(properties), calendar))
+                except (exceptions.AlertException, ValueError) as exc:
+                    uid = next((p.value for p in properties if p.name == "UID"), None)
+                    text = exc.get_text() if isinstance(exc, exceptions.AlertException) else None
+                    errors.append(
+                        {
+                            "index": index,
+                            "uid": uid,
+                            "error": text or _("Das Ereignis konnte nicht gelesen werden."),
+                        }
+                    )
+
+                if len(batch) >= options.ICS_IMPORT_BATCH_SIZE:
+                    cls.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+            cls.objects.bulk_create(batch)
+            created += len(batch)
+        return created, errors
+
+    def update_recurrence_from_post_data(self, data: dict):
+        """Update the recurrence from POST data (without saving)"""
+
+        self.recurrence = (
+            validation.choice(
+                data,
+                "recurrence",
+                enums.RecurrenceFrequencies.values,
+                False,
+                default=self.recurrence,
+                null=True,
+            )
+            or enums.RecurrenceFrequencies.NONE
+        )
+        self.recurrence_interval = validation.integer(
+            data,
+            "recurrence_interval",
+            False,
+            default=self.recurrence_interval,
+            min_value=1,
+            max_value=options.CALENDAR_MAX_RECURRENCE_INTERVAL,
+        )
+        self.recurrence_until = validation.date(
+            data, "recurrence_until", False, default=self.recurrence_until, null=True
+        )
+        self.recurrence_count = validation.integer(
+            data,
+            "recurrence_count",
+            False,
+            default=self.recurrence_count,
+            null=True,
+            min_value=1,
+            max_value=options.CALENDAR_MAX_RECURRENCE_COUNT,
+        )
+        # Comma separated dates
+        exception_dates = validation.text(
+            data, "recurrence_exceptions", False, default=None, null=True
+        )
+        if exception_dates is not None:
+            self.recurrence_exceptions = sorted(
+                {
+                    validation.date({"date": value.strip()}, "date").isoformat()
+                    for value in exception_dates.split(",")
+                    if value.strip()
+                }
+            )
+        elif "recurrence_exceptions" in data:
+            self.recurrence_exceptions = []
+
     @decorators.validation_func()
     def update_from_post_data(self, data: dict):
         self.fullday = validation.boolean(data, "fullday", False, default=self.fullday)
@@ -926,6 +1626,7 @@ class CalendarEvent(models.Model):
             self.dtstart = validation.datetime(data, "dtstart", True, default=self.dtstart)
             self.dtend = validation.datetime(data, "dtend", True, default=self.dtend)
 
+        self.update_recurrence_from_post_data(data)
         self.clean()
         self.save()
 
@@ -962,22 +1663,62 @@ class ToDoList(models.Model):
 
     objects = models.Manager()
 
+    # Annotations added by with_item_counts
+    open_count: int
+    done_count: int
+
     class Meta:
         verbose_name = _("To-do-Liste")
         verbose_name_plural = _("To-do-Listen")
         db_table = "teamized_todolist"
+        indexes = [
+            # Used for syncing the changed to-do lists of a team (see endpoint_changes)
+            models.Index(fields=["team", "updated_at"], name="teamized_todo_team_upd_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name} ({self.uid})"
 
-    def as_dict(self) -> dict:
-        return {
+    def as_dict(self, include_items: bool = True) -> dict:
+        data = {
             "id": str(self.uid),
             "name": self.name,
             "description": self.description,
             "color": self.color,
-            "items": utils.iddict([i.as_dict() for i in self.items.all().order_by("done", "name")]),
         }
+        if hasattr(self, "open_count"):
+            data["open_count"] = self.open_count
+            data["done_count"] = self.done_count
+        if include_items:
+            # Ordered by ToDoListItem.Meta.ordering, so prefetched items can be used
+            data["items"] = utils.iddict([i.as_dict() for i in self.items.all()])
+        return data
+
+    def get_last_item_rank(self) -> str:
+        """Get the highest rank of the items ("" if there are no items)"""
+
+        return self.items.aggregate(rank=models.Max("rank"))["rank"] or ""
+
+    def rebalance_item_ranks(self):
+        """Distribute the ranks of all items evenly (keeping their order)
+
+        Ranks get longer when items are repeatedly inserted at the same position. This
+        shortens them again, so it's only needed once they get too long.
+        """
+
+        items = list(self.items.only("uid", "rank").order_by("done", "rank", "name"))
+        for item, rank in zip(items, utils.ranks_between(count=len(items))):
+            item.rank = rank
+        ToDoListItem.objects.bulk_update(items, ["rank"], batch_size=1000)
+
+    @staticmethod
+    def with_item_counts(queryset: models.QuerySet) -> models.QuerySet:
+        """Annotate the number of open and done items (in the same query as the lists)"""
+
+        return queryset.annotate(
+            open_count=models.Count("items", filter=models.Q(items__done=False)),
+            done_count=models.Count("items", filter=models.Q(items__done=True)),
+        )
 
     @classmethod
     @decorators.validation_func()
@@ -1031,12 +1772,27 @@ class ToDoListItem(models.Model):
     done_by = models.ForeignKey("User", on_delete=models.SET_NULL, null=True, related_name="+")
     done_at = models.DateTimeField(null=True)
 
+    # Manual order within the list (see utils.rank_between)
+    # Moving an item only changes its own rank, the other items keep theirs.
+    rank = models.CharField(max_length=64, blank=True, default="", editable=False)
+
     objects = models.Manager()
 
     class Meta:
         verbose_name = _("To-do-Listeneintrag")
         verbose_name_plural = _("To-do-Listeneinträge")
         db_table = "teamized_todolistitem"
+        ordering = ["done", "rank", "name"]
+        indexes = [
+            # Used for listing the items of a list in their manual order
+            models.Index(fields=["todolist", "done", "rank"], name="teamized_todo_rank_idx"),
+            # Used for listing the open items and (keyset paginating) the done items of a list
+            models.Index(
+                fields=["todolist", "done", "done_at", "uid"], name="teamized_todo_done_idx"
+            ),
+            # Used for syncing the changed items of a team (see endpoint_changes)
+            models.Index(fields=["todolist", "updated_at"], name="teamized_todo_item_upd_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name} ({self.uid})"
@@ -1047,7 +1803,8 @@ class ToDoListItem(models.Model):
             "name": self.name,
             "description": self.description,
             "done": self.done,
-            "done_by_id": str(self.done_by.uid) if self.done_by else None,
+            "rank": self.rank,
+            "done_by_id": str(self.done_by_id) if self.done_by_id else None,
             "done_at": self.done_at.isoformat() if self.done_at else None,
         }
 
@@ -1056,12 +1813,19 @@ class ToDoListItem(models.Model):
     def from_post_data(cls, data: dict, user: User, todolist: ToDoList) -> "ToDoListItem":
         """Create a new ToDoListItem from POST data"""
 
-        return cls.objects.create(
+        item = cls(
             todolist=todolist,
             created_by=user,
             name=validation.text(data, "name", True, max_length=50),
             description=validation.text(data, "description", False),
         )
+        # New items are added at the end of the list
+        item.rank = utils.rank_between(todolist.get_last_item_rank())
+        if len(item.rank) > options.TODO_RANK_MAX_LENGTH:
+            todolist.rebalance_item_ranks()
+            item.rank = utils.rank_between(todolist.get_last_item_rank())
+        item.save()
+        return item
 
     @decorators.validation_func()
     def update_from_post_data(self, data: dict, user: User):
@@ -1070,7 +1834,7 @@ class ToDoListItem(models.Model):
         self.name = validation.text(data, "name", False, default=self.name, max_length=50)
         self.description = validation.text(data, "description", False, default=self.description)
 
-        done = validation.boolean(data, "done", False, null=True)
+        done = validation.boolean(data, "done", False, default=None, null=True)
         if done is True and self.done is False:  # Mark as done
             self.done = True
             self.done_by = user
@@ -1080,4 +1844,145 @@ class ToDoListItem(models.Model):
             self.done_by = None
             self.done_at = None
 
+        # Move the item after another item ("" moves it to the top)
+        if "move_after" in data:
+            previous_id = validation.text(data, "move_after", False, default="")
+            self.rank = self.get_rank_after(previous_id or None)
+
         self.save()
+
+    def get_rank_after(self, previous_id=None) -> str:
+        """Get a rank that places this item directly after another item of the list
+        (at the top without one). Only this item's rank changes, unless the ranks of the list
+        have to be rebalanced because they got too long.
+        """
+
+        following = self.todolist.items.filter(done=self.done).exclude(pk=self.pk)
+        previous_rank = ""
+        if previous_id is not None:
+            previous_rank = (
+                self.todolist.items.filter(uid=previous_id).values_list("rank", flat=True).first()
+            )
+            if previous_rank is None:
+                raise exceptions.ValidationError(
+                    _("Der Listeneintrag '{}' wurde nicht gefunden.").format(previous_id),
+                    errorname="item_not_found",
+                )
+            following = following.filter(rank__gt=previous_rank)
+        following_rank = following.order_by("rank").values_list("rank", flat=True).first()
+
+        # Items created without a rank (e.g. with bulk_create) have to be ranked first
+        if following_rank == "" or (previous_id is not None and previous_rank == ""):
+            self.todolist.rebalance_item_ranks()
+            return self.get_rank_after(previous_id)
+
+        rank = utils.rank_between(previous_rank, following_rank or "")
+        if len(rank) > options.TODO_RANK_MAX_LENGTH:
+            self.todolist.rebalance_item_ranks()
+            return self.get_rank_after(previous_id)
+        return rank
+
+    @classmethod
+    @decorators.validation_func()
+    def bulk_update_from_post_data(cls, data, user: User, todolist: ToDoList) -> list[str]:
+        """Apply an action to many ToDoListItems of a list at once
+
+        The items ('item_ids[]') are changed with a single query and in a single transaction.
+        Marking items as done or undone works like in update_from_post_data (items that are
+        already done keep their done_by and done_at).
+        Returns the ids of the changed items.
+        """
+
+        action = validation.choice(data, "action", enums.ToDoBulkActions.values)
+        item_ids = data.getlist("item_ids[]")
+        target_id = validation.text(data, "target_todolist_id", False, default="")
+        for uid in [*item_ids, target_id] if target_id else item_ids:
+            if not utils.is_valid_uuid(uid):
+                raise exceptions.ValidationError(
+                    _("'{}' ist keine gültige UUID.").format(uid), errorname="not-an-uuid"
+                )
+        items = todolist.items.filter(uid__in=item_ids)
+        now = timezone.now()
+
+        with transaction.atomic():
+            if action == enums.ToDoBulkActions.DONE:
+                items = items.filter(done=False)
+            elif action == enums.ToDoBulkActions.UNDONE:
+                items = items.filter(done=True)
+            elif action == enums.ToDoBulkActions.MOVE:
+                target = todolist.team.todolists.filter(
+                    uid=validation.text(data, "target_todolist_id", True)
+                ).first()
+                if target is None:
+                    raise exceptions.ValidationError(
+                        _("Die Ziel-To-do-Liste wurde nicht gefunden."),
+                        errorname="todolist_not_found",
+                    )
+
+            # Lock the rows, so that the returned ids match the changed items
+            item_ids = [str(uid) for uid in items.select_for_update().values_list("uid", flat=True)]
+            items = cls.objects.filter(uid__in=item_ids)
+
+            # update() doesn't set auto_now fields, so updated_at is set explicitly
+            if action == enums.ToDoBulkActions.DONE:
+                items.update(done=True, done_by=user, done_at=now, updated_at=now)
+            elif action == enums.ToDoBulkActions.UNDONE:
+                items.update(done=False, done_by=None, done_at=None, updated_at=now)
+            elif action == enums.ToDoBulkActions.MOVE:
+                # The items are added at the end of the target list (in their current order)
+                moved = list(items)
+                ranks = utils.ranks_between(target.get_last_item_rank(), "", len(moved))
+                for item, rank in zip(moved, ranks):
+                    item.todolist, item.rank, item.updated_at = target, rank, now
+                cls.objects.bulk_update(moved, ["todolist", "rank", "updated_at"], batch_size=1000)
+            else:
+                items.delete()
+        return item_ids
+
+
+class Tombstone(models.Model):
+    """A deleted object, so that clients can remove it when syncing (see endpoint_changes)
+
+    Instead of the team, the tombstone references the parent of the deleted object (e.g. the
+    calendar of an event), which is known without loading anything. Tombstones are only
+    recorded for objects that are deleted directly: The children of a deleted object are
+    removed together with it.
+    """
+
+    uid = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        verbose_name=TranslationConstants.UID,
+    )
+
+    container_id = models.UUIDField()
+    category = models.CharField(max_length=30, choices=enums.SyncCategories.choices)
+    object_id = models.UUIDField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    objects = models.Manager()
+
+    class Meta:
+        verbose_name = _("Löscheintrag")
+        verbose_name_plural = _("Löscheinträge")
+        db_table = "teamized_tombstone"
+        indexes = [
+            # Used for syncing the deleted objects of a team
+            models.Index(fields=["container_id", "deleted_at"], name="teamized_tombstone_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.category} {self.object_id}"
+
+    @classmethod
+    def get_expiry_date(cls) -> datetime:
+        """Tombstones older than this are deleted, so older sync cursors can't be used"""
+
+        return timezone.now() - utils.timedelta(days=options.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+    @classmethod
+    def purge_expired(cls) -> int:
+        """Delete the expired tombstones and return their number"""
+
+        return cls.objects.filter(deleted_at__lt=cls.get_expiry_date()).delete()[0]
@@ -7,3 +7,61 @@ MAX_OWNED_TEAMS = 3
 
 # Invite settings
 DEFAULT_INVITE_USES = 10
+
+# Whether a user owns a team is cached for this amount of seconds
+# The cache is invalidated whenever an owner membership changes, but only in the cache of the
+# process that made the change. With a per-process cache (e.g. the default LocMemCache), other
+# processes notice the change after this time at the latest, so it is kept short. Use a
+# shared cache backend (e.g. Redis or Memcached) in production.
+OWNS_TEAM_CACHE_TTL = 60
+
+# Maximum number of objects per page for paginated API endpoints
+API_MAX_PAGE_SIZE = 500
+# Number of work sessions included in the bootstrap response
+BOOTSTRAP_WORKSESSIONS_PAGE_SIZE = 50
+# Maximum number of sub-requests of a batch request
+API_BATCH_MAX_REQUESTS = 50
+
+# API key settings
+# Resolved API keys are cached per process for this amount of seconds
+APIKEY_CACHE_TTL = 60
+# The "last used" timestamps of API keys are written to the database at most this often (seconds)
+APIKEY_LAST_USED_FLUSH_INTERVAL = 60
+
+# Rendered ics files of public calendars are cached for this amount of seconds
+# (the cache key changes whenever the calendar or one of its events changes)
+ICS_CACHE_TTL = 60 * 60 * 24
+# Calendars with more events than this are streamed instead of cached (constant memory usage)
+ICS_STREAMING_MIN_EVENTS = 1000
+# Events are fetched from the database in chunks of this size while streaming
+ICS_STREAMING_CHUNK_SIZE = 500
+
+# Recurring calendar events
+# Maximum number of occurrences of an event with a fixed count
+CALENDAR_MAX_RECURRENCE_COUNT = 1000
+# Maximum interval (in days, weeks or months) between the occurrences of an event
+CALENDAR_MAX_RECURRENCE_INTERVAL = 1000
+# Maximum number of occurrences per event that are expanded for a single request
+CALENDAR_MAX_OCCURRENCES = 1000
+# Occurrences are expanded for this amount of days if the requested time range has no end
+CALENDAR_OPEN_RANGE_DAYS = 366 * 2
+# Maximum time range (in days) of a free/busy request
+CALENDAR_FREEBUSY_MAX_DAYS = 366
+
+# ics import
+# Maximum number of events per imported file
+ICS_IMPORT_MAX_EVENTS = 50_000
+# Imported events are inserted in batches of this size
+ICS_IMPORT_BATCH_SIZE = 1000
+
+# Manual order of to-do list items
+# The ranks of a list are rebalanced once a rank gets longer than this
+TODO_RANK_MAX_LENGTH = 32
+
+# Incremental sync (see endpoint_changes)
+# Deleted objects are remembered for this amount of days, older cursors have to be discarded
+# (expired tombstones are deleted by the teamized_purge_tombstones management command)
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+# Returned cursors lie this amount of seconds in the past, so that changes committed by
+# concurrent transactions (with an earlier modification time) aren't missed
+SYNC_CURSOR_OVERLAP = 5
@@ -0,0 +1,65 @@
+"""Request-scoped permission checks
+
+A PermissionContext is attached to every request by the teamized_prep decorator
+(request.teamized_permissions). It loads the Member instance of the current user
+for a team at most once per request and answers all role checks from memory.
+"""
+
+import typing
+
+if typing.TYPE_CHECKING:
+    from teamized.models import Member, Team, User
+
+
+class PermissionContext:
+    """Caches the member instances of a user for the duration of a request"""
+
+    def __init__(self, user: "User") -> None:
+        self.user = user
+        self._members: dict = {}
+
+    def get_member(self, team: "Team") -> typing.Union["Member", None]:
+        """
+        Get the member instance of the user in a team (or None if the user is not a member).
+        Only the first call per team queries the database.
+        """
+
+        if team.pk not in self._members:
+            member = team.members.filter(user=self.user).first()
+            if member is not None:
+                # Avoid lazy loading the objects we already have
+                member.team = team
+                member.user = self.user
+            self._members[team.pk] = member
+        return self._members[team.pk]
+
+    def remember(self, team: "Team", member: typing.Union["Member", None]) -> None:
+        """
+        Store an already known member instance (or None) for a team.
+        Use this after the membership of the user has changed during a request.
+        """
+
+        self._members[team.pk] = member
+
+    def is_member(self, team: "Team") -> bool:
+        """
+        Check if the user is a member of the team.
+        """
+
+        return self.get_member(team) is not None
+
+    def is_admin(self, team: "Team") -> bool:
+        """
+        Check if the user is an admin (or owner) of the team.
+        """
+
+        member = self.get_member(team)
+        return member is not None and member.is_admin()
+
+    def is_owner(self, team: "Team") -> bool:
+        """
+        Check if the user is the owner of the team.
+        """
+
+        member = self.get_member(team)
+        return member is not None and member.is_owner()
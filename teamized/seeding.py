@@ -0,0 +1,420 @@
+"""Synthetic data generation
+
+The Seeder generates a deterministic dataset (the same seed always produces the same objects)
+covering every model in teamized.models and teamized.club.models. All objects are inserted
+with bulk_create in batches, so even large datasets load quickly.
+
+It is used by the teamized_seed management command, the query budget tests and the
+benchmarks.
+"""
+
+import random
+import uuid
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from teamized import enums, utils
+from teamized.club import models as club_models
+from teamized.models import (
+    User,
+    Team,
+    Member,
+    Invite,
+    WorkSession,
+    Calendar,
+    CalendarEvent,
+    ToDoList,
+    ToDoListItem,
+)
+
+# Password of all generated users
+SEED_PASSWORD = "teamized-seed"
+
+_COLORS = ["#e6194b", "#3cb44b", "#ffe119", "#4363d8", "#f58231", "#911eb4", "#46f0f0"]
+_FIRST_NAMES = ["Anna", "Ben", "Clara", "David", "Elena", "Felix", "Greta", "Hugo", "Ida", "Jonas"]
+_LAST_NAMES = ["Muster", "Meier", "Keller", "Frei", "Huber", "Weber", "Brunner", "Graf"]
+_WORDS = ["Planung", "Training", "Sitzung", "Review", "Einkauf", "Ausflug", "Turnier", "Probe"]
+
+_Responses = club_models.ClubAttendanceEventParticipation.MemberResponseChoices
+
+
+class Seeder:
+    """
+    Generate a deterministic dataset.
+    All counts are configurable; the defaults produce a small but realistic dataset.
+    """
+
+    DEFAULTS = {
+        "users": 100,
+        "teams": 50,
+        "members_per_team": 10,
+        "invites_per_team": 2,
+        "worksessions": 10_000,
+        "calendars_per_team": 2,
+        "events_per_calendar": 50,
+        "todolists_per_team": 2,
+        "items_per_list": 50,
+        "clubs": 2,
+        "members_per_club": 500,
+        "groups_per_club": 10,
+        "attendance_events_per_club": 50,
+    }
+
+    def __init__(
+        self,
+        seed: int = 0,
+        prefix: str = "seed",
+        batch_size: int = 1000,
+        reference: datetime | None = None,
+        **counts,
+    ):
+        unknown = set(counts) - set(self.DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown counts: {', '.join(sorted(unknown))}")
+
+        self.counts = {**self.DEFAULTS, **counts}
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self.reference = reference or timezone.make_aware(
+            datetime.combine(timezone.localdate(), time())
+        )
+        # The prefix is part of the seed, so that datasets with different prefixes don't collide
+        self.rng = random.Random(f"{prefix}:{seed}")
+
+        # Generated objects (the largest tables are not kept in memory)
+        self.users: list[User] = []
+        self.teams: list[Team] = []
+        self.members: list[Member] = []
+        self.calendars: list[Calendar] = []
+        self.todolists: list[ToDoList] = []
+        self.clubs: list[club_models.Club] = []
+        self.club_members: list[club_models.ClubMember] = []
+        self.groups: list[club_models.ClubMemberGroup] = []
+        self.attendance_events: list[club_models.ClubAttendanceEvent] = []
+
+        # Number of created rows per model label
+        self.created: dict[str, int] = {}
+
+    # Helpers
+
+    def _uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _text(self, words: int = 2) -> str:
+        return " ".join(self.rng.choice(_WORDS) for _ in range(words))
+
+    def _bulk_create(self, model, objects: list) -> list:
+        created = model.objects.bulk_create(objects, batch_size=self.batch_size)
+        label = model._meta.label
+        self.created[label] = self.created.get(label, 0) + len(objects)
+        return created
+
+    def _batched(self, model, generator) -> None:
+        """Insert the objects of a generator in batches (without keeping them in memory)"""
+
+        batch = []
+        for obj in generator:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                self._bulk_create(model, batch)
+                batch = []
+        if batch:
+            self._bulk_create(model, batch)
+
+    # Generation
+
+    def run(self) -> "Seeder":
+        """Generate the whole dataset in a single transaction"""
+
+        with transaction.atomic():
+            self._create_users()
+            self._create_teams()
+            self._create_worksessions()
+            self._create_calendars()
+            self._create_todolists()
+            self._create_clubs()
+            self._create_club_members()
+            self._create_attendance()
+        return self
+
+    def _create_users(self) -> None:
+        password = make_password(SEED_PASSWORD, salt=f"{self.prefix}salt")
+        auth_users = self._bulk_create(
+            get_user_model(),
+            [
+                get_user_model()(
+                    username=f"{self.prefix}-user-{i}",
+                    email=f"{self.prefix}-user-{i}@example.com",
+                    first_name=self.rng.choice(_FIRST_NAMES),
+                    last_name=self.rng.choice(_LAST_NAMES),
+                    password=password,
+                )
+                for i in range(self.counts["users"])
+            ],
+        )
+        self.users = self._bulk_create(
+            User, [User(uid=self._uuid(), auth_user=auth_user) for auth_user in auth_users]
+        )
+
+    def _create_teams(self) -> None:
+        self.teams = self._bulk_create(
+            Team,
+            [
+                Team(uid=self._uuid(), name=f"Team {i}", description=self._text(6))
+                for i in range(self.counts["teams"])
+            ],
+        )
+
+        members = []
+        for i, team in enumerate(self.teams):
+            owner = self.users[i % len(self.users)]
+            others = [user for user in self.users if user is not owner]
+            size = min(self.counts["members_per_team"] - 1, len(others))
+            members.append(Member(uid=self._uuid(), team=team, user=owner, role=enums.Roles.OWNER))
+            for user in self.rng.sample(others, size):
+                role = enums.Roles.ADMIN if self.rng.random() < 0.2 else enums.Roles.MEMBER
+                members.append(Member(uid=self._uuid(), team=team, user=user, role=role))
+        self.members = self._bulk_create(Member, members)
+
+        self._bulk_create(
+            Invite,
+            [
+                Invite(
+                    uid=self._uuid(),
+                    token=self._uuid(),
+                    team=team,
+                    uses_left=self.rng.randint(1, 10),
+                    note=self._text(),
+                )
+                for team in self.teams
+                for _ in range(self.counts["invites_per_team"])
+            ],
+        )
+
+    def _generate_worksessions(self):
+        for _ in range(self.counts["worksessions"]):
+            member = self.rng.choice(self.members)
+            start = self.reference - timedelta(minutes=self.rng.randint(60, 365 * 24 * 60))
+            yield WorkSession(
+                uid=self._uuid(),
+                user_id=member.user_id,
+                member=member,
+                team_id=member.team_id,
+                time_start=start,
+                time_end=start + timedelta(minutes=self.rng.randint(15, 8 * 60)),
+                is_ended=True,
+                is_created_via_tracking=self.rng.random() < 0.5,
+                note=self._text() if self.rng.random() < 0.3 else "",
+                unit_count=self.rng.randint(1, 10) if self.rng.random() < 0.2 else None,
+            )
+
+    def _create_worksessions(self) -> None:
+        if self.members:
+            self._batched(WorkSession, self._generate_worksessions())
+
+    def _generate_events(self):
+        for calendar in self.calendars:
+            for i in range(self.counts["events_per_calendar"]):
+                start = self.reference + timedelta(hours=self.rng.randint(-180 * 24, 180 * 24))
+                fullday = self.rng.random() < 0.2
+                yield CalendarEvent(
+                    uid=self._uuid(),
+                    calendar=calendar,
+                    name=f"{self._text()} {i}",
+                    description=self._text(8),
+                    location=self.rng.choice(["", "Halle", "Büro", "Online"]),
+                    fullday=fullday,
+                    dtstart=None if fullday else start,
+                    dtend=None if fullday else start + timedelta(hours=self.rng.randint(1, 4)),
+                    dstart=start.date() if fullday else None,
+                    dend=start.date() + timedelta(days=self.rng.randint(0, 2)) if fullday else None,
+                )
+
+    def _create_calendars(self) -> None:
+        self.calendars = self._bulk_create(
+            Calendar,
+            [
+                Calendar(
+                    uid=self._uuid(),
+                    ics_uid=self._uuid(),
+                    team=team,
+                    name=f"Calendar {i}",
+                    description=self._text(4),
+                    color=self.rng.choice(_COLORS),
+                )
+                for team in self.teams
+                for i in range(self.counts["calendars_per_team"])
+            ],
+        )
+        self._batched(CalendarEvent, self._generate_events())
+
+    def _generate_items(self):
+        users_by_team = {}
+        for member in self.members:
+            users_by_team.setdefault(member.team_id, []).append(member.user)
+
+        ranks = utils.ranks_between(count=self.counts["items_per_list"])
+        for todolist in self.todolists:
+            users = users_by_team[todolist.team_id]
+            for i, rank in enumerate(ranks):
+                done = self.rng.random() < 0.5
+                yield ToDoListItem(
+                    uid=self._uuid(),
+                    todolist=todolist,
+                    name=f"{self._text()} {i}",
+                    description=self._text(5),
+                    created_by=self.rng.choice(users),
+                    done=done,
+                    rank=rank,
+                    done_by=self.rng.choice(users) if done else None,
+                    done_at=(
+                        self.reference - timedelta(minutes=self.rng.randint(1, 90 * 24 * 60))
+                        if done
+                        else None
+                    ),
+                )
+
+    def _create_todolists(self) -> None:
+        self.todolists = self._bulk_create(
+            ToDoList,
+            [
+                ToDoList(
+                    uid=self._uuid(),
+                    team=team,
+                    name=f"List {i}",
+                    description=self._text(4),
+                    color=self.rng.choice(_COLORS),
+                )
+                for team in self.teams
+                for i in range(self.counts["todolists_per_team"])
+            ],
+        )
+        self._batched(ToDoListItem, self._generate_items())
+
+    def _create_clubs(self) -> None:
+        self.clubs = self._bulk_create(
+            club_models.Club,
+            [
+                club_models.Club(
+                    uid=self._uuid(),
+                    slug=f"{self.prefix}-club-{i}",
+                    name=f"Club {i}",
+                    description=self._text(6),
+                )
+                for i in range(min(self.counts["clubs"], len(self.teams)))
+            ],
+        )
+
+        # Every club is linked to one of the first teams
+        for team, club in zip(self.teams, self.clubs):
+            team.linked_club = club
+        Team.objects.bulk_update(self.teams[: len(self.clubs)], ["linked_club"])
+
+    def _create_club_members(self) -> None:
+        self.club_members = self._bulk_create(
+            club_models.ClubMember,
+            [
+                club_models.ClubMember(
+                    uid=self._uuid(),
+                    club=club,
+                    first_name=self.rng.choice(_FIRST_NAMES),
+                    last_name=self.rng.choice(_LAST_NAMES),
+                    email=f"member-{i}@{club.slug}.example.com",
+                    birth_date=(
+                        self.reference - timedelta(days=self.rng.randint(6, 80) * 365)
+                    ).date(),
+                    city=self.rng.choice(["Bern", "Zürich", "Basel", "Luzern"]),
+                    portfolio_visible=self.rng.random() < 0.3,
+                )
+                for club in self.clubs
+                for i in range(self.counts["members_per_club"])
+            ],
+        )
+        self._bulk_create(
+            club_models.ClubMemberSession,
+            [
+                club_models.ClubMemberSession(uid=self._uuid(), member=member)
+                for member in self.club_members
+                if self.rng.random() < 0.1
+            ],
+        )
+        self._bulk_create(
+            club_models.ClubMemberMagicLink,
+            [
+                club_models.ClubMemberMagicLink(uid=self._uuid(), member=member)
+                for member in self.club_members
+                if self.rng.random() < 0.05
+            ],
+        )
+
+        self.groups = self._bulk_create(
+            club_models.ClubMemberGroup,
+            [
+                club_models.ClubMemberGroup(
+                    uid=self._uuid(),
+                    shared_uid=self._uuid(),
+                    club=club,
+                    name=f"Group {i}",
+                    description=self._text(4),
+                )
+                for club in self.clubs
+                for i in range(self.counts["groups_per_club"])
+            ],
+        )
+
+        groups_by_club = {}
+        for group in self.groups:
+            groups_by_club.setdefault(group.club_id, []).append(group)
+        self._batched(
+            club_models.ClubMemberGroupMembership,
+            (
+                club_models.ClubMemberGroupMembership(uid=self._uuid(), group=group, member=member)
+                for member in self.club_members
+                for group in self.rng.sample(
+                    groups_by_club.get(member.club_id, []),
+                    min(self.rng.randint(1, 3), len(groups_by_club.get(member.club_id, []))),
+                )
+            ),
+        )
+
+    def _generate_participations(self):
+        members_by_club = {}
+        for member in self.club_members:
+            members_by_club.setdefault(member.club_id, []).append(member)
+
+        responses = list(_Responses.values)
+        for event in self.attendance_events:
+            past = event.dt_end < self.reference
+            for member in members_by_club.get(event.club_id, []):
+                yield club_models.ClubAttendanceEventParticipation(
+                    uid=self._uuid(),
+                    event=event,
+                    member=member,
+                    member_response=self.rng.choice(responses),
+                    has_attended=self.rng.random() < 0.7 if past else None,
+                )
+
+    def _create_attendance(self) -> None:
+        events = []
+        for club in self.clubs:
+            for i in range(self.counts["attendance_events_per_club"]):
+                start = self.reference + timedelta(days=self.rng.randint(-180, 180), hours=18)
+                events.append(
+                    club_models.ClubAttendanceEvent(
+                        uid=self._uuid(),
+                        club=club,
+                        title=f"{self.rng.choice(_WORDS)} {i}",
+                        description=self._text(4),
+                        participating_by_default=self.rng.random() < 0.8,
+                        dt_start=start,
+                        dt_end=start + timedelta(hours=2),
+                        points=self.rng.randint(1, 3),
+                        locked=start < self.reference,
+                    )
+                )
+        self.attendance_events = self._bulk_create(club_models.ClubAttendanceEvent, events)
+        self._batched(club_models.ClubAttendanceEventParticipation, self._generate_participations())
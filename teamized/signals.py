@@ -0,0 +1,134 @@
+"""Signal handlers
+
+These handlers are connected when the app is ready (see apps.py).
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from teamized import enums
+from teamized.api.utils.apikeys import apikey_cache
+from teamized.api.utils.models import ApiKey
+from teamized.club.models import (
+    ClubAttendanceEvent,
+    ClubAttendanceEventParticipation,
+    ClubMember,
+    ClubMemberGroup,
+    ClubMemberGroupMembership,
+)
+from teamized.models import (
+    Calendar,
+    CalendarEvent,
+    Member,
+    Tombstone,
+    ToDoList,
+    ToDoListItem,
+    User,
+    WorkSession,
+)
+
+AuthUser = get_user_model()
+
+
+# Team ownership cache (see User.ensure_team)
+
+
+@receiver([post_save, post_delete], sender=Member)
+def member_changed(sender, instance: Member, **kwargs):  # pylint: disable=unused-argument
+    """Forget whether the user owns a team (the role may have been changed or removed)"""
+    cache.delete(User.get_owns_team_cache_key(instance.user_id))
+
+
+# API key cache
+
+
+@receiver([post_save, post_delete], sender=ApiKey)
+def apikey_changed(sender, instance: ApiKey, **kwargs):  # pylint: disable=unused-argument
+    """Remove a changed or deleted API key from the cache"""
+    apikey_cache.invalidate_key(instance.key)
+
+
+@receiver([post_save, post_delete], sender=AuthUser)
+def apikey_user_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Remove the API keys of a changed or deleted user from the cache"""
+    apikey_cache.invalidate_user(instance.pk)
+
+
+def apikey_permissions_changed(sender, **kwargs):  # pylint: disable=unused-argument
+    """Clear the cache when permissions change (a group change can affect many users)"""
+    apikey_cache.clear()
+
+
+# Custom user models don't necessarily have groups and permissions
+for _field in ("groups", "user_permissions"):
+    if hasattr(AuthUser, _field):
+        m2m_changed.connect(apikey_permissions_changed, sender=getattr(AuthUser, _field).through)
+m2m_changed.connect(apikey_permissions_changed, sender=Group.permissions.through)
+
+
+# Incremental sync (see endpoint_changes)
+
+# Category and parent (container) of the objects that leave a tombstone when deleted
+TOMBSTONE_MODELS = {
+    WorkSession: (enums.SyncCategories.WORKSESSIONS, "member_id"),
+    Calendar: (enums.SyncCategories.CALENDARS, "team_id"),
+    CalendarEvent: (enums.SyncCategories.EVENTS, "calendar_id"),
+    ToDoList: (enums.SyncCategories.TODOLISTS, "team_id"),
+    ToDoListItem: (enums.SyncCategories.TODOLISTITEMS, "todolist_id"),
+    ClubMember: (enums.SyncCategories.CLUB_MEMBERS, "club_id"),
+    ClubMemberGroup: (enums.SyncCategories.CLUB_GROUPS, "club_id"),
+    ClubAttendanceEvent: (enums.SyncCategories.CLUB_ATTENDANCE_EVENTS, "club_id"),
+    ClubAttendanceEventParticipation: (enums.SyncCategories.CLUB_PARTICIPATIONS, "event_id"),
+}
+
+
+def record_tombstone(sender, instance, origin=None, **kwargs):  # pylint: disable=unused-argument
+    """Remember a deleted object, unless it was deleted together with its parent"""
+
+    # origin is the object or queryset whose deletion caused this one
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is not sender:
+        return
+    category, container_field = TOMBSTONE_MODELS[sender]
+    container_id = getattr(instance, container_field)
+    if container_id is not None:
+        Tombstone.objects.create(
+            container_id=container_id, category=category, object_id=instance.pk
+        )
+
+
+for _model in TOMBSTONE_MODELS:
+    post_delete.connect(record_tombstone, sender=_model)
+
+
+def _touch_groups(**filters):
+    # update() doesn't set auto_now fields, so date_modified is set explicitly
+    ClubMemberGroup.objects.filter(**filters).update(date_modified=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=ClubMemberGroupMembership)
+def group_membership_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Mark the group as changed (its member ids are part of the group)"""
+
+    _touch_groups(pk=instance.group_id)
+
+
+@receiver(m2m_changed, sender=ClubMemberGroup.members.through)
+def group_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # pylint: disable=unused-argument
+    """Mark the groups as changed when members are added or removed in bulk"""
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        _touch_groups(pk=instance.pk)
+    elif pk_set is not None:
+        _touch_groups(pk__in=pk_set)
+    else:
+        # The groups of the member are unknown after clear()
+        _touch_groups(club_id=instance.club_id)
@@ -23,6 +23,7 @@ urlpatterns = [
     path("api/", include("teamized.api.urls")),
     # Calendar .ics file (public, but must know uuid token)
     path("calendar/<uuid:ics_uuid>.ics", views.calendar_ics, name="calendar_ics"),
+    path("calendar/team/<uuid:ics_uuid>.ics", views.team_calendar_ics, name="team_calendar_ics"),
     # 404 error page
     re_path(".*", views.notfound),
 ]
@@ -1,5 +1,8 @@
+import functools
 import uuid
-from datetime import timedelta, datetime, date
+import zoneinfo
+from calendar import monthrange
+from datetime import UTC, timedelta, datetime, date
 from collections.abc import Iterable
 
 from django.utils import timezone
@@ -30,6 +33,89 @@ def ical_datetime(dt: datetime):
     return dt.strftime("%Y%m%dT%H%M%SZ")
 
 
+def ical_local_datetime(dt: datetime):
+    """
+    Returns a local timestamp in icalendar datetime format (to be used with a TZID).
+    """
+    return dt.strftime("%Y%m%dT%H%M%S")
+
+
+def _ical_utc_offset(offset: timedelta) -> str:
+    minutes = int(offset.total_seconds()) // 60
+    hours, minutes = divmod(abs(minutes), 60)
+    return f"{'-' if offset < timedelta(0) else '+'}{hours:02d}{minutes:02d}"
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> int:
+    """Returns the day of the n-th (-1: last) weekday of a month"""
+    if n > 0:
+        return 1 + (weekday - date(year, month, 1).weekday()) % 7 + 7 * (n - 1)
+    last = monthrange(year, month)[1]
+    return last - (date(year, month, last).weekday() - weekday) % 7
+
+
+def _offset_transitions(tz: zoneinfo.ZoneInfo, year: int) -> list[tuple]:
+    """Returns the changes of the UTC offset in a year (to the minute) as (moment, from, to)"""
+    start = datetime(year, 1, 1, tzinfo=UTC)
+
+    def get_offset(moment: datetime) -> timedelta:
+        return moment.astimezone(tz).utcoffset()
+
+    transitions = []
+    previous = get_offset(start)
+    for hour in range(1, (date(year + 1, 1, 1) - date(year, 1, 1)).days * 24 + 1):
+        moment = start + timedelta(hours=hour)
+        if get_offset(moment) != previous:
+            moment -= timedelta(hours=1)
+            while get_offset(moment) == previous:
+                moment += timedelta(minutes=1)
+            transitions.append((moment, previous, get_offset(moment)))
+            previous = get_offset(moment)
+    return transitions
+
+
+@functools.lru_cache
+def ical_vtimezone_lines(tzid: str, year: int) -> tuple[str, ...]:
+    """
+    Returns a VTIMEZONE component for a timezone (required for every TZID used in a file).
+    The daylight saving time changes of the given year are repeated yearly, as a weekday
+    of the month (e.g. the last Sunday of March).
+    """
+    tz = zoneinfo.ZoneInfo(tzid)
+    transitions = _offset_transitions(tz, year)
+
+    lines = ["BEGIN:VTIMEZONE", "TZID:" + tzid]
+    if not transitions:
+        start = datetime(year, 1, 1, tzinfo=UTC).astimezone(tz)
+        return (
+            *lines,
+            "BEGIN:STANDARD",
+            "DTSTART:19700101T000000",
+            "TZOFFSETFROM:" + _ical_utc_offset(start.utcoffset()),
+            "TZOFFSETTO:" + _ical_utc_offset(start.utcoffset()),
+            "TZNAME:" + start.tzname(),
+            "END:STANDARD",
+            "END:VTIMEZONE",
+        )
+    weekdays = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+    for moment, offset_from, offset_to in transitions:
+        # The onset is given in the local time before the change
+        local = (moment + offset_from).replace(tzinfo=None)
+        n = -1 if local.day + 7 > monthrange(year, local.month)[1] else (local.day - 1) // 7 + 1
+        first = local.replace(year=1970, day=_nth_weekday(1970, local.month, local.weekday(), n))
+        kind = "DAYLIGHT" if moment.astimezone(tz).dst() else "STANDARD"
+        lines += [
+            f"BEGIN:{kind}",
+            "DTSTART:" + ical_local_datetime(first),
+            "TZOFFSETFROM:" + _ical_utc_offset(offset_from),
+            "TZOFFSETTO:" + _ical_utc_offset(offset_to),
+            "TZNAME:" + moment.astimezone(tz).tzname(),
+            f"RRULE:FREQ=YEARLY;BYMONTH={local.month};BYDAY={n}{weekdays[local.weekday()]}",
+            f"END:{kind}",
+        ]
+    return (*lines, "END:VTIMEZONE")
+
+
 def ical_text(text: str):
     """
     Returns a text in icalendar format.
@@ -50,6 +136,21 @@ def iddict(lst: Iterable):
     return {x["id"]: x for x in lst}
 
 
+def merge_intervals(intervals: Iterable[tuple]) -> list[tuple]:
+    """
+    Returns the union of (start, end) intervals as a sorted list of non-overlapping intervals
+    (intervals that overlap or touch each other are merged)
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
 def now_plus_1h():
     return timezone.now() + timedelta(hours=1)
 
@@ -72,3 +173,55 @@ def is_valid_uuid(val):
         return True
     except ValueError:
         return False
+
+
+# Digits of rank keys (in ascending order)
+# Only digits and lowercase letters are used, so that every database collation sorts the keys
+# the same way as Python does.
+RANK_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def _rank_to_int(rank: str, width: int) -> int:
+    return int(rank.ljust(width, RANK_DIGITS[0]), len(RANK_DIGITS))
+
+
+def _int_to_rank(value: int, width: int) -> str:
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, len(RANK_DIGITS))
+        digits.append(RANK_DIGITS[digit])
+    # Trailing zeros are removed, so there's always room for another key before every key
+    return "".join(reversed(digits)).rstrip(RANK_DIGITS[0])
+
+
+def ranks_between(before: str = "", after: str = "", count: int = 1) -> list[str]:
+    """
+    Returns evenly distributed, ascending rank keys between two keys ("" means no bound).
+    Rank keys are compared as strings, so a key can always be inserted between two others.
+    """
+    if after and before >= after:
+        raise ValueError(f"Rank '{before}' is not lower than rank '{after}'")
+
+    width = max(len(before), len(after)) + 1
+    while True:
+        low = _rank_to_int(before, width)
+        high = _rank_to_int(after, width) if after else len(RANK_DIGITS) ** width
+        if high - low > count:
+            break
+        width += 1
+    return [_int_to_rank(low + (high - low) * (i + 1) // (count + 1), width) for i in range(count)]
+
+
+def rank_between(before: str = "", after: str = "") -> str:
+    """
+    Returns a rank key between two keys ("" means no bound).
+    Without an upper bound, the next short key after 'before' is returned instead of the
+    middle, so that appending many keys doesn't make them long.
+    """
+    if after:
+        return ranks_between(before, after)[0]
+
+    for i, char in enumerate(before):
+        if char != RANK_DIGITS[-1]:
+            return before[:i] + RANK_DIGITS[RANK_DIGITS.index(char) + 1]
+    return before + RANK_DIGITS[1]
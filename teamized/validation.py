@@ -155,6 +155,18 @@ class DateValidator(BaseValidator):
         return dt.datetime.strptime(value, fmt).date()
 
 
+class ChoiceValidator(StringValidator):
+    @classmethod
+    def _convert(cls, value, choices=(), **kwargs):
+        if value not in choices:
+            raise ValidationError(
+                _("Der Wert '{}' ist keine der erlaubten Optionen ({})!").format(
+                    value, ", ".join(choices)
+                )
+            )
+        return value
+
+
 class RegexValidator(StringValidator):
     @classmethod
     def _convert(cls, value, regex="", **kwargs):
@@ -237,6 +249,17 @@ def date(
     return DateValidator.validate(datadict, attr, required, default, null, fmt=fmt)
 
 
+def choice(
+    datadict: dict,
+    attr: str,
+    choices: list[str],
+    required: bool = True,
+    default: str | None = None,
+    null=False,
+) -> str:
+    return ChoiceValidator.validate(datadict, attr, required, default, null, choices=choices)
+
+
 def slug(
     datadict: dict,
     attr: str,
@@ -8,11 +8,13 @@ from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from django.views.decorators.http import require_GET, require_safe
 
-from teamized import validation
+from teamized import options, validation
 from teamized.decorators import teamized_prep, validation_func
-from teamized.models import Calendar, Member
+from teamized.models import Calendar, IcsFeedMixin, Member, Team
 
 # General views
 
@@ -121,16 +123,47 @@ def workingtime_report(request, team_uuid: uuid.UUID):
 # Public URLs
 
 
+def _ics_feed_response(request, feed: IcsFeedMixin):
+    """Respond with an ics feed
+
+    Calendar clients poll the feeds regularly: Unchanged feeds are answered with a
+    "304 Not Modified" and changed ones are only rendered once per version.
+    """
+
+    etag = f'"{feed.get_ics_version(request)}"'
+    last_modified = int(feed.get_ics_last_modified().timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        # Large feeds are streamed to keep the memory usage constant
+        streaming = feed.events_count > options.ICS_STREAMING_MIN_EVENTS
+        response = feed.as_ics_response(request, cached=not streaming, streaming=streaming)
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
 @require_safe
 def calendar_ics(request, ics_uuid: uuid.UUID):
     """Get the .ics file for a public calendar"""
 
     try:
-        calendar: Calendar = Calendar.objects.get(ics_uid=ics_uuid, is_public=True)
+        calendar: Calendar = Calendar.get_public_for_ics(ics_uuid)
     except Calendar.DoesNotExist:
         return render(request, "teamized/404.html", status=404)
 
-    return calendar.as_ics_response(request)
+    return _ics_feed_response(request, calendar)
+
+
+@require_safe
+def team_calendar_ics(request, ics_uuid: uuid.UUID):
+    """Get the .ics file with the events of all public calendars of a team"""
+
+    try:
+        team: Team = Team.get_public_for_ics(ics_uuid)
+    except Team.DoesNotExist:
+        return render(request, "teamized/404.html", status=404)
+
+    return _ics_feed_response(request, team)
 
 
 # Error views
@@ -0,0 +1 @@
+"""Benchmarks for django-teamized (run them with runbenchmarks.py)"""
@@ -0,0 +1,205 @@
+"""
+Benchmark runner
+
+Seeds a dataset for every requested size (see SIZES), runs all scenarios against it and
+reports the p50/p95 latency, the number of queries and the peak memory per scenario.
+"""
+
+import platform
+import statistics
+import time
+import tracemalloc
+
+import django
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from teamized import enums
+from teamized.models import Member
+from teamized.seeding import Seeder
+from teamized_benchmarks.scenarios import SCENARIOS
+
+# Seeder counts per dataset size
+SIZES = {
+    "small": {
+        "users": 20,
+        "teams": 5,
+        "members_per_team": 5,
+        "worksessions": 500,
+        "calendars_per_team": 2,
+        "events_per_calendar": 20,
+        "todolists_per_team": 2,
+        "items_per_list": 20,
+        "clubs": 1,
+        "members_per_club": 50,
+        "groups_per_club": 5,
+        "attendance_events_per_club": 10,
+    },
+    "medium": {
+        "users": 100,
+        "teams": 20,
+        "members_per_team": 10,
+        "worksessions": 10_000,
+        "calendars_per_team": 3,
+        "events_per_calendar": 200,
+        "todolists_per_team": 3,
+        "items_per_list": 200,
+        "clubs": 1,
+        "members_per_club": 500,
+        "groups_per_club": 10,
+        "attendance_events_per_club": 50,
+    },
+    "large": {
+        "users": 500,
+        "teams": 50,
+        "members_per_team": 20,
+        "worksessions": 50_000,
+        "calendars_per_team": 5,
+        "events_per_calendar": 1000,
+        "todolists_per_team": 5,
+        "items_per_list": 1000,
+        "clubs": 1,
+        "members_per_club": 2000,
+        "groups_per_club": 20,
+        "attendance_events_per_club": 200,
+    },
+}
+
+
+class Context:
+    """The objects the scenarios work with (the first team and its owner)"""
+
+    def __init__(self, seeder: Seeder):
+        self.seeder = seeder
+        self.team = seeder.teams[0]
+        self.member = Member.objects.get(team=self.team, role=enums.Roles.OWNER)
+        self.user = self.member.user
+        self.calendar = self.team.calendars.order_by("name").first()
+        self.todolist = self.team.todolists.order_by("name").first()
+        self.club = self.team.linked_club
+        self.attendance_event = self.club.attendance_events.order_by("dt_start").first()
+
+        # The ICS feed is only available for public calendars
+        self.calendar.is_public = True
+        self.calendar.save()
+
+        self.client = Client()
+        self.client.force_login(self.user.auth_user)
+
+
+def _percentile(values: list[float], percentile: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percentile - 1]
+
+
+def measure(function, repeat: int) -> dict:
+    """Run a scenario function and measure it"""
+
+    # Warm up (and count the queries)
+    with CaptureQueriesContext(connection) as ctx:
+        status = function()
+    queries = len(ctx.captured_queries)
+    if status != 200:
+        raise RuntimeError(f"Unexpected status code {status}")
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    # Memory is measured separately because tracing slows down the execution
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": round(_percentile(durations, 50), 3),
+        "p95_ms": round(_percentile(durations, 95), 3),
+        "queries": queries,
+        "peak_memory_kib": round(peak / 1024, 1),
+    }
+
+
+def run_size(counts: dict, repeat: int, scenarios: list[str] | None = None, prefix="bench") -> dict:
+    """Seed a dataset with the given counts and run the scenarios against it"""
+
+    seed_start = time.perf_counter()
+    seeder = Seeder(seed=0, prefix=prefix, **counts).run()
+    seed_duration = time.perf_counter() - seed_start
+
+    ctx = Context(seeder)
+    results = {}
+    for name in scenarios or SCENARIOS:
+        results[name] = measure(SCENARIOS[name](ctx), repeat)
+    return {
+        "counts": counts,
+        "seed_seconds": round(seed_duration, 2),
+        "scenarios": results,
+    }
+
+
+def run(sizes: list[str], repeat: int, scenarios: list[str] | None = None, log=print) -> dict:
+    """Run the benchmarks for several dataset sizes (the database is flushed in between)"""
+
+    results = {
+        "meta": {
+            "date": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "repeat": repeat,
+        },
+        "sizes": {},
+    }
+    for size in sizes:
+        log(f"Running benchmarks with the {size} dataset...")
+        call_command("flush", interactive=False, verbosity=0)
+        results["sizes"][size] = run_size(SIZES[size], repeat, scenarios)
+    return results
+
+
+def compare(old: dict, new: dict, tolerance: float = 1.5) -> list[str]:
+    """
+    Compare two benchmark results. Returns a list of regressions:
+    more queries than before, or a p95 latency more than `tolerance` times higher.
+    """
+
+    regressions = []
+    for size, new_size in new["sizes"].items():
+        old_scenarios = old.get("sizes", {}).get(size, {}).get("scenarios", {})
+        for name, new_result in new_size["scenarios"].items():
+            old_result = old_scenarios.get(name)
+            if old_result is None:
+                continue
+            if new_result["queries"] > old_result["queries"]:
+                regressions.append(
+                    f"{size} {name}: {old_result['queries']} -> {new_result['queries']} queries"
+                )
+            if new_result["p95_ms"] > old_result["p95_ms"] * tolerance:
+                regressions.append(
+                    f"{size} {name}: p95 {old_result['p95_ms']} ms -> {new_result['p95_ms']} ms"
+                )
+    return regressions
+
+
+def format_table(results: dict) -> str:
+    """Format the results as a plain text table"""
+
+    lines = [
+        f"{'size':<8} {'scenario':<40} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'peak KiB':>10}"
+    ]
+    for size, size_results in results["sizes"].items():
+        for name, result in size_results["scenarios"].items():
+            lines.append(
+                f"{size:<8} {name:<40} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                f"{result['queries']:>8} {result['peak_memory_kib']:>10.1f}"
+            )
+    return "\n".join(lines)
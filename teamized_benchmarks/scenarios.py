@@ -0,0 +1,227 @@
+"""
+Benchmark scenarios
+
+Every scenario is a function that receives the benchmark context (see runner.Context) and
+returns a callable. The callable performs the measured operation once and returns an HTTP
+status code (serializer scenarios return 200).
+"""
+
+import json
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+from teamized.api.endpoints.sync import encode_cursor
+from teamized.club.models import ClubMember, ClubAttendanceEventParticipation
+from teamized.models import WorkSession, ToDoListItem
+
+SCENARIOS = {}
+
+
+def scenario(name: str):
+    """Decorator: Register a scenario"""
+
+    def decorator(function):
+        SCENARIOS[name] = function
+        return function
+
+    return decorator
+
+
+def _get(ctx, name: str, **kwargs):
+    url = reverse(f"teamized:{name}", kwargs={key: value.pk for key, value in kwargs.items()})
+    return lambda: ctx.client.get(url).status_code
+
+
+# API endpoints
+
+
+@scenario("api/bootstrap")
+def api_bootstrap(ctx):
+    url = reverse("teamized:api-bootstrap")
+    return lambda: ctx.client.get(url, {"include_team_data": "true"}).status_code
+
+
+@scenario("api/batch")
+def api_batch(ctx):
+    url = reverse("teamized:api-batch")
+    team = ctx.team.pk
+    requests = json.dumps(
+        [
+            {"path": "settings"},
+            {"path": f"teams/{team}/calendars", "data": {"include_events": "false"}},
+            {"path": f"teams/{team}/todolists", "data": {"include_items": "false"}},
+            {"path": f"teams/{team}/me/worksessions", "data": {"page_size": 50}},
+        ]
+    )
+    return lambda: ctx.client.post(url, {"requests": requests}).status_code
+
+
+@scenario("api/changes")
+def api_changes(ctx):
+    # A periodic refresh: Nothing changed since the seeding, so the payload is (nearly) empty
+    url = reverse("teamized:api-changes", kwargs={"team": ctx.team.pk})
+    since = encode_cursor(timezone.now())
+    return lambda: ctx.client.get(url, {"since": since}).status_code
+
+
+@scenario("api/teams")
+def api_teams(ctx):
+    return _get(ctx, "api-teams")
+
+
+@scenario("api/worksessions")
+def api_worksessions(ctx):
+    return _get(ctx, "api-workingtime-worksessions", team=ctx.team)
+
+
+@scenario("api/worksessions-page")
+def api_worksessions_page(ctx):
+    url = reverse("teamized:api-workingtime-worksessions", kwargs={"team": ctx.team.pk})
+    return lambda: ctx.client.get(url, {"page_size": 50}).status_code
+
+
+@scenario("api/worksessions-stats")
+def api_worksessions_stats(ctx):
+    url = reverse("teamized:api-workingtime-worksessions-stats", kwargs={"team": ctx.team.pk})
+    return lambda: ctx.client.get(url, {"start": "2000-01-01", "interval": "week"}).status_code
+
+
+@scenario("api/calendars")
+def api_calendars(ctx):
+    return _get(ctx, "api-calendars", team=ctx.team)
+
+
+@scenario("api/calendars-index")
+def api_calendars_index(ctx):
+    url = reverse("teamized:api-calendars", kwargs={"team": ctx.team.pk})
+    return lambda: ctx.client.get(url, {"include_events": "false"}).status_code
+
+
+@scenario("api/calendars-freebusy")
+def api_calendars_freebusy(ctx):
+    url = reverse("teamized:api-calendars-freebusy", kwargs={"team": ctx.team.pk})
+    fmt = "%Y-%m-%dT%H:%M:%S.%f%z"
+    reference = ctx.seeder.reference
+    window = {
+        "from": (reference - timedelta(days=30)).strftime(fmt),
+        "to": (reference + timedelta(days=30)).strftime(fmt),
+    }
+    return lambda: ctx.client.get(url, window).status_code
+
+
+@scenario("api/events")
+def api_events(ctx):
+    return _get(ctx, "api-events", team=ctx.team, calendar=ctx.calendar)
+
+
+@scenario("api/events-window")
+def api_events_window(ctx):
+    url = reverse("teamized:api-events", kwargs={"team": ctx.team.pk, "calendar": ctx.calendar.pk})
+    window = {"from": "2000-01-01T00:00:00.000000+0000", "to": "2000-02-01T00:00:00.000000+0000"}
+    return lambda: ctx.client.get(url, window).status_code
+
+
+@scenario("api/todolists")
+def api_todolists(ctx):
+    return _get(ctx, "api-todolists", team=ctx.team)
+
+
+@scenario("api/todolists-index")
+def api_todolists_index(ctx):
+    url = reverse("teamized:api-todolists", kwargs={"team": ctx.team.pk})
+    return lambda: ctx.client.get(url, {"include_items": "false"}).status_code
+
+
+@scenario("api/todolistitems-done-page")
+def api_todolistitems_done_page(ctx):
+    url = reverse(
+        "teamized:api-todolistitems", kwargs={"team": ctx.team.pk, "todolist": ctx.todolist.pk}
+    )
+    return lambda: ctx.client.get(url, {"done": "true", "page_size": 50}).status_code
+
+
+@scenario("api/todolistitems")
+def api_todolistitems(ctx):
+    return _get(ctx, "api-todolistitems", team=ctx.team, todolist=ctx.todolist)
+
+
+@scenario("api/club-members")
+def api_club_members(ctx):
+    return _get(ctx, "api-club-members", team=ctx.team)
+
+
+@scenario("api/club-groups")
+def api_club_groups(ctx):
+    return _get(ctx, "api-club-groups", team=ctx.team)
+
+
+@scenario("api/club-attendance-events")
+def api_club_attendance_events(ctx):
+    return _get(ctx, "api-club-attendance-events", team=ctx.team)
+
+
+@scenario("api/club-attendance-participations")
+def api_club_attendance_participations(ctx):
+    return _get(
+        ctx,
+        "api-club-attendance-event-participations",
+        team=ctx.team,
+        attendance_event=ctx.attendance_event,
+    )
+
+
+@scenario("ics/calendar")
+def ics_calendar(ctx):
+    url = reverse("teamized:calendar_ics", kwargs={"ics_uuid": ctx.calendar.ics_uid})
+    return lambda: ctx.client.get(url).status_code
+
+
+@scenario("ics/team")
+def ics_team(ctx):
+    url = reverse("teamized:team_calendar_ics", kwargs={"ics_uuid": ctx.team.calendar_ics_uid})
+    return lambda: ctx.client.get(url).status_code
+
+
+@scenario("ics/calendar-streaming")
+def ics_calendar_streaming(ctx):
+    def run():
+        response = ctx.calendar.as_ics_response(streaming=True)
+        for _ in response.streaming_content:
+            pass
+        return response.status_code
+
+    return run
+
+
+# Serializers (as_dict of every object a typical endpoint returns)
+
+
+def _serialize(queryset):
+    def run():
+        for obj in queryset.all():
+            obj.as_dict()
+        return 200
+
+    return run
+
+
+@scenario("serializer/worksessions")
+def serializer_worksessions(ctx):
+    return _serialize(WorkSession.objects.filter(team=ctx.team, user=ctx.user))
+
+
+@scenario("serializer/todolistitems")
+def serializer_todolistitems(ctx):
+    return _serialize(ToDoListItem.objects.filter(todolist=ctx.todolist))
+
+
+@scenario("serializer/club-members")
+def serializer_club_members(ctx):
+    return _serialize(ClubMember.objects.filter(club=ctx.club))
+
+
+@scenario("serializer/club-attendance-participations")
+def serializer_club_attendance_participations(ctx):
+    return _serialize(ClubAttendanceEventParticipation.objects.filter(event=ctx.attendance_event))
@@ -0,0 +1,7 @@
+# Benchmark settings for django-teamized
+
+from teamized_tests.settings import *  # pylint: disable=wildcard-import, unused-wildcard-import
+
+# Benchmarks should measure production-like behaviour
+DEBUG = False
+ALLOWED_HOSTS = ["testserver"]
@@ -5,3 +5,8 @@ from devproject.settings import *  # pylint: disable=wildcard-import, unused-wil
 DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}}
 
 INSTALLED_APPS = ["teamized_tests"] + INSTALLED_APPS
+
+# The debug toolbar is not needed while running tests
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != "debug_toolbar"]
+MIDDLEWARE = [m for m in MIDDLEWARE if not m.startswith("debug_toolbar.")]
+ROOT_URLCONF = "teamized_tests.urls"
@@ -0,0 +1,168 @@
+"""
+Shared test data for API tests
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from teamized import enums
+from teamized.club.models import (
+    Club,
+    ClubAttendanceEvent,
+    ClubAttendanceEventParticipation,
+    ClubMember,
+    ClubMemberGroup,
+)
+from teamized.models import (
+    Calendar,
+    CalendarEvent,
+    Invite,
+    Member,
+    ToDoList,
+    ToDoListItem,
+    User,
+    WorkSession,
+)
+from teamized.seeding import Seeder
+
+
+def create_user(username: str) -> User:
+    """Create an auth user together with its teamized user"""
+
+    auth_user = get_user_model().objects.create_user(
+        username=username, email=f"{username}@example.com", password="test"
+    )
+    return User.objects.create(auth_user=auth_user)
+
+
+def create_team_fixture() -> dict:
+    """Create a team (with a linked club) containing at least one object of every kind"""
+
+    owner = create_user("owner")
+    other = create_user("other")
+
+    club = Club.objects.create(name="Club", slug="club")
+    team = owner.create_team("Team", "Description")
+    team.linked_club = club
+    team.save()
+    other_member = team.join(other, role=enums.Roles.MEMBER)
+
+    now = timezone.now()
+    calendar = Calendar.objects.create(team=team, name="Calendar")
+    calendar2 = Calendar.objects.create(team=team, name="Calendar 2")
+    event = CalendarEvent.objects.create(
+        calendar=calendar, name="Event", dtstart=now, dtend=now + timedelta(hours=1)
+    )
+    todolist = ToDoList.objects.create(team=team, name="List")
+    item = ToDoListItem.objects.create(todolist=todolist, name="Item", created_by=owner)
+    worksession = WorkSession.objects.create(
+        user=owner,
+        member=team.get_member(owner),
+        team=team,
+        time_start=now - timedelta(hours=2),
+        time_end=now - timedelta(hours=1),
+        is_ended=True,
+    )
+    invite = Invite.objects.create(team=team)
+
+    return {
+        "owner": owner,
+        "other": other,
+        "team": team,
+        "member": team.get_member(owner),
+        "other_member": other_member,
+        "calendar": calendar,
+        "calendar2": calendar2,
+        "event": event,
+        "todolist": todolist,
+        "item": item,
+        "worksession": worksession,
+        "invite": invite,
+        **_create_club_objects(club, now),
+    }
+
+
+def _create_club_objects(club: Club, now) -> dict:
+    """Create one object of every club related kind"""
+
+    club_member = ClubMember.objects.create(
+        club=club, first_name="First", last_name="Last", email="member@example.com"
+    )
+    attendance_event = ClubAttendanceEvent.objects.create(
+        club=club, title="Training", dt_start=now, dt_end=now + timedelta(hours=2)
+    )
+    return {
+        "club": club,
+        "club_member": club_member,
+        "group": ClubMemberGroup.objects.create(club=club, name="Group"),
+        "attendance_event": attendance_event,
+        "participation": ClubAttendanceEventParticipation.create(
+            event=attendance_event, member=club_member
+        ),
+    }
+
+
+def create_seeded_fixture() -> dict:
+    """
+    Generate a small but realistic dataset with the Seeder and pick one object of every kind
+    (from the first team, which is owned by the first user)
+    """
+
+    seeder = Seeder(
+        seed=1,
+        prefix="fixture",
+        users=12,
+        teams=3,
+        members_per_team=11,
+        worksessions=60,
+        calendars_per_team=5,
+        events_per_calendar=10,
+        todolists_per_team=5,
+        items_per_list=10,
+        clubs=1,
+        members_per_club=20,
+        groups_per_club=5,
+        attendance_events_per_club=5,
+    ).run()
+
+    team = seeder.teams[0]
+    member = Member.objects.get(team=team, role=enums.Roles.OWNER)
+    owner = member.user
+    club = team.linked_club
+    attendance_event = club.attendance_events.first()
+    calendar = team.calendars.order_by("name").first()
+    todolist = team.todolists.order_by("name").first()
+    return {
+        "seeder": seeder,
+        "owner": owner,
+        "team": team,
+        "member": member,
+        "other_member": team.members.exclude(pk=member.pk).first(),
+        "calendar": calendar,
+        "calendar2": team.calendars.exclude(pk=calendar.pk).first(),
+        "event": calendar.events.first(),
+        "todolist": todolist,
+        "item": todolist.items.first(),
+        "worksession": WorkSession.objects.filter(member=member).first(),
+        "invite": team.invites.first(),
+        "club": club,
+        "club_member": club.members.first(),
+        "group": club.groups.first(),
+        "attendance_event": attendance_event,
+        "participation": attendance_event.participations.first(),
+    }
+
+
+def count_membership_queries(captured_queries) -> int:
+    """Count the queries looking up the membership of a user in a specific team"""
+
+    count = 0
+    for query in captured_queries:
+        if 'FROM "teamized_member"' not in query["sql"] or " WHERE " not in query["sql"]:
+            continue
+        where = query["sql"].split(" WHERE ", 1)[1]
+        if '"teamized_member"."team_id" =' in where and '"teamized_member"."user_id" =' in where:
+            count += 1
+    return count
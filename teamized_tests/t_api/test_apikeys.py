@@ -0,0 +1,77 @@
+"""
+Tests for the API key authentication
+"""
+
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+
+from teamized.api.utils.apikeys import apikey_cache
+from teamized.api.utils.models import ApiKey
+from teamized_tests.t_api.fixtures import create_user
+
+
+class ApiKeyAuthenticationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("apikey")
+        cls.user.ensure_team()
+        cls.apikey = ApiKey.objects.create(user=cls.user.auth_user, read=True, write=False)
+
+    def setUp(self):
+        apikey_cache.clear()
+        self.url = reverse("teamized:api-profile") + f"?apikey={self.apikey.key}"
+
+    def tearDown(self):
+        # Write the pending timestamps while the test transaction can still be rolled back
+        apikey_cache.flush()
+
+    def test_invalid_key(self):
+        self.assertEqual(
+            self.client.get(reverse("teamized:api-profile") + "?apikey=abc").status_code, 403
+        )
+        self.assertEqual(
+            self.client.get(
+                reverse("teamized:api-profile") + "?apikey=00000000-0000-0000-0000-000000000000"
+            ).status_code,
+            403,
+        )
+
+    def test_key_is_cached(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        # Only the user (with its teamized user) is loaded
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_cache_is_invalidated_on_change(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        self.apikey.read = False
+        self.apikey.save()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+        self.apikey.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_cache_is_invalidated_on_user_change(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        auth_user = self.user.auth_user
+        auth_user.is_active = False
+        auth_user.save()
+        self.assertFalse(apikey_cache.get(self.apikey.key).is_active)
+
+    def test_last_used_is_written_in_batches(self):
+        with mock.patch("teamized.options.APIKEY_LAST_USED_FLUSH_INTERVAL", 3600):
+            apikey_cache.flush()  # Restart the interval
+            self.client.get(self.url)
+            self.client.get(self.url)
+            self.apikey.refresh_from_db()
+            self.assertIsNone(self.apikey.last_used)
+
+        with mock.patch("teamized.options.APIKEY_LAST_USED_FLUSH_INTERVAL", 0):
+            self.client.get(self.url)
+            self.apikey.refresh_from_db()
+            self.assertIsNotNone(self.apikey.last_used)
@@ -0,0 +1,104 @@
+"""
+Tests for the batch endpoint
+"""
+
+import json
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from teamized_tests.t_api.fixtures import create_user
+
+
+class BatchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("batch")
+        cls.team = cls.user.create_team("Team", "")
+        cls.other_team = create_user("batch-other").create_team("Other", "")
+
+    def setUp(self):
+        self.client.force_login(self.user.auth_user)
+        self.url = reverse("teamized:api-batch")
+        self.todolists = f"teams/{self.team.uid}/todolists"
+
+    def _batch(self, requests: list, status: int = 200, **data) -> dict:
+        response = self.client.post(self.url, {"requests": json.dumps(requests), **data})
+        self.assertEqual(response.status_code, status, response.content)
+        return response.json()
+
+    def test_dispatch(self):
+        with CaptureQueriesContext(connection) as ctx:
+            data = self._batch(
+                [
+                    {"method": "post", "path": self.todolists, "data": {"name": "First"}},
+                    {"method": "post", "path": self.todolists, "data": {"name": "Second"}},
+                    {"path": self.todolists},
+                    {"path": "settings"},
+                ]
+            )
+        self.assertTrue(data["success"])
+        self.assertEqual([r["status"] for r in data["results"]], [200, 200, 200, 200])
+        self.assertEqual(
+            [t["name"] for t in data["results"][2]["body"]["todolists"]], ["First", "Second"]
+        )
+        self.assertEqual(data["results"][3]["body"], {"settings": {"darkmode": None}})
+
+        # The session and the user are only loaded once
+        sessions = [q for q in ctx.captured_queries if 'FROM "django_session"' in q["sql"]]
+        self.assertEqual(len(sessions), 1)
+
+    def test_atomic(self):
+        requests = [
+            {"method": "post", "path": self.todolists, "data": {"name": "First"}},
+            {"method": "post", "path": self.todolists, "data": {}},  # Name missing
+            {"method": "post", "path": self.todolists, "data": {"name": "Third"}},
+        ]
+
+        data = self._batch(requests, atomic="true")
+        self.assertEqual((data["success"], data["rolled_back"]), (False, True))
+        self.assertEqual([r["status"] for r in data["results"]], [200, 400])
+        self.assertFalse(self.team.todolists.exists())
+
+        data = self._batch(requests)
+        self.assertEqual((data["success"], data["rolled_back"]), (False, False))
+        self.assertEqual([r["status"] for r in data["results"]], [200, 400, 200])
+        self.assertEqual(self.team.todolists.count(), 2)
+
+    def test_permissions_and_paths(self):
+        data = self._batch(
+            [
+                {"path": f"teams/{self.other_team.uid}/todolists"},
+                {"path": "does-not-exist"},
+                {"method": "post", "path": "batch", "data": {"requests": "[]"}},
+            ]
+        )
+        self.assertEqual([r["status"] for r in data["results"]], [403, 404, 404])
+
+    def test_permissions_change(self):
+        todolist = self.team.todolists.create(name="List")
+        member = create_user("batch-member")
+        self.team.join(member)
+        self.client.force_login(member.auth_user)
+
+        data = self._batch(
+            [
+                {"path": self.todolists},
+                {"method": "post", "path": f"teams/{self.team.uid}/leave"},
+                {
+                    "method": "post",
+                    "path": f"{self.todolists}/{todolist.uid}/items",
+                    "data": {"name": "Item"},
+                },
+            ]
+        )
+        self.assertEqual([r["status"] for r in data["results"]], [200, 200, 403])
+        self.assertFalse(todolist.items.exists())
+
+    def test_invalid(self):
+        data = self._batch({"path": "settings"}, status=400)
+        self.assertEqual(data["error"], "invalid_batch")
+        self._batch([{"method": "put", "path": "settings"}], status=400)
+        self._batch([{"path": "settings"}] * 51, status=400)
@@ -0,0 +1,112 @@
+"""
+Tests for the bootstrap endpoint
+"""
+
+from datetime import timedelta
+
+from django.contrib.messages import constants
+from django.contrib.messages.storage.base import Message
+from django.contrib.messages.storage.cookie import MessageEncoder
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from teamized.models import WorkSession
+from teamized_tests.t_api.fixtures import create_user
+
+
+class BootstrapTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("bootstrap")
+        cls.team = cls.user.create_team("A Team", "")
+        cls.member = cls.team.members.get(user=cls.user)
+        cls.team.calendars.create(name="Calendar")
+        cls.team.todolists.create(name="List")
+
+    def setUp(self):
+        self.client.force_login(self.user.auth_user)
+        self.url = reverse("teamized:api-bootstrap")
+
+    def _get(self, params=None) -> dict:
+        response = self.client.get(self.url, params or {})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_bootstrap(self):
+        now = timezone.now()
+        WorkSession.objects.create(
+            team=self.team,
+            member=self.member,
+            user=self.user,
+            time_start=now,
+            is_created_via_tracking=True,
+        )
+
+        data = self._get()
+        self.assertEqual(data["user"]["username"], "bootstrap")
+        self.assertEqual(data["settings"], {"darkmode": None})
+        self.assertEqual(data["defaultTeamId"], str(self.team.uid))
+        self.assertEqual([t["name"] for t in data["teams"]], ["A Team"])
+        self.assertEqual(data["messages"], [])
+        self.assertIsNotNone(data["tracking_session"])
+        self.assertNotIn("team_data", data)
+
+    def test_team_data(self):
+        other_team = self.user.create_team("B Team", "")
+        now = timezone.now()
+        for i in range(3):
+            WorkSession.objects.create(
+                team=other_team,
+                member=other_team.members.get(user=self.user),
+                user=self.user,
+                time_start=now - timedelta(days=i, hours=2),
+                time_end=now - timedelta(days=i),
+                is_ended=True,
+            )
+
+        data = self._get({"include_team_data": "true"})["team_data"]
+        self.assertEqual(data["team_id"], str(self.team.uid))
+        self.assertEqual([c["name"] for c in data["calendars"]], ["Calendar"])
+        self.assertNotIn("events", data["calendars"][0])
+        self.assertEqual(data["todolists"][0]["open_count"], 0)
+        self.assertEqual(data["worksessions"], [])
+
+        data = self._get({"include_team_data": "true", "team": other_team.uid})["team_data"]
+        self.assertEqual(len(data["worksessions"]), 3)
+        self.assertIsNone(data["worksessions_next"])
+
+        response = self.client.get(
+            self.url, {"include_team_data": "true", "team": create_user("x").uid}
+        )
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(MESSAGE_STORAGE="django.contrib.messages.storage.session.SessionStorage")
+    def test_messages(self):
+        session = self.client.session
+        session["_messages"] = MessageEncoder().encode([Message(constants.SUCCESS, "Hello")])
+        session.save()
+
+        # A failed request doesn't consume the messages
+        response = self.client.get(
+            self.url, {"include_team_data": "true", "team": create_user("x").uid}
+        )
+        self.assertEqual(response.status_code, 403)
+
+        self.assertEqual(self._get()["messages"], [{"type": "success", "text": "Hello"}])
+        self.assertEqual(self._get()["messages"], [])
+
+    def test_constant_queries(self):
+        def count_queries():
+            self._get()  # Warm up the caches (e.g. ensure_team)
+            with CaptureQueriesContext(connection) as ctx:
+                self._get({"include_team_data": "true"})
+            return len(ctx.captured_queries)
+
+        queries = count_queries()
+        for name in ["B", "C", "D"]:
+            team = self.user.create_team(name, "")
+            team.calendars.create(name="Calendar")
+        self.assertEqual(count_queries(), queries)
@@ -0,0 +1,110 @@
+"""
+Tests for loading the events of a calendar in a time range
+"""
+
+from datetime import date, datetime
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from teamized.models import CalendarEvent
+from teamized_tests.t_api.fixtures import create_user
+
+
+class CalendarRangeTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("range")
+        cls.team = cls.user.create_team("Team", "")
+        cls.calendar = cls.team.calendars.create(name="Calendar")
+
+        tz = timezone.get_current_timezone()
+        for name, start, end in [
+            ("before", datetime(2024, 2, 28, 10, 0, tzinfo=tz), datetime(2024, 2, 28, 11, 0, tzinfo=tz)),
+            ("overlapping start", datetime(2024, 2, 29, 23, 0, tzinfo=tz), datetime(2024, 3, 1, 1, 0, tzinfo=tz)),
+            ("inside", datetime(2024, 3, 15, 10, 0, tzinfo=tz), datetime(2024, 3, 15, 11, 0, tzinfo=tz)),
+            ("touching end", datetime(2024, 4, 1, 0, 0, tzinfo=tz), datetime(2024, 4, 1, 1, 0, tzinfo=tz)),
+        ]:  # fmt: skip
+            CalendarEvent.objects.create(calendar=cls.calendar, name=name, dtstart=start, dtend=end)
+        for name, start, end in [
+            ("fullday before", date(2024, 2, 27), date(2024, 2, 29)),
+            ("fullday overlapping", date(2024, 2, 27), date(2024, 3, 1)),
+            ("fullday last day", date(2024, 3, 31), date(2024, 3, 31)),
+            ("fullday after", date(2024, 4, 1), date(2024, 4, 2)),
+        ]:
+            CalendarEvent.objects.create(
+                calendar=cls.calendar, name=name, fullday=True, dstart=start, dend=end
+            )
+
+    def setUp(self):
+        self.client.force_login(self.user.auth_user)
+        # The API expects UTC (as sent by the frontend): Europe/Zurich is UTC+1 in March
+        self.params = {
+            "from": "2024-02-29T23:00:00.000000+0000",
+            "to": "2024-03-31T22:00:00.000000+0000",
+        }
+        self.expected = ["fullday last day", "fullday overlapping", "inside", "overlapping start"]
+
+    def _get(self, name: str, params: dict, **kwargs):
+        url = reverse(f"teamized:{name}", kwargs={"team": self.team.uid, **kwargs})
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_events(self):
+        data = self._get("api-events", self.params, calendar=self.calendar.uid)
+        self.assertEqual(sorted(e["name"] for e in data["events"]), self.expected)
+
+        data = self._get("api-events", {}, calendar=self.calendar.uid)
+        self.assertEqual(len(data["events"]), 8)
+
+    def test_active_timezone(self):
+        # The dates of full-day events don't depend on the timezone of the request
+        with timezone.override("America/New_York"):
+            data = self._get("api-events", self.params, calendar=self.calendar.uid)
+        self.assertEqual(sorted(e["name"] for e in data["events"]), self.expected)
+
+    def test_open_ranges(self):
+        data = self._get("api-events", {"to": self.params["from"]}, calendar=self.calendar.uid)
+        self.assertEqual(
+            sorted(e["name"] for e in data["events"]),
+            ["before", "fullday before", "fullday overlapping", "overlapping start"],
+        )
+
+    def test_calendars(self):
+        data = self._get("api-calendars", self.params)
+        names = [e["name"] for e in data["calendars"][0]["events"].values()]
+        self.assertEqual(sorted(names), self.expected)
+
+        data = self._get("api-calendar", self.params, calendar=self.calendar.uid)
+        names = [e["name"] for e in data["calendar"]["events"].values()]
+        self.assertEqual(sorted(names), self.expected)
+
+    def test_invalid_parameters(self):
+        url = reverse(
+            "teamized:api-events", kwargs={"team": self.team.uid, "calendar": self.calendar.uid}
+        )
+        self.assertEqual(self.client.get(url, {"from": "March"}).status_code, 400)
+
+    def test_indexes_are_used(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plan check is only implemented for SQLite")
+
+        # The database combines the lookups of the three kinds of events of q_overlapping
+        # depending on its statistics, but every kind must be served by an index.
+        tz = timezone.get_current_timezone()
+        time_from = datetime(2024, 3, 1, tzinfo=tz)
+        time_to = datetime(2024, 4, 1, tzinfo=tz)
+        for lookups, index in [
+            ({"dtstart__lt": time_to, "dtend__gt": time_from}, "teamized_event_cal_dtstart_idx"),
+            ({"dstart__lte": time_to.date(), "dend__gte": time_from.date()}, "teamized_event_cal_dstart_idx"),
+            ({"recurrence__gt": ""}, "teamized_event_cal_recur_idx"),
+        ]:  # fmt: skip
+            queryset = self.calendar.events.filter(**lookups)
+            sql, params = queryset.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                plan = " ".join(str(row) for row in cursor.fetchall())
+            self.assertIn(index, plan)
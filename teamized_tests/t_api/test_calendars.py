@@ -0,0 +1,67 @@
+"""
+Tests for the calendar listing
+"""
+
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from teamized.models import CalendarEvent
+from teamized_tests.t_api.fixtures import create_user
+
+
+class CalendarListTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("calendars")
+        cls.team = cls.user.create_team("Team", "")
+
+    def setUp(self):
+        self.client.force_login(self.user.auth_user)
+        self.url = reverse("teamized:api-calendars", kwargs={"team": self.team.uid})
+
+    def _add_calendar(self, events: int = 3):
+        calendar = self.team.calendars.create(name="Calendar")
+        now = timezone.now()
+        for i in range(events):
+            CalendarEvent.objects.create(
+                calendar=calendar,
+                name=f"Event {i}",
+                dtstart=now + timedelta(days=i),
+                dtend=now + timedelta(days=i, hours=1),
+            )
+        return calendar
+
+    def _count_queries(self, params=None) -> int:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, params or {})
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(ctx.captured_queries)
+
+    def test_constant_queries(self):
+        self._add_calendar()
+        self._count_queries()  # Warm up the caches
+        queries = self._count_queries()
+        for _ in range(5):
+            self._add_calendar()
+        self.assertEqual(self._count_queries(), queries)
+        self.assertEqual(self._count_queries({"include_events": "false"}), queries - 1)
+
+    def test_include_events(self):
+        calendar = self._add_calendar()
+
+        data = self.client.get(self.url).json()["calendars"][0]
+        self.assertEqual(len(data["events"]), 3)
+        self.assertEqual(
+            data["ics_url"],
+            "http://testserver"
+            + reverse("teamized:calendar_ics", kwargs={"ics_uuid": calendar.ics_uid}),
+        )
+
+        data = self.client.get(self.url, {"include_events": "false"}).json()["calendars"][0]
+        self.assertNotIn("events", data)
+        self.assertEqual(data["id"], str(calendar.uid))
@@ -0,0 +1,127 @@
+"""
+Tests for the incremental sync endpoint
+"""
+
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from teamized.api.endpoints.sync import encode_cursor
+from teamized.club.models import Club, ClubMember, ClubMemberGroup
+from teamized.models import Tombstone
+from teamized_tests.t_api.fixtures import create_user
+
+
+class ChangesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("changes")
+        cls.team = cls.user.create_team("Team", "")
+        cls.calendar = cls.team.calendars.create(name="Calendar")
+        cls.todolist = cls.team.todolists.create(name="List")
+        cls.club = Club.objects.create(name="Club", slug="changes")
+        cls.team.linked_club = cls.club
+        cls.team.save()
+
+    def setUp(self):
+        self.client.force_login(self.user.auth_user)
+        self.url = reverse("teamized:api-changes", kwargs={"team": self.team.uid})
+
+    def _get(self, since: str | None = None, status: int = 200) -> dict:
+        response = self.client.get(self.url, {"since": since} if since else {})
+        self.assertEqual(response.status_code, status, response.content)
+        return response.json()
+
+    def _sync_later(self) -> str:
+        """Move the clock past the cursor overlap and get a cursor (excluding older changes)"""
+
+        later = timezone.now() + timedelta(minutes=1)
+        patcher = mock.patch("django.utils.timezone.now", return_value=later)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return self._get()["cursor"]
+
+    def test_full_sync(self):
+        self.todolist.items.create(name="Item")
+        ClubMember.objects.create(club=self.club, first_name="A", last_name="B", email="a@b.ch")
+
+        data = self._get()
+        self.assertEqual(data["team_id"], str(self.team.uid))
+        self.assertEqual([c["name"] for c in data["changes"]["calendars"]], ["Calendar"])
+        self.assertEqual(
+            data["changes"]["todolistitems"][0]["_todolist_id"], str(self.todolist.uid)
+        )
+        self.assertEqual(len(data["changes"]["club_members"]), 1)
+        self.assertEqual(data["deleted"]["todolistitems"], [])
+
+    def test_changes_since(self):
+        item = self.todolist.items.create(name="Item")
+        cursor = self._sync_later()
+
+        data = self._get(cursor)
+        self.assertTrue(all(objects == [] for objects in data["changes"].values()))
+
+        item.name = "Renamed"
+        item.save()
+        event = self.calendar.events.create(name="Event", dstart="2026-01-01", dend="2026-01-01")
+        data = self._get(cursor)
+        self.assertEqual([i["name"] for i in data["changes"]["todolistitems"]], ["Renamed"])
+        self.assertEqual(data["changes"]["events"][0]["_calendar_id"], str(self.calendar.uid))
+        self.assertEqual(data["changes"]["calendars"], [])
+
+        event_id = str(event.uid)
+        event.delete()
+        self.assertEqual(self._get(cursor)["deleted"]["events"], [event_id])
+
+    def test_tombstones(self):
+        items = [self.todolist.items.create(name=f"Item {i}") for i in range(2)]
+        other = self.team.todolists.create(name="Other")
+        other.items.create(name="Item")
+        group = ClubMemberGroup.objects.create(club=self.club, name="Group")
+        member = ClubMember.objects.create(club=self.club, first_name="A", last_name="B")
+        other_id = str(other.uid)
+        cursor = self._sync_later()
+
+        self.todolist.items.filter(uid=items[0].uid).delete()
+        other.delete()
+        member.groups.add(group, through_defaults={})
+
+        data = self._get(cursor)
+        self.assertEqual(data["deleted"]["todolistitems"], [str(items[0].uid)])
+        # The items of a deleted list don't leave a tombstone
+        self.assertEqual(data["deleted"]["todolists"], [other_id])
+        self.assertEqual(Tombstone.objects.count(), 2)
+        # The group changes when its members change
+        self.assertEqual(data["changes"]["club_groups"][0]["memberids"], [str(member.uid)])
+
+    def test_purge_tombstones(self):
+        items = [self.todolist.items.create(name=f"Item {i}") for i in range(2)]
+        item_ids = [item.uid for item in items]
+        for item in items:
+            item.delete()
+        Tombstone.objects.filter(object_id=item_ids[0]).update(
+            deleted_at=timezone.now() - timedelta(days=365)
+        )
+
+        # Syncing doesn't delete anything
+        self._get()
+        self.assertEqual(Tombstone.objects.count(), 2)
+
+        out = StringIO()
+        call_command("teamized_purge_tombstones", stdout=out)
+        self.assertIn("Deleted 1 expired tombstones", out.getvalue())
+        self.assertEqual(list(Tombstone.objects.values_list("object_id", flat=True)), item_ids[1:])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self._get("invalid", status=400)["error"], "invalid_cursor")
+
+        expired = encode_cursor(timezone.now() - timedelta(days=365))
+        self.assertEqual(self._get(expired, status=400)["error"], "cursor_expired")
+
+        self.client.force_login(create_user("changes-other").auth_user)
+        self._get(status=403)
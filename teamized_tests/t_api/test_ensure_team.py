@@ -0,0 +1,48 @@
+"""
+Tests for the cached team ownership check in teamized_prep
+"""
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from teamized import enums
+from teamized.models import Member
+from teamized_tests.t_api.fixtures import create_user
+
+
+class EnsureTeamTest(TestCase):
+    def setUp(self):
+        self.user = create_user("ensure")
+        self.client.force_login(self.user.auth_user)
+
+    def _owned_count(self):
+        return self.user.member_instances.filter(role=enums.Roles.OWNER).count()
+
+    def _ownership_queries(self, captured_queries):
+        return [
+            q["sql"]
+            for q in captured_queries
+            if 'FROM "teamized_member"' in q["sql"] and '"teamized_member"."role" =' in q["sql"]
+        ]
+
+    def test_first_login_creates_team(self):
+        self.assertEqual(self._owned_count(), 0)
+        self.assertEqual(self.client.get(reverse("teamized:api-teams")).status_code, 200)
+        self.assertEqual(self._owned_count(), 1)
+
+    def test_established_user_skips_query(self):
+        self.client.get(reverse("teamized:api-settings"))
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("teamized:api-settings"))
+        self.assertEqual(self._ownership_queries(ctx.captured_queries), [])
+
+    def test_deleting_the_owned_team_is_noticed(self):
+        self.client.get(reverse("teamized:api-settings"))
+        Member.objects.get(user=self.user, role=enums.Roles.OWNER).team.delete()
+        self.assertEqual(self._owned_count(), 0)
+
+        self.client.get(reverse("teamized:api-settings"))
+        self.assertEqual(self._owned_count(), 1)
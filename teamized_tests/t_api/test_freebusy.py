@@ -0,0 +1,120 @@
+"""
+Tests for the free/busy endpoint
+"""
+
+from datetime import date, datetime
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from teamized import enums, utils
+from teamized.models import CalendarEvent
+from teamized_tests.t_api.fixtures import create_user
+
+
+class FreeBusyTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("freebusy")
+        cls.team = cls.user.create_team("Team", "")
+        calendar1 = cls.team.calendars.create(name="Calendar 1")
+        calendar2 = cls.team.calendars.create(name="Calendar 2", is_public=False)
+
+        tz = timezone.get_current_timezone()
+        for calendar, start, end in [
+            (calendar1, datetime(2024, 3, 4, 8, 0, tzinfo=tz), datetime(2024, 3, 4, 10, 0, tzinfo=tz)),
+            (calendar2, datetime(2024, 3, 4, 9, 0, tzinfo=tz), datetime(2024, 3, 4, 11, 0, tzinfo=tz)),
+            (calendar1, datetime(2024, 3, 4, 11, 0, tzinfo=tz), datetime(2024, 3, 4, 12, 0, tzinfo=tz)),
+            (calendar2, datetime(2024, 3, 4, 14, 0, tzinfo=tz), datetime(2024, 3, 4, 15, 0, tzinfo=tz)),
+            # Outside of the requested range
+            (calendar1, datetime(2024, 3, 10, 14, 0, tzinfo=tz), datetime(2024, 3, 10, 15, 0, tzinfo=tz)),
+        ]:  # fmt: skip
+            CalendarEvent.objects.create(calendar=calendar, name="Event", dtstart=start, dtend=end)
+        CalendarEvent.objects.create(
+            calendar=calendar1,
+            name="Holiday",
+            fullday=True,
+            dstart=date(2024, 3, 6),
+            dend=date(2024, 3, 6),
+        )
+        training = CalendarEvent(
+            calendar=calendar2,
+            name="Training",
+            dtstart=datetime(2024, 2, 27, 19, 0, tzinfo=tz),
+            dtend=datetime(2024, 2, 27, 20, 0, tzinfo=tz),
+            recurrence=enums.RecurrenceFrequencies.WEEKLY,
+        )
+        training.clean()
+        training.save()
+
+    def setUp(self):
+        self.client.force_login(self.user.auth_user)
+        self.url = reverse("teamized:api-calendars-freebusy", kwargs={"team": self.team.uid})
+
+    def test_freebusy(self):
+        response = self.client.get(
+            self.url,
+            # Monday to Saturday (UTC+1)
+            {"from": "2024-03-03T23:00:00.000000+0000", "to": "2024-03-08T23:00:00.000000+0000"},
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            response.json()["busy"],
+            [
+                ["2024-03-04T07:00:00+00:00", "2024-03-04T11:00:00+00:00"],
+                ["2024-03-04T13:00:00+00:00", "2024-03-04T14:00:00+00:00"],
+                ["2024-03-05T18:00:00+00:00", "2024-03-05T19:00:00+00:00"],
+                ["2024-03-05T23:00:00+00:00", "2024-03-06T23:00:00+00:00"],
+            ],
+        )
+
+    def test_active_timezone(self):
+        params = {
+            "from": "2024-03-05T12:00:00.000000+0000",
+            "to": "2024-03-07T12:00:00.000000+0000",
+        }
+        expected = self.client.get(self.url, params).json()["busy"]
+        self.assertIn(["2024-03-05T23:00:00+00:00", "2024-03-06T23:00:00+00:00"], expected)
+
+        # The full-day events don't depend on the timezone of the request
+        with timezone.override("America/New_York"):
+            self.assertEqual(self.client.get(self.url, params).json()["busy"], expected)
+
+    def test_clipped_to_range(self):
+        response = self.client.get(
+            self.url,
+            {"from": "2024-03-04T08:00:00.000000+0000", "to": "2024-03-04T09:00:00.000000+0000"},
+        )
+        self.assertEqual(
+            response.json()["busy"], [["2024-03-04T08:00:00+00:00", "2024-03-04T09:00:00+00:00"]]
+        )
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(
+            self.client.get(
+                self.url,
+                {
+                    "from": "2024-03-04T00:00:00.000000+0000",
+                    "to": "2024-03-01T00:00:00.000000+0000",
+                },
+            ).status_code,
+            400,
+        )
+        self.assertEqual(
+            self.client.get(
+                self.url,
+                {
+                    "from": "2020-01-01T00:00:00.000000+0000",
+                    "to": "2024-01-01T00:00:00.000000+0000",
+                },
+            ).status_code,
+            400,
+        )
+
+    def test_merge_intervals(self):
+        self.assertEqual(
+            utils.merge_intervals([(5, 6), (1, 3), (2, 4), (4, 5), (8, 9), (8, 8)]),
+            [(1, 6), (8, 9)],
+        )
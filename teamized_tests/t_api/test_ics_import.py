@@ -0,0 +1,186 @@
+"""
+Tests for importing ics files into a calendar
+"""
+
+from datetime import date, datetime, timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from teamized import enums, ics
+from teamized_tests.t_api.fixtures import create_user
+
+ICS_FILE = "\r\n".join(
+    [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "BEGIN:VEVENT",
+        "UID:timed@example.com",
+        "SUMMARY:Meeting\\, important",
+        "DESCRIPTION:First line\\nSecond line that is folded over",
+        "  two lines",
+        "DTSTART;TZID=Europe/Zurich:20240304T100000",
+        "DTEND;TZID=Europe/Zurich:20240304T113000",
+        "BEGIN:VALARM",
+        "ACTION:DISPLAY",
+        "DESCRIPTION:Reminder",
+        "END:VALARM",
+        "END:VEVENT",
+        "BEGIN:VEVENT",
+        "UID:holiday@example.com",
+        "SUMMARY:Holiday",
+        "DTSTART;VALUE=DATE:20240311",
+        "DTEND;VALUE=DATE:20240313",
+        "END:VEVENT",
+        "BEGIN:VEVENT",
+        "UID:training@example.com",
+        "SUMMARY:Training",
+        "LOCATION:Gym",
+        "DTSTART:20240305T180000Z",
+        "DTEND:20240305T193000Z",
+        "RRULE:FREQ=WEEKLY;INTERVAL=1;UNTIL=20240625T170000Z",
+        "EXDATE:20240402T170000Z",
+        "END:VEVENT",
+        "BEGIN:VEVENT",
+        "UID:unsupported@example.com",
+        "SUMMARY:Every Monday and Friday",
+        "DTSTART:20240304T180000Z",
+        "RRULE:FREQ=WEEKLY;BYDAY=MO,FR",
+        "END:VEVENT",
+        "BEGIN:VEVENT",
+        "UID:invalid@example.com",
+        "SUMMARY:No start",
+        "END:VEVENT",
+        "END:VCALENDAR",
+    ]
+)
+
+
+class IcsImportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("import")
+        cls.team = cls.user.create_team("Team", "")
+
+    def setUp(self):
+        self.calendar = self.team.calendars.create(name="Calendar")
+        self.client.force_login(self.user.auth_user)
+        self.url = reverse(
+            "teamized:api-events-import",
+            kwargs={"team": self.team.uid, "calendar": self.calendar.uid},
+        )
+
+    def _import(self, content: str):
+        upload = SimpleUploadedFile("calendar.ics", content.encode(), "text/calendar")
+        response = self.client.post(self.url, {"file": upload})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_import(self):
+        data = self._import(ICS_FILE)
+        self.assertEqual(data["created"], 3)
+        self.assertEqual(
+            [(e["index"], e["uid"]) for e in data["errors"]],
+            [(3, "unsupported@example.com"), (4, "invalid@example.com")],
+        )
+
+        tz = timezone.get_current_timezone()
+        meeting = self.calendar.events.get(name="Meeting, important")
+        self.assertEqual(
+            meeting.description, "First line\nSecond line that is folded over two lines"
+        )
+        self.assertEqual(meeting.dtstart, datetime(2024, 3, 4, 10, 0, tzinfo=tz))
+        self.assertEqual(meeting.dtend, datetime(2024, 3, 4, 11, 30, tzinfo=tz))
+
+        holiday = self.calendar.events.get(name="Holiday")
+        self.assertTrue(holiday.fullday)
+        self.assertEqual((holiday.dstart, holiday.dend), (date(2024, 3, 11), date(2024, 3, 12)))
+
+        training = self.calendar.events.get(name="Training")
+        self.assertEqual(training.location, "Gym")
+        self.assertEqual(training.recurrence, enums.RecurrenceFrequencies.WEEKLY)
+        self.assertEqual(training.recurrence_until, date(2024, 6, 25))
+        self.assertEqual(training.recurrence_exceptions, ["2024-04-02"])
+        self.assertEqual(training.recurrence_end, date(2024, 6, 25))
+
+    def test_round_trip(self):
+        self._import(ICS_FILE)
+        exported = self.calendar.as_ics_text()
+
+        other = self.team.calendars.create(name="Other")
+        self.url = reverse(
+            "teamized:api-events-import", kwargs={"team": self.team.uid, "calendar": other.uid}
+        )
+        data = self._import(exported)
+        self.assertEqual((data["created"], data["errors"]), (3, []))
+        self.assertEqual(
+            sorted(other.events.values_list("name", "dtstart", "dstart", "recurrence_until")),
+            sorted(
+                self.calendar.events.values_list("name", "dtstart", "dstart", "recurrence_until")
+            ),
+        )
+
+    def test_batches(self):
+        start = datetime(2024, 1, 1, 8, 0, tzinfo=timezone.get_current_timezone())
+        lines = ["BEGIN:VCALENDAR"]
+        for i in range(2500):
+            lines += [
+                "BEGIN:VEVENT",
+                f"SUMMARY:Event {i}",
+                "DTSTART:" + (start + timedelta(hours=i)).strftime("%Y%m%dT%H%M%SZ"),
+                "DTEND:" + (start + timedelta(hours=i, minutes=30)).strftime("%Y%m%dT%H%M%SZ"),
+                "END:VEVENT",
+            ]
+        lines.append("END:VCALENDAR")
+
+        with CaptureQueriesContext(connection) as ctx:
+            data = self._import("\r\n".join(lines))
+        self.assertEqual(data["created"], 2500)
+        # The database may split a batch further (SQLite limits the number of parameters)
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+        self.assertLess(len(inserts), 100)
+
+    def test_duration(self):
+        lines = ["BEGIN:VCALENDAR"]
+        for name, start, duration in [
+            ("Call", "DTSTART:20240304T100000Z", "PT1H30M"),
+            # A day always ends at the same local time (daylight saving time starts on March 31st)
+            ("Night", "DTSTART;TZID=Europe/Zurich:20240330T220000", "P1DT1H"),
+            ("Camp", "DTSTART;VALUE=DATE:20240311", "P1W"),
+            ("Broken", "DTSTART:20240304T100000Z", "-PT1H"),
+        ]:
+            lines += [
+                "BEGIN:VEVENT",
+                "SUMMARY:" + name,
+                start,
+                "DURATION:" + duration,
+                "END:VEVENT",
+            ]
+        lines.append("END:VCALENDAR")
+
+        data = self._import("\r\n".join(lines))
+        self.assertEqual(data["created"], 3)
+        self.assertEqual([e["index"] for e in data["errors"]], [3])
+
+        tz = timezone.get_current_timezone()
+        call = self.calendar.events.get(name="Call")
+        self.assertEqual(call.dtend - call.dtstart, timedelta(hours=1, minutes=30))
+        night = self.calendar.events.get(name="Night")
+        self.assertEqual(
+            timezone.localtime(night.dtend, tz), datetime(2024, 3, 31, 23, 0, tzinfo=tz)
+        )
+        camp = self.calendar.events.get(name="Camp")
+        self.assertEqual((camp.dstart, camp.dend), (date(2024, 3, 11), date(2024, 3, 17)))
+
+    def test_missing_file(self):
+        self.assertEqual(self.client.post(self.url).status_code, 400)
+
+    def test_parse_line(self):
+        prop = ics.parse_line('ATTENDEE;CN="Doe: John";ROLE=CHAIR:mailto:john@example.com')
+        self.assertEqual(prop.name, "ATTENDEE")
+        self.assertEqual(prop.params, {"CN": "Doe: John", "ROLE": "CHAIR"})
+        self.assertEqual(prop.value, "mailto:john@example.com")
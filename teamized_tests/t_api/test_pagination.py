@@ -0,0 +1,93 @@
+"""
+Tests for the keyset pagination of work sessions
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from teamized.models import WorkSession
+from teamized_tests.t_api.fixtures import create_user
+
+
+class WorkSessionPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("pagination")
+        cls.team = cls.user.create_team("Team", "")
+        member = cls.team.get_member(cls.user)
+
+        base = datetime(2024, 1, 1, 8, 0, tzinfo=dt_timezone.utc)
+        sessions = []
+        for i in range(25):
+            # Every two sessions share the same start time (to test the tie breaker)
+            start = base + timedelta(days=i // 2)
+            sessions.append(
+                WorkSession(
+                    user=cls.user,
+                    member=member,
+                    team=cls.team,
+                    time_start=start,
+                    time_end=start + timedelta(hours=1),
+                    is_ended=True,
+                )
+            )
+        WorkSession.objects.bulk_create(sessions)
+
+    def setUp(self):
+        self.client.force_login(self.user.auth_user)
+        self.url = reverse("teamized:api-workingtime-worksessions", kwargs={"team": self.team.uid})
+
+    def _get(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_without_page_size_everything_is_returned(self):
+        data = self._get()
+        self.assertEqual(len(data["worksessions"]), 25)
+        self.assertIsNone(data["next"])
+
+    def test_pages(self):
+        everything = [s["id"] for s in self._get()["worksessions"]]
+
+        ids, cursor, pages = [], None, 0
+        while True:
+            params = {"page_size": 10}
+            if cursor:
+                params["cursor"] = cursor
+            data = self._get(**params)
+            ids += [s["id"] for s in data["worksessions"]]
+            pages += 1
+            cursor = data["next"]
+            if cursor is None:
+                break
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, everything)
+
+    def test_range_filter(self):
+        data = self._get(
+            **{"from": "2024-01-03T00:00:00.000000+0000", "to": "2024-01-05T00:00:00.000000+0000"}
+        )
+        self.assertEqual(len(data["worksessions"]), 4)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.url, {"cursor": "invalid"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"page_size": 100000}).status_code, 400)
+
+    def test_index_is_used(self):
+        member = self.team.get_member(self.user)
+        queryset = member.work_sessions.filter(is_ended=True).order_by("-time_start", "-pk")
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plan check is only implemented for SQLite")
+
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            # Without statistics, SQLite can't tell the indexes on the member apart
+            cursor.execute("ANALYZE")
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        self.assertIn("teamized_ws_member_start_idx", plan)
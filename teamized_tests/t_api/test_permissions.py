@@ -0,0 +1,160 @@
+"""
+Tests for the request-scoped permission context
+"""
+
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from teamized.permissions import PermissionContext
+from teamized_tests.t_api.fixtures import create_team_fixture, count_membership_queries
+
+
+class PermissionContextTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = create_team_fixture()
+
+    def setUp(self):
+        self.client.force_login(self.data["owner"].auth_user)
+
+    def test_role_checks_are_cached(self):
+        perms = PermissionContext(self.data["owner"])
+        team = self.data["team"]
+
+        with self.assertNumQueries(1):
+            self.assertTrue(perms.is_member(team))
+            self.assertTrue(perms.is_admin(team))
+            self.assertTrue(perms.is_owner(team))
+            self.assertEqual(perms.get_member(team), self.data["member"])
+
+        other_perms = PermissionContext(self.data["other"])
+        with self.assertNumQueries(1):
+            self.assertTrue(other_perms.is_member(team))
+            self.assertFalse(other_perms.is_admin(team))
+            self.assertFalse(other_perms.is_owner(team))
+
+    def test_remember(self):
+        perms = PermissionContext(self.data["other"])
+        team = self.data["team"]
+        self.assertTrue(perms.is_member(team))
+
+        # e.g. after leaving the team
+        with self.assertNumQueries(0):
+            perms.remember(team, None)
+            self.assertFalse(perms.is_member(team))
+
+    def test_non_member(self):
+        perms = PermissionContext(self.data["other"])
+        other_team = self.data["other"].create_team("Other", "Other team")
+        self.data["other"].member_instances.filter(team=other_team).delete()
+
+        self.assertIsNone(perms.get_member(other_team))
+        self.assertFalse(perms.is_member(other_team))
+        self.assertFalse(perms.is_admin(other_team))
+
+    def _get_cases(self):
+        d = self.data
+        team = {"team": d["team"].uid}
+        return [
+            ("get", "api-team", team, {}),
+            ("post", "api-team", team, {"name": "Renamed"}),
+            ("get", "api-members", team, {}),
+            ("post", "api-member", {**team, "member": d["other_member"].uid}, {}),
+            ("delete", "api-member", {**team, "member": d["other_member"].uid}, {}),
+            ("get", "api-invites", team, {}),
+            ("post", "api-invite", {**team, "invite": d["invite"].uid}, {"note": "Note"}),
+            ("post", "api-team-leave", team, {}),
+            ("get", "api-workingtime-worksessions", team, {}),
+            ("post", "api-workingtime-tracking-start", team, {}),
+            ("get", "api-calendars", team, {}),
+            ("get", "api-calendar", {**team, "calendar": d["calendar"].uid}, {}),
+            ("delete", "api-calendar", {**team, "calendar": d["calendar"].uid}, {}),
+            ("get", "api-events", {**team, "calendar": d["calendar"].uid}, {}),
+            (
+                "get",
+                "api-event",
+                {**team, "calendar": d["calendar"].uid, "event": d["event"].uid},
+                {},
+            ),
+            (
+                "post",
+                "api-event-move",
+                {
+                    **team,
+                    "calendar": d["calendar"].uid,
+                    "event": d["event"].uid,
+                    "toCalendar": d["calendar2"].uid,
+                },
+                {},
+            ),
+            ("get", "api-todolists", team, {}),
+            ("get", "api-todolist", {**team, "todolist": d["todolist"].uid}, {}),
+            ("get", "api-todolistitems", {**team, "todolist": d["todolist"].uid}, {}),
+            (
+                "post",
+                "api-todolistitem",
+                {**team, "todolist": d["todolist"].uid, "item": d["item"].uid},
+                {"done": "true"},
+            ),
+            ("post", "api-create-club", team, {}),
+            ("get", "api-club", team, {}),
+            ("get", "api-club-members", team, {}),
+            ("post", "api-club-member", {**team, "member": d["club_member"].uid}, {}),
+            ("get", "api-club-member-portfolio", {**team, "member": d["club_member"].uid}, {}),
+            (
+                "post",
+                "api-club-member-create-magic-link",
+                {**team, "member": d["club_member"].uid},
+                {},
+            ),
+            (
+                "post",
+                "api-club-member-group-membership",
+                {**team, "member": d["club_member"].uid, "group": d["group"].uid},
+                {},
+            ),
+            ("get", "api-club-groups", team, {}),
+            ("post", "api-club-group", {**team, "group": d["group"].uid}, {}),
+            ("get", "api-club-attendance-events", team, {}),
+            (
+                "post",
+                "api-club-attendance-event",
+                {**team, "attendance_event": d["attendance_event"].uid},
+                {},
+            ),
+            (
+                "get",
+                "api-club-attendance-event-participations",
+                {**team, "attendance_event": d["attendance_event"].uid},
+                {},
+            ),
+            (
+                "post",
+                "api-club-attendance-event-participation",
+                {
+                    **team,
+                    "attendance_event": d["attendance_event"].uid,
+                    "participation": d["participation"].uid,
+                },
+                {},
+            ),
+        ]
+
+    def test_one_membership_query_per_endpoint(self):
+        for method, name, kwargs, data in self._get_cases():
+            with self.subTest(method=method, name=name):
+                sid = transaction.savepoint()
+                url = reverse(f"teamized:{name}", kwargs=kwargs)
+                with CaptureQueriesContext(connection) as ctx:
+                    if method == "get":
+                        response = self.client.get(url)
+                    elif method == "post":
+                        response = self.client.post(url, data)
+                    else:
+                        response = self.client.delete(url)
+                transaction.savepoint_rollback(sid)
+
+                self.assertNotEqual(response.status_code, 403, response.content)
+                self.assertEqual(count_membership_queries(ctx.captured_queries), 1)
@@ -0,0 +1,215 @@
+"""
+Query budgets for every API route
+
+Every route in teamized/api/urls.py is requested with a populated team and must not execute
+more SQL queries than its budget. A new route without a budget makes the test fail.
+The requests have to succeed, so that the budgets cover the actual work of the routes.
+"""
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from teamized.api.urls import urlpatterns
+from teamized.api.utils.constants import METHOD_NOT_ALLOWED
+from teamized.models import Team, User, WorkSession
+from teamized_tests.t_api.fixtures import create_seeded_fixture, create_user
+
+ICS_FILE = "\r\n".join(
+    [
+        "BEGIN:VCALENDAR",
+        "BEGIN:VEVENT",
+        "SUMMARY:Imported",
+        "DTSTART:20240304T100000Z",
+        "DTEND:20240304T110000Z",
+        "END:VEVENT",
+        "END:VCALENDAR",
+    ]
+)
+
+# Route name -> (method, data, maximum number of queries)
+# The data may be a function of the fixture (for ids and files).
+# The budgets include the queries for the session and the user (2 per request).
+# Routes with N+1 queries (club groups) exceed the usual budget.
+BUDGETS = {
+    "api-profile": ("get", {}, 4),
+    "api-settings": ("get", {}, 3),
+    "api-messages": ("get", {}, 3),
+    "api-bootstrap": ("get", {"include_team_data": "true"}, 8),
+    "api-batch": ("post", {"requests": '[{"path": "profile"}, {"path": "settings"}]'}, 5),
+    "api-teams": ("get", {}, 4),
+    "api-team": ("get", {}, 8),
+    "api-changes": ("get", {}, 15),
+    "api-members": ("get", {}, 6),
+    "api-member": ("post", {"role": "admin"}, 8),
+    "api-invites": ("get", {}, 6),
+    "api-invite": ("post", {"note": "Note"}, 6),
+    "api-team-leave": ("post", {}, 7),
+    "api-invite-info": ("get", {}, 8),
+    "api-invite-accept": ("post", {}, 13),
+    "api-workingtime-worksessions": ("get", {}, 6),
+    "api-workingtime-worksessions-stats": ("get", {"start": "2020-01-01", "interval": "week"}, 6),
+    "api-workingtime-worksession": ("get", {}, 4),
+    "api-workingtime-tracking-start": ("post", {}, 7),
+    "api-workingtime-tracking-live": ("get", {}, 5),
+    "api-workingtime-tracking-stop": ("post", {}, 6),
+    "api-calendars": ("get", {}, 7),
+    "api-events-import": (
+        "post",
+        lambda d: {"file": SimpleUploadedFile("calendar.ics", ICS_FILE.encode())},
+        7,
+    ),
+    "api-calendars-freebusy": (
+        "get",
+        {"from": "2000-01-01T00:00:00.000000+0000", "to": "2001-01-01T00:00:00.000000+0000"},
+        6,
+    ),
+    "api-calendar": ("get", {}, 6),
+    "api-events": ("get", {}, 6),
+    "api-event": ("get", {}, 5),
+    "api-event-move": ("post", {}, 8),
+    "api-todolists": ("get", {}, 7),
+    "api-todolist": ("get", {}, 9),
+    "api-todolistitems": ("get", {}, 9),
+    "api-todolistitems-bulk": (
+        "post",
+        lambda d: {"action": "done", "item_ids[]": [d["item"].pk]},
+        9,
+    ),
+    "api-todolistitem": ("get", {}, 6),
+    "api-create-club": ("post", {"name": "Club", "slug": "budget-club"}, 8),
+    "api-club": ("get", {}, 7),
+    "api-club-members": ("get", {}, 7),
+    "api-club-member": ("post", {"first_name": "Renamed"}, 7),
+    "api-club-member-portfolio": ("get", {}, 6),
+    "api-club-member-create-magic-link": ("post", {}, 7),
+    "api-club-member-group-membership": ("post", {}, 11),
+    "api-club-groups": ("get", {}, 12),
+    "api-club-group": ("post", {"name": "Renamed"}, 9),
+    "api-club-attendance-events": ("get", {}, 7),
+    "api-club-attendance-event": ("post", {"title": "Renamed"}, 7),
+    "api-club-attendance-event-participations": ("get", {}, 6),
+    "api-club-attendance-event-participation-bulk-create": (
+        "post",
+        lambda d: {"member_ids[]": [m.pk for m in d["club"].members.order_by("pk")[:3]]},
+        9,
+    ),
+    "api-club-attendance-event-participation": ("post", {"has_attended": "true"}, 7),
+    "api-not-found": ("get", {}, 0),
+}
+
+
+class QueryBudgetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = create_seeded_fixture()
+        cls.guest = create_user("budget-guest")
+        # Don't measure the creation of the personal teams on the first request
+        cls.guest.ensure_team()
+        cls.data["other_member"].user.ensure_team()
+
+    def setUp(self):
+        self.client.force_login(self.data["owner"].auth_user)
+
+    def _get_url(self, pattern) -> str:
+        d = self.data
+        objects = {
+            "team": d["team"],
+            "member": d["other_member"],
+            "invite": d["invite"],
+            "session": d["worksession"],
+            "calendar": d["calendar"],
+            "event": d["event"],
+            "toCalendar": d["calendar2"],
+            "todolist": d["todolist"],
+            "item": d["item"],
+            "group": d["group"],
+            "attendance_event": d["attendance_event"],
+            "participation": d["participation"],
+        }
+        if pattern.name.startswith("api-club-member"):
+            objects["member"] = d["club_member"]
+        if pattern.name == "api-not-found":
+            return reverse("teamized:api-profile") + "-does-not-exist"
+
+        kwargs = {key: objects[key].pk for key in pattern.pattern.converters}
+        if pattern.name in ("api-invite-info", "api-invite-accept"):
+            kwargs["invite"] = d["invite"].token
+        return reverse(f"teamized:{pattern.name}", kwargs=kwargs)
+
+    def _prepare(self, name: str) -> None:
+        """Bring the data into a state in which the request succeeds (rolled back afterwards)"""
+
+        d = self.data
+        user: User = d["owner"]
+        if name in ("api-invite-info", "api-invite-accept"):
+            user = self.guest
+        elif name == "api-team-leave":
+            user = d["other_member"].user
+        elif name in ("api-workingtime-tracking-live", "api-workingtime-tracking-stop"):
+            WorkSession.objects.create(
+                team=d["team"],
+                member=d["member"],
+                user=d["owner"],
+                time_start=timezone.now(),
+                is_created_via_tracking=True,
+            )
+        elif name == "api-club-attendance-event-participation-bulk-create":
+            d["attendance_event"].participations.filter(
+                member__in=d["club"].members.order_by("pk")[:3]
+            ).delete()
+        elif name == "api-create-club":
+            Team.objects.filter(pk=d["team"].pk).update(linked_club=None)
+
+        self.client.force_login(user.auth_user)
+        # The cache isn't rolled back with the data, so warm it up for every request
+        user.ensure_team()
+
+    def _request(self, method, url, data):
+        if method == "get":
+            return self.client.get(url, data)
+        return self.client.post(url, data)
+
+    def test_every_route_has_a_budget(self):
+        self.assertEqual({pattern.name for pattern in urlpatterns}, set(BUDGETS))
+
+    def test_query_budgets(self):
+        for pattern in urlpatterns:
+            method, data, budget = BUDGETS[pattern.name]
+            with self.subTest(route=pattern.name):
+                url = self._get_url(pattern)
+                if callable(data):
+                    data = data(self.data)
+
+                sid = transaction.savepoint()
+                self._prepare(pattern.name)
+                with CaptureQueriesContext(connection) as ctx:
+                    response = self._request(method, url, data)
+                transaction.savepoint_rollback(sid)
+
+                expected_status = 404 if pattern.name == "api-not-found" else 200
+                self.assertEqual(response.status_code, expected_status, response.content)
+                queries = [
+                    q["sql"] for q in ctx.captured_queries if not q["sql"].startswith("SAVEPOINT")
+                ]
+                self.assertLessEqual(len(queries), budget, "\n".join(queries))
+
+    @override_settings(TEAMIZED_API_INSTRUMENTATION=True)
+    def test_server_timing_header(self):
+        response = self.client.get(reverse("teamized:api-profile"))
+        self.assertIn("Server-Timing", response)
+        self.assertIn("queries", response["Server-Timing"])
+
+        # Shared responses must not be modified
+        response = self.client.get(reverse("teamized:api-workingtime-tracking-stop"))
+        self.assertEqual(response.status_code, 405)
+        self.assertIn("Server-Timing", response)
+        self.assertNotIn("Server-Timing", METHOD_NOT_ALLOWED)
+
+    @override_settings(TEAMIZED_API_INSTRUMENTATION=False)
+    def test_server_timing_header_disabled(self):
+        response = self.client.get(reverse("teamized:api-profile"))
+        self.assertNotIn("Server-Timing", response)
@@ -0,0 +1,239 @@
+"""
+Tests for recurring calendar events
+"""
+
+from datetime import date, datetime, timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from teamized import enums, exceptions
+from teamized.models import CalendarEvent
+from teamized_tests.t_api.fixtures import create_user
+
+
+class RecurrenceTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("recurrence")
+        cls.team = cls.user.create_team("Team", "")
+        cls.calendar = cls.team.calendars.create(name="Calendar")
+        cls.tz = timezone.get_current_timezone()
+
+    def _create(self, **kwargs) -> CalendarEvent:
+        event = CalendarEvent(calendar=self.calendar, name="Training", **kwargs)
+        event.clean()
+        event.save()
+        return event
+
+    def _create_weekly_training(self, **kwargs) -> CalendarEvent:
+        return self._create(
+            dtstart=datetime(2024, 3, 19, 19, 0, tzinfo=self.tz),  # Tuesday
+            dtend=datetime(2024, 3, 19, 21, 0, tzinfo=self.tz),
+            recurrence=enums.RecurrenceFrequencies.WEEKLY,
+            **kwargs,
+        )
+
+    def test_weekly_keeps_local_time(self):
+        event = self._create_weekly_training(recurrence_count=3)
+        occurrences = event.get_occurrences()
+
+        # Daylight saving time starts on March 31st
+        self.assertEqual(
+            [timezone.localtime(start, self.tz).strftime("%Y-%m-%d %H:%M") for start, _ in occurrences],
+            ["2024-03-19 19:00", "2024-03-26 19:00", "2024-04-02 19:00"],
+        )  # fmt: skip
+        self.assertTrue(all((end - start).seconds == 7200 for start, end in occurrences))
+        self.assertEqual(event.recurrence_end, date(2024, 4, 2))
+
+    def test_window_and_exceptions(self):
+        event = self._create_weekly_training(
+            recurrence_interval=2, recurrence_exceptions=["2024-04-30"]
+        )
+        self.assertIsNone(event.recurrence_end)
+
+        occurrences = event.get_occurrences(
+            datetime(2024, 4, 1, tzinfo=self.tz), datetime(2024, 6, 1, tzinfo=self.tz)
+        )
+        self.assertEqual(
+            [start.date() for start, _ in occurrences],
+            [date(2024, 4, 2), date(2024, 4, 16), date(2024, 5, 14), date(2024, 5, 28)],
+        )
+
+    def test_count_includes_exceptions(self):
+        event = self._create(
+            fullday=True,
+            dstart=date(2024, 1, 1),
+            dend=date(2024, 1, 2),
+            recurrence=enums.RecurrenceFrequencies.DAILY,
+            recurrence_count=3,
+            recurrence_exceptions=["2024-01-02"],
+        )
+        self.assertEqual(
+            event.get_occurrences(),
+            [(date(2024, 1, 1), date(2024, 1, 2)), (date(2024, 1, 3), date(2024, 1, 4))],
+        )
+        self.assertEqual(event.recurrence_end, date(2024, 1, 4))
+
+    def test_monthly_skips_short_months(self):
+        event = self._create(
+            fullday=True,
+            dstart=date(2024, 1, 31),
+            dend=date(2024, 1, 31),
+            recurrence=enums.RecurrenceFrequencies.MONTHLY,
+            recurrence_until=date(2024, 6, 30),
+        )
+        self.assertEqual(
+            [start for start, _ in event.get_occurrences()],
+            [date(2024, 1, 31), date(2024, 3, 31), date(2024, 5, 31)],
+        )
+
+    def test_old_series_starts_at_the_window(self):
+        window = (datetime(2026, 3, 1, tzinfo=self.tz), datetime(2026, 4, 1, tzinfo=self.tz))
+        cases = [
+            (enums.RecurrenceFrequencies.DAILY, 3, date(1990, 1, 1)),
+            (enums.RecurrenceFrequencies.WEEKLY, 2, date(1990, 1, 2)),
+            (enums.RecurrenceFrequencies.MONTHLY, 1, date(1990, 1, 31)),
+        ]
+        for frequency, interval, dstart in cases:
+            with self.subTest(frequency=frequency):
+                event = self._create(
+                    fullday=True,
+                    dstart=dstart,
+                    dend=dstart + timedelta(days=1),
+                    recurrence=frequency,
+                    recurrence_interval=interval,
+                )
+                # Compared to the occurrences found by iterating over the whole series
+                expected = []
+                for day in event.iter_occurrence_dates():
+                    if day > date(2026, 3, 31):
+                        break
+                    if day >= date(2026, 2, 28):
+                        expected.append((day, day + timedelta(days=1)))
+                self.assertEqual(event.get_occurrences(*window), expected)
+
+                first = next(event.iter_occurrence_dates(date(2026, 2, 28)))
+                self.assertGreater(first, date(2026, 1, 1))
+
+    def test_invalid_recurrence(self):
+        with self.assertRaises(exceptions.ValidationError):
+            self._create_weekly_training(recurrence_count=3, recurrence_until=date(2024, 5, 1))
+        with self.assertRaises(exceptions.ValidationError):
+            self._create_weekly_training(recurrence_until=date(2024, 3, 1))
+
+    def test_far_future(self):
+        event = self._create_weekly_training(recurrence_interval=1000)
+        # The series ends at the last representable date instead of overflowing
+        days = list(event.iter_occurrence_dates())
+        self.assertEqual(len(days), 417)
+        self.assertLess(days[-1], date.max)
+        self.assertEqual(len(event.get_occurrences(datetime(2024, 1, 1, tzinfo=self.tz))), 1)
+        far = event.get_occurrences(time_to=datetime(9999, 12, 31, tzinfo=self.tz))
+        self.assertEqual([start.date() for start, _ in far], days)
+
+        with self.assertRaises(exceptions.ValidationError):
+            self._create(
+                fullday=True,
+                dstart=date(2024, 1, 1),
+                dend=date(2024, 1, 1),
+                recurrence=enums.RecurrenceFrequencies.MONTHLY,
+                recurrence_interval=1000,
+                recurrence_count=200,
+            )
+        with self.assertRaises(exceptions.ValidationError):
+            self._create_weekly_training(recurrence_interval=1001)
+
+        event = self._create_weekly_training(recurrence_until=date.max)
+        self.assertEqual(event.recurrence_end, date.max - timedelta(days=1))
+        self.assertIn("RRULE:FREQ=WEEKLY;INTERVAL=1;UNTIL=99991230T180000Z", event.as_ics_lines())
+
+    def test_ics_lines(self):
+        event = self._create_weekly_training(
+            recurrence_until=date(2024, 6, 25), recurrence_exceptions=["2024-04-30"]
+        )
+        lines = event.as_ics_lines()
+        self.assertIn("DTSTART;TZID=Europe/Zurich:20240319T190000", lines)
+        self.assertIn("DTEND;TZID=Europe/Zurich:20240319T210000", lines)
+        # 19:00 in summer time is 17:00 UTC
+        self.assertIn("RRULE:FREQ=WEEKLY;INTERVAL=1;UNTIL=20240625T170000Z", lines)
+        self.assertIn("EXDATE;TZID=Europe/Zurich:20240430T190000", lines)
+
+        # Every TZID needs a matching VTIMEZONE
+        text = self.calendar.as_ics_text()
+        self.assertIn("BEGIN:VTIMEZONE\r\nTZID:Europe/Zurich\r\n", text)
+        self.assertIn("RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=-1SU", text)
+        self.assertIn("TZOFFSETFROM:+0200\r\nTZOFFSETTO:+0100", text)
+
+    def test_api(self):
+        self.client.force_login(self.user.auth_user)
+        url = reverse(
+            "teamized:api-events", kwargs={"team": self.team.uid, "calendar": self.calendar.uid}
+        )
+        response = self.client.post(
+            url,
+            {
+                "name": "Training",
+                "fullday": "false",
+                "dtstart": "2024-03-19T18:00:00.000000+0000",
+                "dtend": "2024-03-19T20:00:00.000000+0000",
+                "recurrence": "weekly",
+                "recurrence_exceptions": "2024-04-30, 2024-04-23",
+            },
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        recurrence = response.json()["event"]["recurrence"]
+        self.assertEqual(recurrence["frequency"], "weekly")
+        self.assertEqual(recurrence["exceptions"], ["2024-04-23", "2024-04-30"])
+
+        # One row, no matter how many occurrences there are
+        self.assertEqual(self.calendar.events.count(), 1)
+
+        # The series started before the requested window
+        data = self.client.get(
+            url,
+            {"from": "2024-04-14T22:00:00.000000+0000", "to": "2024-05-12T22:00:00.000000+0000"},
+        ).json()
+        self.assertEqual(len(data["events"]), 1)
+        self.assertEqual(
+            [o["start"][:10] for o in data["events"][0]["occurrences"]],
+            ["2024-04-16", "2024-05-07"],
+        )
+
+        # Without an end, the occurrences of a limited time range are returned
+        response = self.client.post(
+            url,
+            {
+                "name": "Rare",
+                "fullday": "true",
+                "dstart": "2024-03-19",
+                "dend": "2024-03-19",
+                "recurrence": "weekly",
+                "recurrence_interval": "1000",
+            },
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        data = self.client.get(url, {"from": "2024-03-01T00:00:00.000000+0000"}).json()
+        self.assertEqual(
+            {e["name"]: len(e["occurrences"]) for e in data["events"]},
+            {"Training": 101, "Rare": 1},
+        )
+
+        response = self.client.post(
+            url,
+            {
+                "name": "Too far",
+                "fullday": "true",
+                "dstart": "2024-03-19",
+                "dend": "2024-03-19",
+                "recurrence": "monthly",
+                "recurrence_interval": "1000",
+                "recurrence_count": "200",
+            },
+        )
+        self.assertEqual(response.status_code, 400, response.content)
+
+        # Without a window, only the series is returned
+        data = self.client.get(url).json()
+        self.assertNotIn("occurrences", data["events"][0])
@@ -0,0 +1,119 @@
+"""
+Tests for the require_objects decorator
+"""
+
+import uuid
+
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+
+from teamized.api.utils.decorators import require_objects
+from teamized.club.models import Club, ClubMember
+from teamized.models import Calendar, Invite, Team, ToDoList
+from teamized_tests.t_api.fixtures import create_team_fixture
+
+
+class RequireObjectsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = create_team_fixture()
+
+    def setUp(self):
+        self.client.force_login(self.data["owner"].auth_user)
+
+    def _url(self, name, **kwargs):
+        return reverse(f"teamized:api-{name}", kwargs={k: v.pk for k, v in kwargs.items()})
+
+    def test_chain_is_loaded_in_one_query(self):
+        url = self._url(
+            "todolistitem",
+            team=self.data["team"],
+            todolist=self.data["todolist"],
+            item=self.data["item"],
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        lookups = [
+            q["sql"] for q in ctx.captured_queries if 'FROM "teamized_todolistitem"' in q["sql"]
+        ]
+        self.assertEqual(len(lookups), 1)
+        self.assertIn('"teamized_todolist"', lookups[0])
+        self.assertIn('"teamized_team"', lookups[0])
+        self.assertFalse(any('FROM "teamized_todolist"' in q["sql"] for q in ctx.captured_queries))
+
+    def test_allow_none_keeps_resolved_parents(self):
+        @require_objects(
+            [
+                ("team", Team, "team"),
+                ("todolist", ToDoList, "todolist", "pk", "team"),
+                ("calendar", Calendar, "calendar", "pk", "team"),
+            ],
+            allow_none=True,
+        )
+        def view(request, **kwargs):  # pylint: disable=unused-argument
+            return kwargs
+
+        team = self.data["team"]
+        result = view(None, team=team.pk, todolist=self.data["todolist"].pk, calendar=uuid.uuid4())
+        self.assertEqual(result["team"], team)
+        self.assertEqual(result["todolist"], self.data["todolist"])
+        self.assertIsNone(result["calendar"])
+
+        result = view(None, team=team.pk, todolist=uuid.uuid4(), calendar=uuid.uuid4())
+        self.assertEqual(result, {"team": None, "todolist": None, "calendar": None})
+
+    def test_mismatched_parent_is_not_found(self):
+        other_list = self.data["team"].todolists.create(name="Other list")
+        response = self.client.get(
+            self._url(
+                "todolistitem",
+                team=self.data["team"],
+                todolist=other_list,
+                item=self.data["item"],
+            )
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "object-not-found")
+
+    def test_first_missing_object_is_reported(self):
+        invite = self.data["invite"]
+        url = reverse("teamized:api-invite", kwargs={"team": uuid.uuid4(), "invite": invite.pk})
+        # The error of the missing team, not the one of the invite
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("alert", response.json())
+
+        url = reverse(
+            "teamized:api-invite", kwargs={"team": self.data["team"].pk, "invite": uuid.uuid4()}
+        )
+        response = self.client.delete(url)
+        self.assertEqual(response.json()["alert"]["text"], Invite.NOT_FOUND_TEXT)
+
+    def test_club_permission_is_checked_first(self):
+        other_club = Club.objects.create(name="Other", slug="other")
+        foreign = ClubMember.objects.create(club=other_club, first_name="A", last_name="B")
+        url = reverse(
+            "teamized:api-club-member", kwargs={"team": self.data["team"].pk, "member": foreign.pk}
+        )
+
+        # Members of the team don't learn whether the club member belongs to the club
+        self.client.force_login(self.data["other"].auth_user)
+        self.assertEqual(self.client.delete(url).status_code, 403)
+
+        self.client.force_login(self.data["owner"].auth_user)
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "object-not-found")
+        self.assertTrue(ClubMember.objects.filter(pk=foreign.pk).exists())
+
+    def test_object_of_other_team_is_not_found(self):
+        other_team = self.data["owner"].create_team("Other", "Other team")
+        response = self.client.get(
+            self._url("calendar", team=other_team, calendar=self.data["calendar"])
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "object-not-found")
@@ -0,0 +1,67 @@
+"""
+Tests for the team listing
+"""
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from teamized import enums
+from teamized.club.models import Club, ClubMember
+from teamized_tests.t_api.fixtures import create_user
+
+
+class TeamListTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("teams")
+        cls.other = create_user("teams-other")
+
+    def setUp(self):
+        self.client.force_login(self.user.auth_user)
+        self.url = reverse("teamized:api-teams")
+
+    def _add_team(self, name: str, club_members: int = 2):
+        team = self.user.create_team(name, "")
+        team.join(self.other, role=enums.Roles.MEMBER)
+        team.calendars.create(name="Calendar")
+        club = Club.objects.create(name=name, slug=name.lower())
+        for i in range(club_members):
+            ClubMember.objects.create(
+                club=club, first_name=f"{i}", last_name="Member", email=f"{i}@example.com"
+            )
+        team.linked_club = club
+        team.save()
+        return team
+
+    def _count_queries(self) -> int:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(ctx.captured_queries)
+
+    def test_constant_queries(self):
+        self._add_team("A")
+        queries = self._count_queries()
+        for name in ["B", "C", "D", "E"]:
+            self._add_team(name)
+        self.assertEqual(self._count_queries(), queries)
+
+    def test_counts(self):
+        team = self._add_team("A", club_members=0)
+        team.todolists.create(name="List 1")
+        team.todolists.create(name="List 2")
+        self._add_team("B", club_members=3)
+
+        data = self.client.get(self.url).json()
+        self.assertEqual(data["defaultTeamId"], str(team.uid))
+        self.assertEqual(
+            [
+                (t["name"], t["membercount"], t["club"]["membercount"], t["calendarcount"])
+                for t in data["teams"]
+            ],
+            [("A", 2, 0, 1), ("B", 2, 3, 1)],
+        )
+        self.assertEqual([t["todolistcount"] for t in data["teams"]], [2, 0])
+        self.assertEqual(data["teams"][0]["member"]["user"]["username"], "teams")
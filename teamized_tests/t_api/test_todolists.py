@@ -0,0 +1,299 @@
+"""
+Tests for the to-do list endpoints
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from teamized import options, utils
+from teamized.models import ToDoListItem
+from teamized_tests.t_api.fixtures import create_user
+
+
+class ToDoListTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("todolists")
+        cls.team = cls.user.create_team("Team", "")
+
+    def setUp(self):
+        self.client.force_login(self.user.auth_user)
+        self.url = reverse("teamized:api-todolists", kwargs={"team": self.team.uid})
+
+    def _add_todolist(self, items: int = 4):
+        todolist = self.team.todolists.create(name="List")
+        ToDoListItem.objects.bulk_create(
+            ToDoListItem(
+                todolist=todolist,
+                name=f"Item {i}",
+                done=i % 2 == 0,
+                done_by=self.user if i % 2 == 0 else None,
+                done_at=timezone.now() if i % 2 == 0 else None,
+            )
+            for i in range(items)
+        )
+        return todolist
+
+    def _count_queries(self) -> int:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return len(ctx.captured_queries)
+
+    def test_constant_queries(self):
+        self._add_todolist()
+        self._count_queries()  # Warm up the caches
+        queries = self._count_queries()
+        for _ in range(5):
+            self._add_todolist(items=10)
+        self.assertEqual(self._count_queries(), queries)
+
+    def test_items(self):
+        self._add_todolist()
+
+        items = list(self.client.get(self.url).json()["todolists"][0]["items"].values())
+        # Open items first
+        self.assertEqual(
+            [(i["name"], i["done"]) for i in items],
+            [("Item 1", False), ("Item 3", False), ("Item 0", True), ("Item 2", True)],
+        )
+        self.assertEqual(items[2]["done_by_id"], str(self.user.uid))
+        self.assertIsNone(items[0]["done_by_id"])
+
+    def test_index(self):
+        todolist = self._add_todolist(items=5)
+        self.team.todolists.create(name="Empty")
+
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(self.url, {"include_items": "false"}).json()
+        # The counts are part of the query of the lists, the items aren't loaded
+        self.assertFalse(
+            [q for q in ctx.captured_queries if 'FROM "teamized_todolistitem"' in q["sql"]]
+        )
+        self.assertEqual(
+            [(t["name"], t["open_count"], t["done_count"]) for t in data["todolists"]],
+            [("Empty", 0, 0), ("List", 2, 3)],
+        )
+        self.assertNotIn("items", data["todolists"][0])
+
+        data = self.client.get(self.url).json()
+        self.assertEqual(data["todolists"][1]["open_count"], 2)
+        self.assertEqual(len(data["todolists"][1]["items"]), 5)
+        self.assertEqual(str(todolist.uid), data["todolists"][1]["id"])
+
+    def test_items_on_demand(self):
+        todolist = self._add_todolist(items=7)
+        now = timezone.now()
+        for i, item in enumerate(todolist.items.filter(done=True).order_by("name")):
+            item.done_at = now - timedelta(hours=i)
+            item.save()
+        url = reverse(
+            "teamized:api-todolistitems", kwargs={"team": self.team.uid, "todolist": todolist.uid}
+        )
+
+        data = self.client.get(url, {"done": "false"}).json()
+        self.assertEqual([i["name"] for i in data["items"]], ["Item 1", "Item 3", "Item 5"])
+
+        # Most recently done first
+        data = self.client.get(url, {"done": "true", "page_size": 3}).json()
+        self.assertEqual([i["name"] for i in data["items"]], ["Item 0", "Item 2", "Item 4"])
+        data = self.client.get(url, {"done": "true", "page_size": 3, "cursor": data["next"]}).json()
+        self.assertEqual([i["name"] for i in data["items"]], ["Item 6"])
+        self.assertIsNone(data["next"])
+
+        self.assertEqual(len(self.client.get(url).json()["items"]), 7)
+
+    def test_done_items_without_done_at(self):
+        todolist = self._add_todolist(items=7)
+        todolist.items.filter(name__in=["Item 2", "Item 4"]).update(done_at=None)
+        url = reverse(
+            "teamized:api-todolistitems", kwargs={"team": self.team.uid, "todolist": todolist.uid}
+        )
+
+        # They come last and aren't skipped (one item per page)
+        names, cursor = [], None
+        for _ in range(5):
+            params = {"done": "true", "page_size": 1, **({"cursor": cursor} if cursor else {})}
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200, response.content)
+            names += [i["name"] for i in response.json()["items"]]
+            cursor = response.json()["next"]
+            if cursor is None:
+                break
+        self.assertEqual(len(names), 4)
+        self.assertEqual(sorted(names[2:]), ["Item 2", "Item 4"])
+
+
+class ToDoListItemBulkTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("todobulk")
+        cls.other_user = create_user("todobulk-other")
+        cls.team = cls.user.create_team("Team", "")
+        cls.other_team = cls.other_user.create_team("Other team", "")
+
+    def setUp(self):
+        self.client.force_login(self.user.auth_user)
+        self.todolist = self.team.todolists.create(name="List")
+        self.items = [
+            ToDoListItem.objects.create(todolist=self.todolist, name=f"Item {i}") for i in range(3)
+        ]
+        self.url = reverse(
+            "teamized:api-todolistitems-bulk",
+            kwargs={"team": self.team.uid, "todolist": self.todolist.uid},
+        )
+
+    def _post(self, action: str, items: list, status: int = 200, **data):
+        response = self.client.post(
+            self.url, {"action": action, "item_ids[]": [i.uid for i in items], **data}
+        )
+        self.assertEqual(response.status_code, status, response.content)
+        return response.json()
+
+    def test_done_and_undone(self):
+        # Already done items keep who marked them as done
+        done_at = timezone.now() - timedelta(days=1)
+        ToDoListItem.objects.filter(pk=self.items[0].pk).update(
+            done=True, done_by=self.other_user, done_at=done_at
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            data = self._post("done", self.items)
+        self.assertEqual(sorted(data["ids"]), sorted(str(i.uid) for i in self.items[1:]))
+        self.assertEqual(len([q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]), 1)
+
+        self.items[0].refresh_from_db()
+        self.assertEqual((self.items[0].done_by, self.items[0].done_at), (self.other_user, done_at))
+        self.items[1].refresh_from_db()
+        self.assertEqual(self.items[1].done_by, self.user)
+        self.assertIsNotNone(self.items[1].done_at)
+
+        data = self._post("undone", self.items[:2])
+        self.assertEqual(len(data["items"]), 2)
+        self.assertEqual(
+            list(self.todolist.items.values_list("done", "done_by", "done_at")),
+            [
+                (False, None, None),
+                (False, None, None),
+                (True, self.user.uid, self.items[1].done_at),
+            ],
+        )
+
+    def test_move_and_delete(self):
+        target = self.team.todolists.create(name="Target")
+        self._post("move", self.items[:2], target_todolist_id=target.uid)
+        self.assertEqual(target.items.count(), 2)
+
+        foreign = self.other_team.todolists.create(name="Foreign")
+        data = self._post("move", self.items[2:], status=400, target_todolist_id=foreign.uid)
+        self.assertEqual(data["error"], "todolist_not_found")
+        self.assertEqual(foreign.items.count(), 0)
+
+        # Items of other lists are ignored
+        data = self._post("delete", self.items)
+        self.assertEqual(data["ids"], [str(self.items[2].uid)])
+        self.assertFalse(self.todolist.items.exists())
+        self.assertEqual(target.items.count(), 2)
+
+    def test_invalid_ids(self):
+        response = self.client.post(
+            self.url, {"action": "done", "item_ids[]": [self.items[0].uid, "invalid"]}
+        )
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertEqual(response.json()["error"], "not-an-uuid")
+        self.assertFalse(self.todolist.items.filter(done=True).exists())
+
+        data = self._post("move", self.items, status=400, target_todolist_id="invalid")
+        self.assertEqual(data["error"], "not-an-uuid")
+
+
+class ToDoListItemRankTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("todorank")
+        cls.team = cls.user.create_team("Team", "")
+
+    def setUp(self):
+        self.client.force_login(self.user.auth_user)
+        self.todolist = self.team.todolists.create(name="List")
+        url = reverse(
+            "teamized:api-todolistitems",
+            kwargs={"team": self.team.uid, "todolist": self.todolist.uid},
+        )
+        self.items = {
+            name: self.client.post(url, {"name": name}).json()["id"] for name in ["C", "B", "A"]
+        }
+
+    def _names(self) -> list[str]:
+        return list(self.todolist.items.values_list("name", flat=True))
+
+    def _move(self, name: str, after: str | None):
+        url = reverse(
+            "teamized:api-todolistitem",
+            kwargs={"team": self.team.uid, "todolist": self.todolist.uid, "item": self.items[name]},
+        )
+        response = self.client.post(url, {"move_after": self.items[after] if after else ""})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_new_items_are_appended(self):
+        self.assertEqual(self._names(), ["C", "B", "A"])
+
+    def test_move(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self._move("A", "C")
+        # Only the moved item is updated
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertIn("teamized_todolistitem", updates[0])
+        self.assertEqual(self._names(), ["C", "A", "B"])
+
+        self._move("B", None)
+        self.assertEqual(self._names(), ["B", "C", "A"])
+        self._move("B", "A")
+        self.assertEqual(self._names(), ["C", "A", "B"])
+
+    def test_rebalance(self):
+        with mock.patch.object(options, "TODO_RANK_MAX_LENGTH", 3):
+            # Moving items in front of the same item again and again makes the ranks longer
+            for _ in range(10):
+                self._move("A", "C")
+                self._move("B", "C")
+        self.assertEqual(self._names(), ["C", "B", "A"])
+        self.assertTrue(
+            all(len(rank) <= 3 for rank in self.todolist.items.values_list("rank", flat=True))
+        )
+
+    def test_unranked_items(self):
+        ToDoListItem.objects.bulk_create(
+            [ToDoListItem(todolist=self.todolist, name=name) for name in ["Y", "X"]]
+        )
+        self.items.update({item.name: item.uid for item in self.todolist.items.filter(rank="")})
+        self.assertEqual(self._names(), ["X", "Y", "C", "B", "A"])
+
+        self._move("X", "Y")
+        self.assertEqual(self._names(), ["Y", "X", "C", "B", "A"])
+        self.assertFalse(self.todolist.items.filter(rank="").exists())
+
+    def test_ranks(self):
+        ranks = utils.ranks_between(count=1000)
+        self.assertEqual(ranks, sorted(set(ranks)))
+        self.assertEqual(max(len(rank) for rank in ranks), 2)
+
+        rank = ""
+        for _ in range(100):
+            following = utils.rank_between(rank)
+            self.assertLess(rank, following)
+            rank = following
+        self.assertLessEqual(len(rank), 5)
+
+        for before, after in [("a", "a1"), ("9z", "a"), ("", "01"), ("zzz", "")]:
+            rank = utils.rank_between(before, after)
+            self.assertTrue(before < rank and (rank < after or not after))
+            self.assertFalse(rank.endswith("0"))
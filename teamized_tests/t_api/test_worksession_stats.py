@@ -0,0 +1,102 @@
+"""
+Tests for the working time statistics endpoint
+"""
+
+from datetime import datetime, timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from teamized.models import WorkSession
+from teamized_tests.t_api.fixtures import create_user
+
+
+class WorkSessionStatsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("stats")
+        cls.team = cls.user.create_team("Team", "")
+        cls.member = cls.team.get_member(cls.user)
+
+        tz = timezone.get_current_timezone()
+        # (start, duration in minutes, unit count)
+        for start, minutes, units in [
+            (datetime(2024, 3, 4, 8, 0, tzinfo=tz), 60, 2),  # Monday
+            (datetime(2024, 3, 4, 13, 0, tzinfo=tz), 30, None),
+            (datetime(2024, 3, 6, 9, 0, tzinfo=tz), 90, 1),  # Wednesday, same week
+            (datetime(2024, 3, 12, 9, 0, tzinfo=tz), 15, None),  # Next week
+            (datetime(2024, 4, 1, 23, 30, tzinfo=tz), 45, 3),  # Next month
+        ]:
+            WorkSession.objects.create(
+                user=cls.user,
+                member=cls.member,
+                team=cls.team,
+                time_start=start,
+                time_end=start + timedelta(minutes=minutes),
+                unit_count=units,
+                is_ended=True,
+            )
+        # Running sessions are not counted
+        WorkSession.objects.create(
+            user=cls.user,
+            member=cls.member,
+            team=cls.team,
+            time_start=datetime(2024, 3, 4, 10, 0, tzinfo=tz),
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user.auth_user)
+        self.url = reverse(
+            "teamized:api-workingtime-worksessions-stats", kwargs={"team": self.team.uid}
+        )
+
+    def _get(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_daily(self):
+        data = self._get(start="2024-03-01", end="2024-03-31")
+        self.assertEqual(
+            [
+                (s["start"], s["duration"], s["unit_count"], s["session_count"])
+                for s in data["stats"]
+            ],
+            [
+                ("2024-03-04", 5400.0, 2.0, 2),
+                ("2024-03-06", 5400.0, 1.0, 1),
+                ("2024-03-12", 900.0, 0.0, 1),
+            ],
+        )
+        self.assertEqual(
+            data["total"], {"duration": 11700.0, "unit_count": 3.0, "session_count": 4}
+        )
+
+    def test_weekly_and_monthly(self):
+        weekly = self._get(start="2024-03-01", end="2024-04-30", interval="week")
+        self.assertEqual(
+            [(s["start"], s["duration"]) for s in weekly["stats"]],
+            [("2024-03-04", 10800.0), ("2024-03-11", 900.0), ("2024-04-01", 2700.0)],
+        )
+
+        monthly = self._get(start="2024-01-01", end="2024-12-31", interval="month")
+        self.assertEqual(
+            [(s["start"], s["session_count"]) for s in monthly["stats"]],
+            [("2024-03-01", 4), ("2024-04-01", 1)],
+        )
+
+        yearly = self._get(start="2024-01-01", end="2024-12-31", interval="year")
+        self.assertEqual(yearly["total"]["session_count"], 5)
+
+    def test_local_day_boundaries(self):
+        # The session on April 1st starts at 23:30 local time (21:30 UTC)
+        data = self._get(start="2024-04-01", end="2024-04-01")
+        self.assertEqual([s["start"] for s in data["stats"]], ["2024-04-01"])
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.url, {"interval": "hour"}).status_code, 400)
+        self.assertEqual(
+            self.client.get(self.url, {"start": "2024-03-02", "end": "2024-03-01"}).status_code,
+            400,
+        )
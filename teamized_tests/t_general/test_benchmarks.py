@@ -0,0 +1,25 @@
+"""
+Smoke test for the benchmark scenarios (see runbenchmarks.py)
+"""
+
+from django.test import TestCase
+
+from teamized_benchmarks import runner
+from teamized_benchmarks.scenarios import SCENARIOS
+
+
+class BenchmarkTest(TestCase):
+    def test_scenarios_run(self):
+        tiny = {key: max(1, value // 5) for key, value in runner.SIZES["small"].items()}
+        results = runner.run_size(tiny, repeat=1)
+
+        self.assertEqual(set(results["scenarios"]), set(SCENARIOS))
+        for result in results["scenarios"].values():
+            self.assertGreater(result["queries"], 0)
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+
+    def test_compare(self):
+        old = {"sizes": {"small": {"scenarios": {"a": {"queries": 2, "p95_ms": 10.0}}}}}
+        new = {"sizes": {"small": {"scenarios": {"a": {"queries": 3, "p95_ms": 11.0}}}}}
+        self.assertEqual(runner.compare(old, new), ["small a: 2 -> 3 queries"])
+        self.assertEqual(runner.compare(new, new), [])
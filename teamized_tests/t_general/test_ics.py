@@ -0,0 +1,219 @@
+"""
+Tests for the ics feed of public calendars
+"""
+
+import re
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from teamized.models import Calendar, CalendarEvent, IcsFeedMixin
+from teamized_tests.t_api.fixtures import create_team_fixture
+
+
+class CalendarIcsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.fixture = create_team_fixture()
+        self.calendar = self.fixture["calendar"]
+        self.url = reverse("teamized:calendar_ics", kwargs={"ics_uuid": self.calendar.ics_uid})
+
+        # Last-Modified has a resolution of one second
+        past = timezone.now() - timedelta(hours=1)
+        Calendar.objects.filter(pk=self.calendar.pk).update(updated_at=past)
+        CalendarEvent.objects.filter(calendar=self.calendar).update(updated_at=past)
+
+    def test_ics_feed(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/calendar")
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+        self.assertIn(f"UID:{self.fixture['event'].uid}", response.content.decode())
+
+    def test_streaming(self):
+        for i in range(5):
+            CalendarEvent.objects.create(
+                calendar=self.calendar,
+                name=f"Event {i}",
+                description="Line 1\nLine 2",
+                fullday=True,
+                dstart=timezone.localdate(),
+                dend=timezone.localdate(),
+            )
+        text = self.client.get(self.url).content.decode()
+
+        with mock.patch("teamized.options.ICS_STREAMING_MIN_EVENTS", 1):
+            cache.clear()
+            response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        self.assertIn("ETag", response)
+        streamed = b"".join(response.streaming_content).decode()
+
+        # Only the DTSTAMP (time of rendering) may differ
+        dtstamp = re.compile(r"DTSTAMP:\w+")
+        self.assertEqual(dtstamp.sub("", streamed), dtstamp.sub("", text))
+        self.assertEqual(streamed.count("BEGIN:VEVENT"), 6)
+        self.assertTrue(streamed.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertTrue(streamed.endswith("END:VEVENT\r\nEND:VCALENDAR"))
+
+    def test_feed_methods_are_required(self):
+        with self.assertRaisesMessage(TypeError, "get_ics_last_modified"):
+            # pylint: disable=unused-variable
+            class IncompleteFeed(IcsFeedMixin):
+                def iter_ics_chunks(self, request=None):
+                    return iter([])
+
+                def get_ics_version_parts(self) -> list:
+                    return []
+
+    def test_empty_calendar(self):
+        calendar = self.fixture["calendar2"]
+        text = calendar.as_ics_text()
+        self.assertTrue(text.endswith("END:VTIMEZONE\r\nEND:VCALENDAR"))
+        self.assertIn("X-WR-TIMEZONE:Europe/Zurich\r\nBEGIN:VTIMEZONE", text)
+        self.assertEqual(
+            b"".join(calendar.as_ics_response(streaming=True).streaming_content).decode(), text
+        )
+
+    def test_line_order(self):
+        team_url = self.fixture["team"].get_calendar_ics_url()
+        for url in [self.url, team_url]:
+            with self.subTest(url=url):
+                lines = self.client.get(url).content.decode().split("\r\n")
+                # All calendar properties come before the first component (RFC 5545)
+                components = [i for i, line in enumerate(lines) if line.startswith("BEGIN:")]
+                self.assertEqual(lines[components[1]], "BEGIN:VTIMEZONE")
+                self.assertLess(lines.index("BEGIN:VTIMEZONE"), lines.index("BEGIN:VEVENT"))
+                self.assertLess(
+                    max(i for i, line in enumerate(lines) if line.startswith(("URL:", "SOURCE"))),
+                    components[1],
+                )
+
+    def test_not_modified(self):
+        response = self.client.get(self.url)
+
+        with self.assertNumQueries(1):
+            etag_response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(etag_response.status_code, 304)
+        self.assertEqual(etag_response["ETag"], response["ETag"])
+
+        with self.assertNumQueries(1):
+            date_response = self.client.get(
+                self.url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+            )
+        self.assertEqual(date_response.status_code, 304)
+
+    def test_cached(self):
+        response = self.client.get(self.url)
+
+        # Without a conditional header, the cached file is returned
+        with self.assertNumQueries(1):
+            cached_response = self.client.get(self.url)
+        self.assertEqual(cached_response.status_code, 200)
+        self.assertEqual(cached_response.content, response.content)
+
+    def test_changes(self):
+        etags = {self.client.get(self.url)["ETag"]}
+
+        event = self.fixture["event"]
+        event.name = "Renamed"
+        event.save()
+        response = self.client.get(self.url)
+        self.assertIn("SUMMARY:Renamed", response.content.decode())
+        etags.add(response["ETag"])
+
+        new_event = CalendarEvent.objects.create(
+            calendar=self.calendar,
+            name="New",
+            fullday=True,
+            dstart=event.dtstart.date(),
+            dend=event.dtstart.date(),
+        )
+        etags.add(self.client.get(self.url)["ETag"])
+
+        new_event.delete()
+        etags.add(self.client.get(self.url)["ETag"])
+
+        self.calendar.name = "Renamed calendar"
+        self.calendar.save()
+        response = self.client.get(self.url)
+        self.assertIn("NAME:Renamed calendar", response.content.decode())
+        etags.add(response["ETag"])
+
+        self.assertEqual(len(etags), 5)
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304
+        )
+
+    def test_delete_event_endpoint(self):
+        response = self.client.get(self.url)
+
+        self.client.force_login(self.fixture["owner"].auth_user)
+        url = reverse(
+            "teamized:api-event",
+            kwargs={
+                "team": self.fixture["team"].pk,
+                "calendar": self.calendar.pk,
+                "event": self.fixture["event"].pk,
+            },
+        )
+        self.assertEqual(self.client.delete(url).status_code, 200)
+
+        # The deletion must also be visible to clients that only use If-Modified-Since
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("BEGIN:VEVENT", response.content.decode())
+
+
+class TeamIcsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.fixture = create_team_fixture()
+        self.team = self.fixture["team"]
+        self.url = reverse(
+            "teamized:team_calendar_ics", kwargs={"ics_uuid": self.team.calendar_ics_uid}
+        )
+        self.event2 = CalendarEvent.objects.create(
+            calendar=self.fixture["calendar2"],
+            name="Event 2",
+            fullday=True,
+            dstart=timezone.localdate(),
+            dend=timezone.localdate(),
+        )
+
+    def test_ics_feed(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        text = response.content.decode()
+        self.assertIn(f"UID:{self.fixture['event'].uid}", text)
+        self.assertIn(f"UID:{self.event2.uid}", text)
+        self.assertIn("CATEGORIES:Calendar 2", text)
+        self.assertIn("COLOR:" + self.fixture["calendar2"].color, text)
+        self.assertTrue(text.endswith("END:VCALENDAR"))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_private_calendars(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        calendar2 = self.fixture["calendar2"]
+        calendar2.is_public = False
+        calendar2.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(f"UID:{self.event2.uid}", response.content.decode())
+
+    def test_url_in_calendar_list(self):
+        self.client.force_login(self.fixture["owner"].auth_user)
+        data = self.client.get(
+            reverse("teamized:api-calendars", kwargs={"team": self.team.uid})
+        ).json()
+        self.assertEqual(data["ics_url"], "http://testserver" + self.url)
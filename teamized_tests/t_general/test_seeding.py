@@ -0,0 +1,64 @@
+"""
+Tests for the synthetic data generator and the teamized_seed command
+"""
+
+from datetime import datetime, timezone
+from io import StringIO
+
+from django.core.management import call_command, CommandError
+from django.db import transaction
+from django.test import TestCase
+
+from teamized.club.models import ClubAttendanceEventParticipation
+from teamized.models import Team, WorkSession
+from teamized.seeding import Seeder
+
+SMALL = {
+    "users": 5,
+    "teams": 3,
+    "members_per_team": 3,
+    "worksessions": 20,
+    "members_per_club": 4,
+    "attendance_events_per_club": 2,
+}
+REFERENCE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class SeedingTest(TestCase):
+    def _snapshot(self, **kwargs):
+        sid = transaction.savepoint()
+        seeder = Seeder(reference=REFERENCE, **SMALL, **kwargs).run()
+        snapshot = (
+            list(Team.objects.order_by("uid").values_list("uid", "name", "linked_club_id")),
+            list(WorkSession.objects.order_by("uid").values_list("uid", "member_id", "time_start")),
+        )
+        transaction.savepoint_rollback(sid)
+        return seeder, snapshot
+
+    def test_counts(self):
+        seeder, _snapshot = self._snapshot()
+        self.assertEqual(seeder.created["teamized.Team"], 3)
+        self.assertEqual(seeder.created["teamized.Member"], 9)
+        self.assertEqual(seeder.created["teamized.WorkSession"], 20)
+        self.assertEqual(
+            seeder.created["teamized.ClubAttendanceEventParticipation"],
+            2 * 2 * 4,  # clubs * events per club * members per club
+        )
+
+    def test_deterministic(self):
+        self.assertEqual(self._snapshot(seed=1)[1], self._snapshot(seed=1)[1])
+        self.assertNotEqual(self._snapshot(seed=1)[1], self._snapshot(seed=2)[1])
+
+    def test_command(self):
+        out = StringIO()
+        call_command(
+            "teamized_seed",
+            "--prefix=cmd",
+            *[f"--{k.replace('_', '-')}={v}" for k, v in SMALL.items()],
+            stdout=out,
+        )
+        self.assertIn("teamized.Team: 3", out.getvalue())
+        self.assertEqual(ClubAttendanceEventParticipation.objects.count(), 16)
+
+        with self.assertRaises(CommandError):
+            call_command("teamized_seed", "--prefix=cmd", stdout=out)
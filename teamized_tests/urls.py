@@ -0,0 +1,9 @@
+"""
+URL configuration for running the tests (without the debug toolbar)
+"""
+
+from django.urls import path, include
+
+urlpatterns = [
+    path("teamized/", include("teamized.urls")),
+]